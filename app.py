@@ -5,12 +5,29 @@ A lightweight AI tool that provides culturally-aware assistance to tourists
 and locals in Udaipur by leveraging local knowledge from a product.md context file.
 """
 
+import os
+import sys
+import time
+from dataclasses import replace
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from src.admission import DEFAULT_ADMISSION, DEGRADED_SERVED, SHED
 from src.context_loader import ContextLoader
+from src.conversation import DEFAULT_CONVERSATION_STORE, ConversationState, resolve_follow_up
+from src.localization import Catalog, catalog_for, resolve_locale
+from src.query_log import DEFAULT_QUERY_LOG
 from src.query_processor import QueryProcessor
 from src.response_generator import ResponseGenerator
+from src.single_flight import DEFAULT_SINGLE_FLIGHT
+
+
+# The interactive CLI is a single conversation
+CLI_SESSION_ID = "cli"
+# Answer language of the interactive CLI, e.g. GUIDE_LOCALE=fr python app.py
+CLI_LOCALE_VARIABLE = "GUIDE_LOCALE"
 
 
-def local_guide(query: str) -> str:
+def local_guide(query: str, session_id: Optional[str] = None, locale: Optional[str] = None) -> str:
     """
     Main function to process user queries and provide Udaipur-specific responses.
     
@@ -19,6 +36,9 @@ def local_guide(query: str) -> str:
     
     Args:
         query: User's input query string
+        session_id: Optional conversation id; when given, follow-up questions
+            reuse the category, location and time context of the previous turn
+        locale: Language to answer in ("hi", "fr", "de"); English when missing or unsupported
         
     Returns:
         Contextually relevant response based on local knowledge
@@ -27,15 +47,111 @@ def local_guide(query: str) -> str:
     - Processes user input and provides relevant responses within reasonable time
     - Formats responses in a clear and readable manner
     """
+    started = time.perf_counter()
+    event: Dict[str, Any] = {"branch": "internal_error", "intent": None, "kb_version": None}
+    catalog = catalog_for(locale)
+
+    response = _screen_query(query, session_id, event, catalog)
+    if response is None:
+        query_text = query.strip()
+        state = DEFAULT_CONVERSATION_STORE.get(session_id) if session_id is not None else None
+        shared = DEFAULT_SINGLE_FLIGHT.do(_flight_key(query_text, state, catalog),
+                                          lambda: _answer_shared(query_text, state, catalog))
+        response = _take_shared(shared, session_id, event)
+
+    _record_event(query, event, started)
+    return response
+
+
+async def local_guide_async(query: str, session_id: Optional[str] = None, locale: Optional[str] = None) -> str:
+    """
+    local_guide for asyncio callers.
+
+    The answer is computed on the event loop's default executor, and
+    identical concurrent questions (from coroutines or threads) share one
+    computation, so waiting never blocks the loop.
+    """
+    started = time.perf_counter()
+    event: Dict[str, Any] = {"branch": "internal_error", "intent": None, "kb_version": None}
+    catalog = catalog_for(locale)
+
+    response = _screen_query(query, session_id, event, catalog)
+    if response is None:
+        query_text = query.strip()
+        state = DEFAULT_CONVERSATION_STORE.get(session_id) if session_id is not None else None
+        shared = await DEFAULT_SINGLE_FLIGHT.do_async(_flight_key(query_text, state, catalog),
+                                                      lambda: _answer_shared(query_text, state, catalog))
+        response = _take_shared(shared, session_id, event)
+
+    _record_event(query, event, started)
+    return response
+
+
+def _record_event(query: Any, event: Dict[str, Any], started: float) -> None:
+    # Queued for the background writer; never blocks on I/O
+    DEFAULT_QUERY_LOG.record(
+        query if isinstance(query, str) else repr(query),
+        event["intent"],
+        event["branch"],
+        time.perf_counter() - started,
+        event["kb_version"]
+    )
+
+
+def _screen_query(query: str, session_id: Optional[str], event: Dict[str, Any],
+                  catalog: Catalog) -> Optional[str]:
+    """The reply to a query that is answered without the engine (invalid, empty, rate limited), else None."""
     # Input validation
     if not query or not isinstance(query, str):
-        return "Please provide a valid question about Udaipur's culture, food, language, or tourist information."
+        event["branch"] = "invalid_input"
+        return catalog.text("app.invalid_input")
     
     # Normalize input
     query = query.strip()
     if not query:
-        return "Please enter a question about local culture, food recommendations, language phrases, or tourist information."
-    
+        event["branch"] = "empty_input"
+        return catalog.text("app.empty_input")
+
+    if session_id is not None and not DEFAULT_ADMISSION.allow_session(session_id):
+        event["branch"] = "rate_limited"
+        return catalog.text("app.rate_limited")
+    return None
+
+
+def _flight_key(query: str, state: Optional[ConversationState], catalog: Catalog) -> Hashable:
+    """
+    Questions with the same key get the same answer: the query as the engine
+    sees it (lower case, single spaced), the conversation context it inherits
+    and the answer language.
+    """
+    carried = (state.category, state.location, state.time_context) if state is not None else None
+    return " ".join(query.lower().split()), carried, catalog.locale
+
+
+def _answer_shared(query: str, state: Optional[ConversationState],
+                   catalog: Catalog) -> Tuple[str, Dict[str, Any]]:
+    """Answer once for every caller waiting on the same flight key; returns the response and event fields."""
+    outcome: Dict[str, Any] = {"branch": "internal_error", "intent": None, "kb_version": None}
+    # The global rate limit and the concurrency limit; under overload only precomputed answers are served
+    admission = DEFAULT_ADMISSION.admit()
+    try:
+        return _answer_admitted(query, state, outcome, admission.degraded, catalog), outcome
+    finally:
+        admission.release()
+
+
+def _take_shared(shared: Tuple[str, Dict[str, Any]], session_id: Optional[str], event: Dict[str, Any]) -> str:
+    """Copy a shared answer's event fields and remember its intent for the caller's session."""
+    response, outcome = shared
+    event.update(outcome)
+    if session_id is not None and outcome["intent"] is not None:
+        DEFAULT_CONVERSATION_STORE.update(session_id, outcome["intent"])
+    return response
+
+
+def _answer_admitted(query: str, state: Optional[ConversationState], event: Dict[str, Any], degraded: bool,
+                     catalog: Catalog) -> str:
+    """Answer a validated, admitted query; degraded answers come only from the answer table."""
     try:
         # Initialize components with error handling
         context_loader = ContextLoader()
@@ -45,16 +161,31 @@ def local_guide(query: str) -> str:
         # Load context data with specific error handling
         try:
             context = context_loader.load_context()
+            event["kb_version"] = context_loader.kb_version
         except FileNotFoundError:
-            return "I'm sorry, I can't access the local knowledge base right now. Please ensure the product.md file is available and try again."
+            event["branch"] = "kb_missing"
+            return catalog.text("app.kb_missing")
         except ValueError as e:
-            return f"There's an issue with the local knowledge base: {str(e)}. Please check the product.md file format."
+            event["branch"] = "kb_invalid"
+            return catalog.text("app.kb_invalid", error=str(e))
         
         # Process the query with error handling
         try:
-            intent = query_processor.process_query(query)
+            intent = replace(resolve_follow_up(query_processor.process_query(query), state), locale=catalog.locale)
+            event["intent"] = intent
         except Exception as e:
-            return "I had trouble understanding your question. Could you please rephrase it? I can help with local phrases, food recommendations, tourist information, or cultural guidance."
+            event["branch"] = "query_error"
+            return catalog.text("app.query_error")
+
+        if degraded:
+            response = response_generator.precomputed_response(intent, context)
+            if response:
+                DEFAULT_ADMISSION.record(DEGRADED_SERVED)
+                event["branch"] = "degraded:answer"
+                return response.strip()
+            DEFAULT_ADMISSION.record(SHED)
+            event["branch"] = "shed"
+            return catalog.text("app.shed")
         
         # Generate response with error handling
         try:
@@ -62,29 +193,43 @@ def local_guide(query: str) -> str:
             
             # Ensure response is properly formatted and not empty
             if not response or not response.strip():
-                return "I'm not sure how to help with that specific question. Try asking about local greetings like 'Khamma Ghani', food recommendations for specific areas, crowd timing at tourist spots, or cultural etiquette guidance."
+                event["branch"] = "empty_response"
+                return catalog.text("app.empty_response")
             
+            event["branch"] = "answer:composed" if len(intent.categories) > 1 else f"answer:{intent.category}"
             return response.strip()
             
         except Exception as e:
-            return "I encountered an issue generating a response. Please try rephrasing your question or ask about local language, food, tourism, or cultural topics."
+            event["branch"] = "generation_error"
+            return catalog.text("app.generation_error")
         
     except Exception as e:
         # Fallback error handling with helpful guidance
-        return "I'm experiencing technical difficulties. Please try asking about: local phrases and greetings, authentic food recommendations, tourist crowd timing, or cultural etiquette guidance."
+        return catalog.text("app.internal_error")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     Main entry point for interactive usage.
     
     Provides a user-friendly interface for interacting with the Udaipur Local Guide AI,
-    with proper error handling and graceful exit options.
+    with proper error handling and graceful exit options. A question given on the
+    command line (python app.py "What does Khamma Ghani mean?") is answered once,
+    without the interactive session.
+    
+    Args:
+        argv: Command line arguments; sys.argv[1:] when None
     
     Implements Requirements 5.1, 5.4:
     - Handles user input/output in a clear and readable manner
     - Provides component coordination through the local_guide function
     """
+    args = sys.argv[1:] if argv is None else argv
+    locale = resolve_locale(os.environ.get(CLI_LOCALE_VARIABLE))
+    if args:
+        print(local_guide(" ".join(args), locale=locale))
+        return
+
     print("🏰 Welcome to the Udaipur Local Guide AI! 🏰")
     print("I can help you with:")
     print("  • Local phrases and greetings (like 'Khamma Ghani')")
@@ -122,7 +267,7 @@ def main():
             
             # Process the query and display response
             print("\n🤖 Guide:", end=" ")
-            response = local_guide(user_input)
+            response = local_guide(user_input, session_id=CLI_SESSION_ID, locale=locale)
             print(response)
             
             # Add separator for readability
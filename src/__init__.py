@@ -0,0 +1,6 @@
+"""
+Udaipur Local Guide AI - core package.
+
+Contains the context loader, query processor and response generator used by
+both the command line application (app.py) and the Streamlit web interface.
+"""
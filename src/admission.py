@@ -0,0 +1,207 @@
+"""
+Admission control and load shedding for the Udaipur Local Guide AI.
+
+A burst of visitors (a tour bus unloading) must not slow every answer down.
+Each request passes three gates before local_guide does real work:
+
+1. A per-session token bucket. A session asking faster than a person types
+   is told to slow down.
+2. A global token bucket. Above the sustained rate, requests are served in
+   degraded mode.
+3. A bounded set of concurrent slots with a bounded wait queue. A request
+   that finds the queue full, or waits longer than the queue-wait deadline,
+   is also served in degraded mode.
+
+Degraded requests only get answers that already exist: precomputed answer
+table entries. Anything that would need fresh work is shed with a "busy"
+message. Every outcome is counted, and stats() reports the counters with
+the current number of active and waiting requests.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+DEFAULT_GLOBAL_RATE = 50.0
+DEFAULT_GLOBAL_BURST = 100
+DEFAULT_SESSION_RATE = 2.0
+DEFAULT_SESSION_BURST = 10
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_MAX_QUEUE_WAIT = 2.0
+
+ADMITTED = "admitted"
+QUEUED = "queued"
+SESSION_LIMITED = "session_limited"
+GLOBAL_LIMITED = "global_limited"
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+# Recorded by the caller once a degraded request has been handled
+DEGRADED_SERVED = "degraded_served"
+SHED = "shed"
+
+OUTCOMES = (ADMITTED, QUEUED, SESSION_LIMITED, GLOBAL_LIMITED, QUEUE_FULL, QUEUE_TIMEOUT, DEGRADED_SERVED, SHED)
+DEGRADED_OUTCOMES = (GLOBAL_LIMITED, QUEUE_FULL, QUEUE_TIMEOUT)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, holding at most capacity."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available; never blocks."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+
+class Admission:
+    """The result of AdmissionController.admit; release() frees the slot it holds, if any."""
+
+    def __init__(self, controller: "AdmissionController", outcome: str, holds_slot: bool):
+        self.outcome = outcome
+        self._controller = controller
+        self._holds_slot = holds_slot
+
+    @property
+    def admitted(self) -> bool:
+        return self.outcome in (ADMITTED, QUEUED)
+
+    @property
+    def degraded(self) -> bool:
+        return self.outcome in DEGRADED_OUTCOMES
+
+    @property
+    def rejected(self) -> bool:
+        return self.outcome == SESSION_LIMITED
+
+    def release(self) -> None:
+        if self._holds_slot:
+            self._holds_slot = False
+            self._controller._release_slot()
+
+    def __enter__(self) -> "Admission":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class AdmissionController:
+    """Rate limits, a concurrency limit and a bounded wait queue in front of local_guide."""
+
+    def __init__(self, global_rate: float = DEFAULT_GLOBAL_RATE, global_burst: int = DEFAULT_GLOBAL_BURST,
+                 session_rate: float = DEFAULT_SESSION_RATE, session_burst: int = DEFAULT_SESSION_BURST,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 max_queue: int = DEFAULT_MAX_QUEUE, max_queue_wait: float = DEFAULT_MAX_QUEUE_WAIT,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_concurrent <= 0 or max_sessions <= 0 or max_queue < 0:
+            raise ValueError("max_concurrent and max_sessions must be positive and max_queue non-negative")
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.max_sessions = max_sessions
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self._clock = clock
+        self._global = TokenBucket(global_rate, global_burst, clock)
+        self._sessions: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+
+        self._slots = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._counts = dict.fromkeys(OUTCOMES, 0)
+        self._counts_lock = threading.Lock()
+
+    def admit(self, session_id: Optional[str] = None) -> Admission:
+        """
+        Decide how to handle one request, waiting up to max_queue_wait for a slot.
+
+        Returns:
+            An Admission; when admitted it holds a slot until released
+        """
+        if session_id is not None and not self.allow_session(session_id):
+            return Admission(self, SESSION_LIMITED, holds_slot=False)
+        if not self._global.try_acquire():
+            return self._decide(GLOBAL_LIMITED)
+
+        with self._slots:
+            if self._active < self.max_concurrent:
+                self._active += 1
+                return self._decide(ADMITTED, holds_slot=True)
+            if self._waiting >= self.max_queue:
+                return self._decide(QUEUE_FULL)
+            self._waiting += 1
+            try:
+                # Real time, not the bucket clock, so a stalled slot cannot hold a request forever
+                deadline = time.monotonic() + self.max_queue_wait
+                while self._active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return self._decide(QUEUE_TIMEOUT)
+                    self._slots.wait(remaining)
+                self._active += 1
+                return self._decide(QUEUED, holds_slot=True)
+            finally:
+                self._waiting -= 1
+
+    def allow_session(self, session_id: str) -> bool:
+        """Apply only the per-session rate limit, counting session_limited when it refuses."""
+        if self._session_bucket(session_id).try_acquire():
+            return True
+        self.record(SESSION_LIMITED)
+        return False
+
+    def record(self, outcome: str) -> None:
+        """Count an outcome decided outside admit (degraded_served, shed)."""
+        with self._counts_lock:
+            self._counts[outcome] = self._counts.get(outcome, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the count of each outcome and the current active and waiting requests."""
+        with self._counts_lock:
+            stats = dict(self._counts)
+        stats.update(active=self._active, waiting=self._waiting)
+        return stats
+
+    def _decide(self, outcome: str, holds_slot: bool = False) -> Admission:
+        self.record(outcome)
+        return Admission(self, outcome, holds_slot)
+
+    def _session_bucket(self, session_id: str) -> TokenBucket:
+        with self._sessions_lock:
+            bucket = self._sessions.get(session_id)
+            if bucket is None:
+                bucket = TokenBucket(self.session_rate, self.session_burst, self._clock)
+                self._sessions[session_id] = bucket
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return bucket
+
+    def _release_slot(self) -> None:
+        with self._slots:
+            self._active -= 1
+            self._slots.notify()
+
+
+DEFAULT_ADMISSION = AdmissionController()
@@ -0,0 +1,172 @@
+"""
+Precomputed answer table for the Udaipur Local Guide AI.
+
+Most answers are a pure function of a small key: the categories asked
+about, the location, and a few keyword flags. When a knowledge base is
+first used, ResponseGenerator enumerates that finite key space and every
+answer is materialized into a frozen mapping, so answering those queries
+is a single dict lookup. Answers that depend on the clock, distances or
+free-form input (crowds "now", "near X", itineraries) are not tabulated.
+The table is rebuilt only when ContextLoader hands out a new context,
+which happens when product.md changes, and answers whose knowledge base
+sections are unchanged are carried over from the previous table. Callers
+whose answers also depend on something outside the knowledge base (the
+venue database) pass it as the table's variant.
+
+Print the build time and size for the current knowledge base with:
+
+    python -m src.answer_table
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from src.query_processor import QueryIntent
+
+
+TABLE_CACHE_SIZE = 8
+
+
+class AnswerTable:
+    """Frozen mapping of answer key to response text."""
+
+    def __init__(self, answers: Dict[Hashable, str], build_seconds: float = 0.0,
+                 sections: Optional[Dict[str, Any]] = None, reused: int = 0):
+        self.answers = MappingProxyType(answers)
+        self.build_seconds = build_seconds
+        # The knowledge base section objects the answers were generated from
+        self.sections = dict(sections or {})
+        self.reused = reused
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        return self.answers.get(key)
+
+    @classmethod
+    def build(cls, keyed_intents: Iterable[Tuple[Hashable, QueryIntent]],
+              generate: Callable[[QueryIntent], str], sections: Optional[Dict[str, Any]] = None,
+              depends_on: Optional[Callable[[Hashable], Iterable[str]]] = None,
+              previous: Optional["AnswerTable"] = None) -> "AnswerTable":
+        """
+        Materialize the answer for every (key, representative intent) pair.
+
+        Identical answers share one string object, so the table costs little
+        more than its keys.
+
+        Args:
+            keyed_intents: Every key with an intent that produces its answer
+            generate: Produces the answer for an intent
+            sections: Knowledge base sections by name
+            depends_on: Names of the sections a key's answer reads
+            previous: An earlier table; its answer for a key is reused when
+                every section the key depends on is the same object
+        """
+        started = time.perf_counter()
+        sections = sections or {}
+        answers: Dict[Hashable, str] = {}
+        unique: Dict[str, str] = {}
+        reused = 0
+        for key, intent in keyed_intents:
+            answer = None
+            if previous is not None and depends_on is not None and all(
+                    name in sections and previous.sections.get(name) is sections[name]
+                    for name in depends_on(key)):
+                answer = previous.get(key)
+            if answer is None:
+                answer = generate(intent)
+            else:
+                reused += 1
+            answers[key] = unique.setdefault(answer, answer)
+        return cls(answers, time.perf_counter() - started, sections, reused)
+
+    def size_bytes(self) -> int:
+        """Approximate memory held by the table, counting each shared object once."""
+        seen = set()
+        size = sys.getsizeof(self.answers.copy())
+        for key, answer in self.answers.items():
+            size += _deep_size(key, seen) + _deep_size(answer, seen)
+        return size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self),
+            "distinct_answers": len({id(answer) for answer in self.answers.values()}),
+            "size_bytes": self.size_bytes(),
+            "build_ms": round(self.build_seconds * 1000, 1),
+            "reused": self.reused,
+        }
+
+
+def _deep_size(value: Any, seen: set) -> int:
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, tuple):
+        size += sum(_deep_size(item, seen) for item in value)
+    return size
+
+
+# (id(context), variant) -> (context, table)
+_TABLE_CACHE: "OrderedDict[Tuple[int, Hashable], Tuple[Dict[str, Any], AnswerTable]]" = OrderedDict()
+_TABLE_CACHE_LOCK = threading.Lock()
+
+
+def answer_table_for(context: Dict[str, Any], build: Callable[[Optional[AnswerTable]], AnswerTable],
+                     variant: Hashable = None) -> AnswerTable:
+    """
+    Return the answer table for a knowledge base, building it on first use.
+
+    Keyed on the identity of the context, which ContextLoader reuses until
+    the knowledge base changes, and on variant, whatever else the answers
+    depend on. build is given the most recently built table of the same
+    variant so unchanged answers can be carried over. Contexts must not be
+    modified after their table is built.
+    """
+    key = (id(context), variant)
+    cached = _TABLE_CACHE.get(key)
+    if cached is not None and cached[0] is context:
+        return cached[1]
+
+    with _TABLE_CACHE_LOCK:
+        cached = _TABLE_CACHE.get(key)
+        if cached is not None and cached[0] is context:
+            return cached[1]
+        previous = next((table for (_, cached_variant), (_, table) in reversed(_TABLE_CACHE.items())
+                         if cached_variant == variant), None)
+        table = build(previous)
+        _TABLE_CACHE[key] = (context, table)
+        while len(_TABLE_CACHE) > TABLE_CACHE_SIZE:
+            _TABLE_CACHE.popitem(last=False)
+    return table
+
+
+def cached_answer_table(context: Dict[str, Any], variant: Hashable = None) -> Optional[AnswerTable]:
+    """The answer table already built for a knowledge base and variant, or None; never builds one."""
+    cached = _TABLE_CACHE.get((id(context), variant))
+    if cached is not None and cached[0] is context:
+        return cached[1]
+    return None
+
+
+def main() -> None:
+    from src.context_loader import ContextLoader
+    from src.response_generator import ResponseGenerator
+
+    loader = ContextLoader()
+    context = loader.load_context()
+    table = ResponseGenerator().answer_table(context)
+    stats = table.stats()
+    print(f"Knowledge base {loader.kb_version}: {stats['entries']} entries, "
+          f"{stats['distinct_answers']} distinct answers, {stats['size_bytes'] / 1024:.1f} KiB, "
+          f"built in {stats['build_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
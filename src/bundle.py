@@ -0,0 +1,198 @@
+"""
+Single-file zipapp build of the Udaipur Local Guide AI.
+
+A kiosk or a one-off CLI call pays for compiling every module to bytecode
+and parsing product.md before it can answer its first question. build()
+does that work once, at build time: it packs app.py and the src package,
+each module precompiled to an unchecked-hash .pyc next to its source (so
+zipimport loads the bytecode without comparing timestamps), the response
+catalogs, and the compiled knowledge base snapshot, intent model and
+training queries under src/_bundled/ (see src/resources.py) into one
+executable archive whose entry point is app.main().
+
+The sources stay in the archive, so tracebacks keep their lines and a
+Python version whose bytecode does not match falls back to compiling them.
+Third-party packages (numpy, PyYAML) are not bundled and must be installed
+where the archive runs; the venue database and chat history are still read
+from .data/ in the working directory.
+
+After building, the cold start to the first answer is measured as the
+median wall time of fresh processes answering one question, from the
+archive in an empty directory and from the source tree with an empty
+bytecode cache:
+
+    python -m src.bundle build
+    python dist/udaipur_guide.pyz "What does Khamma Ghani mean?"
+"""
+
+import argparse
+import glob
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipapp
+from typing import List, NamedTuple, Optional
+
+from src.context_loader import ContextLoader, compile_snapshot
+from src.intent_classifier import DEFAULT_MODEL_PATH, DEFAULT_TRAINING_PATH
+from src.resources import BUNDLE_DIRECTORY, INTENT_MODEL_NAME, INTENT_TRAINING_NAME, KB_SNAPSHOT_NAME
+
+
+DEFAULT_BUNDLE_PATH = "dist/udaipur_guide.pyz"
+INTERPRETER = "/usr/bin/env python3"
+COLD_START_QUERY = "What does Khamma Ghani mean?"
+DEFAULT_COLD_START_RUNS = 5
+
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Build-time tooling that the archive does not need
+EXCLUDED_MODULES = {"bundle.py"}
+
+MAIN_MODULE = '''"""Entry point of the zipapp build; see src/bundle.py."""
+
+from app import main
+
+main()
+'''
+
+
+class ColdStart(NamedTuple):
+    bundle_seconds: float
+    source_seconds: float
+    runs: int
+
+
+class BuildReport(NamedTuple):
+    path: str
+    size: int
+    modules: int
+    data_files: List[str]
+    cold_start: Optional[ColdStart]
+
+    def format(self) -> str:
+        lines = [
+            f"Wrote {self.path} ({self.size / 1024:.0f} KiB, {self.modules} precompiled modules)",
+            f"Bundled data: {', '.join(self.data_files) or 'none'}",
+        ]
+        if self.cold_start is not None:
+            cold = self.cold_start
+            lines.append(f"Cold start to first answer (median of {cold.runs}): "
+                         f"{cold.bundle_seconds * 1000:.0f} ms bundled, "
+                         f"{cold.source_seconds * 1000:.0f} ms from source")
+        return "\n".join(lines)
+
+
+def _stage_module(source: str, staging: str, name: str) -> None:
+    """Copy a module into the staging tree with its bytecode precompiled beside it."""
+    target = os.path.join(staging, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.copyfile(source, target)
+    py_compile.compile(target, cfile=target + "c", dfile=name, doraise=True,
+                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+
+
+def _stage(staging: str, loader: ContextLoader, model_path: str, training_path: str) -> BuildReport:
+    modules = [os.path.join(SOURCE_ROOT, "app.py")] + [
+        path for path in sorted(glob.glob(os.path.join(SOURCE_ROOT, "src", "*.py")))
+        if os.path.basename(path) not in EXCLUDED_MODULES
+    ]
+    for path in modules:
+        _stage_module(path, staging, os.path.relpath(path, SOURCE_ROOT).replace(os.sep, "/"))
+
+    main_path = os.path.join(staging, "__main__.py")
+    with open(main_path, "w", encoding="utf-8") as file:
+        file.write(MAIN_MODULE)
+    py_compile.compile(main_path, cfile=main_path + "c", dfile="__main__.py", doraise=True,
+                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+
+    shutil.copytree(os.path.join(SOURCE_ROOT, "src", "locales"), os.path.join(staging, "src", "locales"))
+
+    bundled = os.path.join(staging, "src", BUNDLE_DIRECTORY)
+    os.makedirs(bundled)
+    with open(os.path.join(bundled, KB_SNAPSHOT_NAME), "wb") as file:
+        file.write(compile_snapshot(loader))
+    data_files = [KB_SNAPSHOT_NAME]
+    for path, name in [(model_path, INTENT_MODEL_NAME), (training_path, INTENT_TRAINING_NAME)]:
+        if os.path.exists(path):
+            shutil.copyfile(path, os.path.join(bundled, name))
+            data_files.append(name)
+    return BuildReport("", 0, len(modules) + 1, data_files, None)
+
+
+def _median_run_seconds(command: List[str], cwd: str, runs: int, fresh_cache: bool) -> float:
+    timings = []
+    for _ in range(runs):
+        env = dict(os.environ)
+        with tempfile.TemporaryDirectory() as cache:
+            if fresh_cache:
+                env["PYTHONPYCACHEPREFIX"] = cache
+            started = time.perf_counter()
+            subprocess.run(command, cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def measure_cold_start(path: str, runs: int = DEFAULT_COLD_START_RUNS,
+                       query: str = COLD_START_QUERY) -> ColdStart:
+    """
+    Time fresh processes answering one question.
+
+    Args:
+        path: The zipapp to run, from an empty working directory
+        runs: Processes to start for each variant; the median is reported
+        query: Question to answer
+
+    Returns:
+        Median seconds for the archive and for app.py in the source tree,
+        the latter with an empty bytecode cache for every run
+    """
+    path = os.path.abspath(path)
+    with tempfile.TemporaryDirectory() as empty:
+        bundle_seconds = _median_run_seconds([sys.executable, path, query], empty, runs, fresh_cache=False)
+    source_seconds = _median_run_seconds([sys.executable, "app.py", query], SOURCE_ROOT, runs, fresh_cache=True)
+    return ColdStart(bundle_seconds, source_seconds, runs)
+
+
+def build(out: str = DEFAULT_BUNDLE_PATH, loader: Optional[ContextLoader] = None,
+          model_path: str = DEFAULT_MODEL_PATH, training_path: str = DEFAULT_TRAINING_PATH,
+          cold_start_runs: int = DEFAULT_COLD_START_RUNS) -> BuildReport:
+    """
+    Build the zipapp.
+
+    Args:
+        out: Archive to write
+        loader: Knowledge base to compile into the archive; the default product.md when None
+        model_path: Intent model to bundle, skipped if missing
+        training_path: Labeled training queries to bundle, skipped if missing
+        cold_start_runs: Processes to time for the cold-start report; 0 skips it
+
+    Returns:
+        What was written, with the cold-start timings if measured
+    """
+    directory = os.path.dirname(out)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryDirectory() as staging:
+        staged = _stage(staging, loader or ContextLoader(), model_path, training_path)
+        zipapp.create_archive(staging, out, interpreter=INTERPRETER, compressed=True)
+    cold_start = measure_cold_start(out, cold_start_runs) if cold_start_runs > 0 else None
+    return staged._replace(path=out, size=os.path.getsize(out), cold_start=cold_start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the single-file zipapp and report its cold start.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("-o", "--out", default=DEFAULT_BUNDLE_PATH, help="archive to write")
+    parser.add_argument("--runs", type=int, default=DEFAULT_COLD_START_RUNS,
+                        help="processes to time for the cold-start report (0 skips it)")
+    args = parser.parse_args()
+
+    print(build(args.out, cold_start_runs=args.runs).format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Durable chat history for the Udaipur Local Guide AI.
+
+Stores conversation messages in SQLite (WAL mode) so that chats survive
+restarts and redeploys. Writes are queued and committed in batches by a
+background thread, reads are paged, and retention limits keep the database
+from growing without bound.
+"""
+
+import os
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+DEFAULT_DB_PATH = ".data/chat_history.db"
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_MESSAGES_PER_SESSION = 500
+DEFAULT_MAX_AGE_DAYS = 30
+PURGE_INTERVAL_SECONDS = 3600
+# Random bytes in a session id; the id is the only key to a stored chat, so it must be unguessable
+SESSION_ID_BYTES = 32
+SESSION_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{43}\Z")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id);
+CREATE INDEX IF NOT EXISTS idx_messages_created ON messages (created_at);
+"""
+
+_STOP = object()
+
+
+def restore_session_id(saved: Optional[str] = None) -> str:
+    """
+    The session id a client saved earlier, or a new random one.
+
+    Args:
+        saved: Id kept by the client (e.g. in the page URL); anything that is
+            not a well-formed random id, such as a short hand-typed name, is replaced
+
+    Returns:
+        The id to store the conversation under
+    """
+    if saved and SESSION_ID_PATTERN.match(saved):
+        return saved
+    return secrets.token_urlsafe(SESSION_ID_BYTES)
+
+
+class ChatHistoryStore:
+    """SQLite-backed chat history with a batching background writer."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_messages_per_session: int = DEFAULT_MAX_MESSAGES_PER_SESSION,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_messages_per_session = max_messages_per_session
+        self.max_age_seconds = max_age_days * 86400
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._local = threading.local()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._last_purge = 0.0
+        self._writer = threading.Thread(target=self._write_loop, name="chat-history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's read connection; WAL lets readers run alongside the writer."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def append(self, session_id: str, role: str, content: str) -> None:
+        """Queue a message for writing; never blocks on disk I/O."""
+        self._queue.put(("append", session_id, role, content, time.time()))
+
+    def clear(self, session_id: str) -> None:
+        """Queue deletion of a session's history, ordered after earlier appends."""
+        self._queue.put(("clear", session_id))
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commit outstanding writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def load_page(self, session_id: str, before_id: Optional[int] = None,
+                  limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Load one page of a session's history in chronological order.
+
+        Args:
+            session_id: Conversation to read
+            before_id: Only return messages older than this id; None for the latest page
+            limit: Maximum number of messages to return
+
+        Returns:
+            List of {"id", "role", "content"} dicts, oldest first
+        """
+        if before_id is None:
+            rows = self._reader().execute(
+                "SELECT id, role, content FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, limit)
+            ).fetchall()
+        else:
+            rows = self._reader().execute(
+                "SELECT id, role, content FROM messages WHERE session_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (session_id, before_id, limit)
+            ).fetchall()
+        return [{"id": row[0], "role": row[1], "content": row[2]} for row in reversed(rows)]
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        running = True
+        while running:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._purge_expired(connection)
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if _STOP in batch:
+                running = False
+            try:
+                self._write_batch(connection, [op for op in batch if op is not _STOP])
+            except sqlite3.Error:
+                # A failed batch is dropped rather than stopping the writer
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            self._purge_expired(connection)
+        connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Any]) -> None:
+        touched = set()
+        with connection:
+            for op in batch:
+                if op[0] == "append":
+                    _, session_id, role, content, created_at = op
+                    connection.execute(
+                        "INSERT INTO messages (session_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                        (session_id, role, content, created_at)
+                    )
+                    touched.add(session_id)
+                elif op[0] == "clear":
+                    connection.execute("DELETE FROM messages WHERE session_id = ?", (op[1],))
+                    touched.discard(op[1])
+
+            for session_id in touched:
+                connection.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND id <= ("
+                    "SELECT id FROM messages WHERE session_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (session_id, session_id, self.max_messages_per_session)
+                )
+
+    def _purge_expired(self, connection: sqlite3.Connection) -> None:
+        now = time.time()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        try:
+            with connection:
+                connection.execute("DELETE FROM messages WHERE created_at < ?", (now - self.max_age_seconds,))
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,650 @@
+"""
+Context loader for the Udaipur Local Guide AI.
+
+Reads the local knowledge base from .kiro/product.md and exposes it as a
+structured dictionary grouped by topic (language, food, tourism, culture).
+
+Each top-level "## " section of product.md becomes one entry of the context.
+Within a section, "### " subsections become keys whose values are parsed
+from their body: a bullet list of "**key**: value" lines becomes a mapping,
+other bullet lists become lists, a table becomes a list of row mappings and
+anything else is kept as text. Sections are hashed, so when the file changes
+only the sections whose text changed are parsed again; unchanged sections
+keep the same objects, and caches keyed on them stay valid.
+
+Parsed knowledge bases are frozen (mappings become read-only
+MappingProxyType views and lists become tuples) and published as numbered
+snapshots. A snapshot is never modified after it is published: a reload
+builds a new one and swaps it in with a single assignment, so threads
+answering queries read the context without taking a lock and always see one
+consistent version. Only reloads serialize, on a lock of their own.
+
+A large knowledge base can instead be sharded into a directory (.kiro/kb/)
+of markdown, JSON or YAML files listed in a manifest.json. Loading reads only
+the manifest and stats the shards: the kb_version is a hash of the manifest
+and of every shard's size and modification time, so saving any shard
+publishes a new snapshot. A section's shards are read and parsed the first
+time it is accessed (a shard saved in between is read as it is then, and the
+next load publishes its new version). Sections whose shards are unchanged
+keep their parsed objects across versions. To shard an existing product.md:
+
+    python -m src.context_loader split
+
+A zipapp build (src/bundle.py) carries the parsed knowledge base as a
+compiled JSON snapshot; it is used when neither product.md nor a sharded
+directory exists, before falling back to the built-in data.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import itertools
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # YAML shards are optional
+    yaml = None
+
+from src.resources import KB_SNAPSHOT_NAME, bundled_resource
+
+
+DEFAULT_CONTEXT_FILE = ".kiro/product.md"
+DEFAULT_KB_DIR = ".kiro/kb"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_CONTEXT_KEY = "<default>"
+BUNDLED_CONTEXT_KEY = "<bundled>"
+
+# Heading of each top-level section in product.md -> context key
+SECTION_KEYS = {
+    "overview": "overview",
+    "local language & slang": "language",
+    "language": "language",
+    "food culture": "food",
+    "food": "food",
+    "traffic & tourist nuances": "tourism",
+    "tourism": "tourism",
+    "cultural etiquette": "culture",
+    "culture": "culture",
+}
+
+SECTION_HEADING = re.compile(r"^## +(.+?)\s*$", re.MULTILINE)
+SUBSECTION_HEADING = re.compile(r"^### +(.+?)\s*$")
+KEY_VALUE_BULLET = re.compile(r"^\*\*(.+?)\*\*:\s*(.*)$")
+INTEGER_VALUE = re.compile(r"^-?\d+$")
+NUMBER_VALUE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+class ContextSnapshot(NamedTuple):
+    """One published, read-only version of a knowledge base."""
+    # Increases every time any knowledge base is (re)published
+    version: int
+    kb_version: str
+    context: Mapping
+
+
+class CachedKnowledgeBase(NamedTuple):
+    """A published knowledge base file and the parsed form of each of its sections."""
+    signature: Any
+    snapshot: ContextSnapshot
+    # Section text hash -> (context key, parsed section)
+    sections: Dict[str, Tuple[str, Any]]
+
+    @property
+    def kb_version(self) -> str:
+        return self.snapshot.kb_version
+
+    @property
+    def context(self) -> Mapping:
+        return self.snapshot.context
+
+
+# Parsed knowledge bases shared by every loader, by path. Entries are replaced,
+# never modified, so readers look them up without a lock. Reusing the same
+# context object while the file is unchanged lets indexes built from it be
+# cached by identity.
+_context_cache: Dict[str, CachedKnowledgeBase] = {}
+# Serializes reloads; never taken when the published snapshot is current
+_publish_lock = threading.Lock()
+_snapshot_versions = itertools.count(1)
+
+
+def freeze(value: Any) -> Any:
+    """
+    Deep read-only copy of parsed data: mappings become MappingProxyType views
+    and lists become tuples. Already frozen mappings are returned as they are.
+    """
+    if isinstance(value, MappingProxyType):
+        return value
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Deep mutable copy of frozen data (dicts and lists), for building a modified knowledge base."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _publish(path: str, signature: Any, kb_version: str, context: Mapping,
+             sections: Dict[str, Tuple[str, Any]], version: Optional[int] = None) -> CachedKnowledgeBase:
+    """Make a knowledge base the current one for path; call with _publish_lock held."""
+    snapshot = ContextSnapshot(version if version is not None else next(_snapshot_versions), kb_version, context)
+    cached = CachedKnowledgeBase(signature, snapshot, sections)
+    _context_cache[path] = cached
+    return cached
+
+
+def _snake_case(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def _parse_value(text: str) -> Any:
+    """Parse a mapping value: an integer, a comma-separated list of numbers, or text."""
+    if INTEGER_VALUE.match(text):
+        return int(text)
+    parts = [part.strip() for part in text.split(",")]
+    if len(parts) > 1 and all(NUMBER_VALUE.match(part) for part in parts):
+        return [float(part) for part in parts]
+    return text
+
+
+def _parse_cell(text: str) -> Any:
+    if INTEGER_VALUE.match(text):
+        return int(text)
+    if NUMBER_VALUE.match(text):
+        return float(text)
+    return text
+
+
+def _parse_table(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse a markdown table into row mappings; a column with commas in any cell holds lists."""
+    rows = [[cell.strip() for cell in line.strip().strip("|").split("|")] for line in lines]
+    header, body = rows[0], [row for row in rows[1:] if not all(set(cell) <= set("-: ") for cell in row)]
+    list_columns = {index for index in range(len(header)) if any("," in row[index] for row in body)}
+    return [
+        {name: ([part.strip() for part in cell.split(",")] if index in list_columns else _parse_cell(cell))
+         for index, (name, cell) in enumerate(zip(header, row))}
+        for row in body
+    ]
+
+
+def _parse_block(lines: List[str]) -> Any:
+    """Parse the body of one subsection."""
+    lines = [line.strip() for line in lines if line.strip()]
+    if not lines:
+        return ""
+    if all(line.startswith("|") for line in lines):
+        return _parse_table(lines)
+    if all(line.startswith("- ") for line in lines):
+        items = [line[2:].strip() for line in lines]
+        pairs = [KEY_VALUE_BULLET.match(item) for item in items]
+        if all(pairs):
+            return {match.group(1): _parse_value(match.group(2).strip()) for match in pairs}
+        return items
+    return " ".join(lines)
+
+
+def parse_section(body: str) -> Dict[str, Any]:
+    """Parse one top-level section; text before the first subsection is commentary."""
+    section: Dict[str, Any] = {}
+    current: Optional[str] = None
+    lines: List[str] = []
+    for line in body.splitlines():
+        match = SUBSECTION_HEADING.match(line)
+        if match:
+            if current is not None:
+                section[current] = _parse_block(lines)
+            current, lines = _snake_case(match.group(1)), []
+        elif current is not None:
+            lines.append(line)
+    if current is not None:
+        section[current] = _parse_block(lines)
+    return section
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    """Split product.md into (context key, section text) pairs in file order."""
+    headings = list(SECTION_HEADING.finditer(content))
+    sections = []
+    for match, following in zip(headings, headings[1:] + [None]):
+        end = following.start() if following else len(content)
+        heading = match.group(1)
+        sections.append((SECTION_KEYS.get(heading.lower(), _snake_case(heading)), content[match.end():end]))
+    return sections
+
+
+def _merge_into(section: Dict[str, Any], part: Dict[str, Any]) -> None:
+    """Merge one shard into a section: lists are concatenated and mappings updated."""
+    for key, value in part.items():
+        current = section.get(key)
+        if isinstance(current, list) and isinstance(value, list):
+            current.extend(value)
+        elif isinstance(current, dict) and isinstance(value, dict):
+            current.update(value)
+        else:
+            section[key] = value
+
+
+def _read_text(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def _parse_shard(path: str, content: str) -> Dict[str, Any]:
+    """Parse one shard file's text: markdown subsections, a JSON object or a YAML mapping."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        data = json.loads(content)
+    elif extension in (".yaml", ".yml"):
+        if yaml is None:
+            raise ValueError(f"PyYAML is needed to read {path}")
+        data = yaml.safe_load(content) or {}
+    else:
+        data = parse_section(content)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a mapping of fields")
+    return data
+
+
+def _file_signatures(root: str, files: List[str]) -> Tuple[Tuple[int, int], ...]:
+    signatures = []
+    for name in files:
+        stat = os.stat(os.path.join(root, name))
+        signatures.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signatures)
+
+
+class ShardedKnowledgeBase(Mapping):
+    """
+    A context whose sections are read and parsed from their shard files on first access.
+
+    Behaves like the context returned for product.md. Parsed sections are
+    frozen and kept, so every access after the first returns the same object
+    without taking the lock.
+    """
+
+    def __init__(self, root: str, files: Dict[str, List[str]], signatures: Dict[str, Tuple[int, int]],
+                 loaded: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.root = root
+        self.files = files
+        # Shard file name -> its (mtime_ns, size) when the knowledge base was published
+        self.signatures = signatures
+        # Section -> parsed section
+        self._loaded: Dict[str, Dict[str, Any]] = dict(loaded or {})
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        section = self._loaded.get(name)
+        if section is None:
+            if name not in self.files:
+                raise KeyError(name)
+            with self._lock:
+                section = self._loaded.get(name)
+                if section is None:
+                    section = self._parse_section(name)
+                    self._loaded[name] = section
+        return section
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.files
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def loaded_sections(self) -> List[str]:
+        return [name for name in self.files if name in self._loaded]
+
+    def _parse_section(self, name: str) -> Dict[str, Any]:
+        section: Dict[str, Any] = {}
+        for file_name in self.files[name]:
+            path = os.path.join(self.root, file_name)
+            _merge_into(section, _parse_shard(path, _read_text(path)))
+        return freeze(section)
+
+    def unchanged_sections(self, files: Dict[str, List[str]],
+                           signatures: Dict[str, Tuple[int, int]]) -> Dict[str, Dict[str, Any]]:
+        """Parsed sections whose file list and file signatures are the same in a new version."""
+        return {
+            name: section for name, section in list(self._loaded.items())
+            if files.get(name) == self.files[name]
+            and all(signatures[file_name] == self.signatures[file_name] for file_name in files[name])
+        }
+
+
+def read_manifest(path: str) -> Dict[str, List[str]]:
+    """Read a manifest.json: {"sections": {"food": ["food.md", ...], ...}}."""
+    with open(path, 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    sections = manifest.get("sections") if isinstance(manifest, dict) else None
+    if not isinstance(sections, dict) or not sections:
+        raise ValueError(f"{path} has no 'sections' mapping")
+    files = {}
+    for name, entries in sections.items():
+        entries = [entries] if isinstance(entries, str) else entries
+        if not isinstance(entries, list) or not all(isinstance(entry, str) for entry in entries):
+            raise ValueError(f"{path}: section '{name}' must list file names")
+        files[name] = entries
+    return files
+
+
+class ContextLoader:
+    """Loads and parses the product.md knowledge base."""
+
+    def __init__(self, context_file: str = DEFAULT_CONTEXT_FILE, kb_dir: Optional[str] = DEFAULT_KB_DIR):
+        self.context_file = context_file
+        # A sharded knowledge base directory; used instead of context_file when it has a manifest
+        self.kb_dir = kb_dir
+        # Short content hash of the last loaded knowledge base ("default" for built-in data)
+        self.kb_version = None
+        # Context keys of the sections parsed (rather than reused) by the last load
+        self.reparsed_sections: List[str] = []
+        # Snapshot number of the last loaded knowledge base
+        self.version: Optional[int] = None
+
+    def load_context(self) -> Mapping:
+        """Load context from product.md file."""
+        return self.snapshot().context
+
+    def snapshot(self) -> ContextSnapshot:
+        """
+        Return the current snapshot of the knowledge base, reloading it if its file changed.
+
+        The returned context is read-only and is never modified afterwards,
+        so it can be used for a whole request while other threads reload.
+        """
+        self.reparsed_sections = []
+        try:
+            if self.kb_dir and os.path.exists(os.path.join(self.kb_dir, MANIFEST_NAME)):
+                return self._loaded(self._load_sharded())
+
+            if not os.path.exists(self.context_file):
+                return self._load_bundled_context()
+
+            stat = os.stat(self.context_file)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = _context_cache.get(self.context_file)
+            if cached is not None and cached.signature == signature:
+                return self._loaded(cached)
+
+            with _publish_lock:
+                # Another thread may have published this version while we waited
+                cached = _context_cache.get(self.context_file)
+                if cached is not None and cached.signature == signature:
+                    return self._loaded(cached)
+
+                with open(self.context_file, 'r', encoding='utf-8') as file:
+                    content = file.read()
+
+                kb_version = hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]
+                if cached is not None and cached.kb_version == kb_version:
+                    # Touched but not changed: same snapshot under the new signature
+                    return self._loaded(_publish(self.context_file, signature, kb_version, cached.context,
+                                                 cached.sections, cached.snapshot.version))
+
+                context, sections = self._parse_sections(content, cached.sections if cached else {})
+                return self._loaded(_publish(self.context_file, signature, kb_version, context, sections))
+        except Exception as e:
+            return self._load_default_context()
+
+    def _loaded(self, cached: CachedKnowledgeBase) -> ContextSnapshot:
+        self.kb_version = cached.kb_version
+        self.version = cached.snapshot.version
+        return cached.snapshot
+
+    def _sharded_signature(self, cached: Optional[CachedKnowledgeBase]) -> Tuple:
+        """(size, mtime) of the manifest and of every shard the cached version lists."""
+        names = [MANIFEST_NAME] + (list(cached.context.signatures) if cached is not None else [])
+        return _file_signatures(self.kb_dir, names)
+
+    def _load_sharded(self) -> CachedKnowledgeBase:
+        """
+        Open the sharded knowledge base in kb_dir, reading its manifest and stating its shards.
+
+        A change to the manifest or to a shard file's size or modification
+        time publishes a new version. Sections whose files are unchanged keep
+        their parsed objects, and the rest are read and parsed on first access.
+        """
+        cached = _context_cache.get(self.kb_dir)
+        if cached is not None and cached.signature == self._sharded_signature(cached):
+            return cached
+
+        with _publish_lock:
+            cached = _context_cache.get(self.kb_dir)
+            if cached is not None and cached.signature == self._sharded_signature(cached):
+                return cached
+
+            manifest_path = os.path.join(self.kb_dir, MANIFEST_NAME)
+            manifest_signature = _file_signatures(self.kb_dir, [MANIFEST_NAME])
+            with open(manifest_path, 'rb') as file:
+                manifest_bytes = file.read()
+            files = read_manifest(manifest_path)
+            names = list(dict.fromkeys(name for entries in files.values() for name in entries))
+            shard_signatures = _file_signatures(self.kb_dir, names)
+            signatures = dict(zip(names, shard_signatures))
+
+            content = hashlib.sha1(manifest_bytes)
+            for name, (mtime_ns, size) in signatures.items():
+                content.update(f"\0{name}\0{mtime_ns}\0{size}".encode('utf-8'))
+            kb_version = content.hexdigest()[:12]
+
+            signature = manifest_signature + shard_signatures
+            if cached is not None and cached.kb_version == kb_version:
+                # Touched but not changed: same snapshot under the new signature
+                return _publish(self.kb_dir, signature, kb_version, cached.context, {}, cached.snapshot.version)
+
+            loaded = cached.context.unchanged_sections(files, signatures) if cached is not None else {}
+            context = ShardedKnowledgeBase(self.kb_dir, files, signatures, loaded)
+            return _publish(self.kb_dir, signature, kb_version, context, {})
+
+    def _load_default_context(self) -> ContextSnapshot:
+        """Return the built-in context, shared across loads."""
+        cached = _context_cache.get(DEFAULT_CONTEXT_KEY)
+        if cached is None:
+            with _publish_lock:
+                cached = _context_cache.get(DEFAULT_CONTEXT_KEY)
+                if cached is None:
+                    cached = _publish(DEFAULT_CONTEXT_KEY, None, "default", self._get_default_context(), {})
+        return self._loaded(cached)
+
+    def _load_bundled_context(self) -> ContextSnapshot:
+        """Return the knowledge base compiled into a zipapp build, or the built-in context outside one."""
+        cached = _context_cache.get(BUNDLED_CONTEXT_KEY)
+        if cached is None:
+            data = bundled_resource(KB_SNAPSHOT_NAME)
+            if data is None:
+                return self._load_default_context()
+            with _publish_lock:
+                cached = _context_cache.get(BUNDLED_CONTEXT_KEY)
+                if cached is None:
+                    compiled = json.loads(data.decode("utf-8"))
+                    cached = _publish(BUNDLED_CONTEXT_KEY, None, compiled["kb_version"],
+                                      freeze(compiled["context"]), {})
+        return self._loaded(cached)
+
+    def _get_default_context(self) -> Mapping:
+        """Return default context data, frozen."""
+        return freeze({
+            "language": {
+                "greetings": ["Khamma Ghani", "Ram Ram sa", "Padharo Mhare Des", "Bhai sa"],
+                "phrases": {
+                    "Khamma Ghani": "Traditional greeting meaning hello/respect",
+                    "Ram Ram sa": "Casual greeting",
+                    "Padharo Mhare Des": "Welcome to our land",
+                    "Bhai sa": "Respectful way to address someone"
+                }
+            },
+            "food": {
+                "dishes": ["Dal Baati Churma", "Kachori", "Mirchi Vada", "Ghewar"],
+                "dish_aliases": {
+                    "dal bati": "Dal Baati Churma",
+                    "dal baati": "Dal Baati Churma",
+                    "daal baati churma": "Dal Baati Churma",
+                    "baati churma": "Dal Baati Churma"
+                },
+                "areas": ["Surajpole", "Hathipole", "Chetak Circle", "Old City markets"],
+                "venues": [
+                    {"name": "Surajpole kachori stalls", "area": "Surajpole", "lat": 24.5783, "lon": 73.6921,
+                     "dishes": ["Kachori", "Mirchi Vada"],
+                     "hours": "daily 07:00-12:00; daily 16:00-21:00"},
+                    {"name": "Hathipole market snack stalls", "area": "Hathipole", "lat": 24.5862, "lon": 73.6893,
+                     "dishes": ["Kachori", "Mirchi Vada"],
+                     "hours": "Mon-Sat 10:00-21:30; Sun 11:00-20:00"},
+                    {"name": "Chetak Circle street food lane", "area": "Chetak Circle", "lat": 24.5897, "lon": 73.6971,
+                     "dishes": ["Dal Baati Churma", "Kachori"],
+                     "hours": "daily 17:00-23:30"},
+                    {"name": "Jagdish Chowk cafes", "area": "Old City markets", "lat": 24.5798, "lon": 73.6842,
+                     "dishes": ["Dal Baati Churma"],
+                     "hours": "daily 08:00-22:30"},
+                    {"name": "Bada Bazaar sweet shops", "area": "Old City markets", "lat": 24.5818, "lon": 73.6870,
+                     "dishes": ["Ghewar"],
+                     "hours": "Mon-Sat 09:00-21:00"},
+                    {"name": "Gangaur Ghat rooftop cafes", "area": "Old City markets", "lat": 24.5790, "lon": 73.6822,
+                     "dishes": ["Dal Baati Churma"],
+                     "hours": "daily 11:00-23:00"},
+                    {"name": "Fateh Sagar promenade stalls", "area": "Fateh Sagar", "lat": 24.5985, "lon": 73.6770,
+                     "dishes": ["Mirchi Vada"],
+                     "hours": "daily 16:00-00:30"}
+                ]
+            },
+            "tourism": {
+                "peak_times": {"City Palace": "4 PM - 9 PM", "Lake Pichola": "4 PM - 9 PM"},
+                "transportation": {"heritage_areas": "Two-wheelers are the fastest mode inside heritage areas"},
+                "peak_season": "October to March",
+                "holiday_exceptions": {"2026-11-08": "City Palace closed; Bada Bazaar sweet shops 07:00-23:00"}
+            },
+            "culture": {
+                "etiquette": ["Modest clothing near temples and palaces", "Respect local customs and greetings"]
+            },
+            "overview": {
+                "description": "Udaipur, known as the City of Lakes",
+                "key_areas": ["Lake Pichola", "City Palace", "Fateh Sagar", "Sajjangarh"],
+                "coordinates": {
+                    "City Palace": [24.5764, 73.6835],
+                    "Lake Pichola": [24.5720, 73.6790],
+                    "Fateh Sagar": [24.6005, 73.6745],
+                    "Sajjangarh": [24.5930, 73.6393],
+                    "Jagdish Temple": [24.5796, 73.6838],
+                    "Surajpole": [24.5780, 73.6925],
+                    "Hathipole": [24.5859, 73.6897],
+                    "Chetak Circle": [24.5900, 73.6975]
+                },
+                "visit_minutes": {"City Palace": 150, "Lake Pichola": 60, "Fateh Sagar": 60, "Sajjangarh": 75},
+                "opening_hours": {
+                    "City Palace": "daily 09:30-17:30",
+                    "Jagdish Temple": "daily 05:00-13:00, 17:00-22:00",
+                    "Sajjangarh": "daily 09:00-18:00",
+                    "Lake Pichola": "daily 09:00-18:00",
+                    "Fateh Sagar": "24 hours"
+                },
+                "location_aliases": {
+                    "the lake": "Lake Pichola",
+                    "lake palace": "Lake Pichola",
+                    "the lake palace": "Lake Pichola",
+                    "monsoon palace": "Sajjangarh",
+                    "sajjangarh palace": "Sajjangarh",
+                    "fatehsagar": "Fateh Sagar",
+                    "jagdish mandir": "Jagdish Temple"
+                }
+            }
+        })
+
+    def _parse_context(self, content: str) -> Mapping:
+        """Parse markdown content into structured data."""
+        return self._parse_sections(content, {})[0]
+
+    def _parse_sections(self, content: str, previous: Dict[str, Tuple[str, Any]]
+                        ) -> Tuple[Mapping, Dict[str, Tuple[str, Any]]]:
+        """
+        Parse product.md, reusing previously parsed sections whose text is unchanged.
+
+        Args:
+            content: Full text of product.md
+            previous: Section text hash -> (context key, parsed section) from the last load
+
+        Returns:
+            The frozen context and the section table for the next load
+        """
+        context: Dict[str, Any] = {}
+        sections: Dict[str, Tuple[str, Any]] = {}
+        for key, text in split_sections(content):
+            digest = hashlib.sha1(f"{key}\n{text}".encode('utf-8')).hexdigest()
+            reused = previous.get(digest)
+            if reused is not None:
+                parsed = reused[1]
+            else:
+                parsed = freeze(parse_section(text))
+                self.reparsed_sections.append(key)
+            context[key] = parsed
+            sections[digest] = (key, parsed)
+
+        if not context:
+            raise ValueError("product.md has no '## ' sections")
+        return MappingProxyType(context), sections
+
+
+def split_product_md(source: str = DEFAULT_CONTEXT_FILE, kb_dir: str = DEFAULT_KB_DIR) -> Dict[str, List[str]]:
+    """Write each section of a product.md to its own shard in kb_dir, with a manifest."""
+    with open(source, 'r', encoding='utf-8') as file:
+        content = file.read()
+    os.makedirs(kb_dir, exist_ok=True)
+    files: Dict[str, List[str]] = {}
+    for key, text in split_sections(content):
+        name = f"{key}.md"
+        with open(os.path.join(kb_dir, name), 'w', encoding='utf-8') as file:
+            file.write(text.strip() + "\n")
+        files.setdefault(key, []).append(name)
+    with open(os.path.join(kb_dir, MANIFEST_NAME), 'w', encoding='utf-8') as file:
+        json.dump({"sections": files}, file, indent=2)
+        file.write("\n")
+    return files
+
+
+def compile_snapshot(loader: Optional[ContextLoader] = None) -> bytes:
+    """
+    The current knowledge base as a compiled snapshot: its version and every
+    section, already parsed, as one JSON document.
+    """
+    loader = loader or ContextLoader()
+    snapshot = loader.snapshot()
+    return json.dumps({"kb_version": snapshot.kb_version, "context": thaw(snapshot.context)},
+                      ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Knowledge base tools.")
+    parser.add_argument("command", choices=["split", "snapshot"])
+    parser.add_argument("--source", default=DEFAULT_CONTEXT_FILE, help="product.md to shard or compile")
+    parser.add_argument("--out", default=None,
+                        help=f"directory for the shards and manifest (default {DEFAULT_KB_DIR}), "
+                             f"or the snapshot file (default {KB_SNAPSHOT_NAME})")
+    args = parser.parse_args()
+
+    if args.command == "split":
+        out = args.out or DEFAULT_KB_DIR
+        files = split_product_md(args.source, out)
+        print(f"Wrote {sum(len(names) for names in files.values())} shards and {MANIFEST_NAME} to {out}")
+    else:
+        out = args.out or KB_SNAPSHOT_NAME
+        data = compile_snapshot(ContextLoader(args.source))
+        with open(out, "wb") as file:
+            file.write(data)
+        print(f"Wrote the compiled knowledge base ({len(data)} bytes) to {out}")
+
+
+if __name__ == "__main__":
+    main()
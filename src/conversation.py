@@ -0,0 +1,116 @@
+"""
+Per-session conversation state for follow-up questions.
+
+Remembers the category, location and time context of each session's last
+question so that a follow-up such as "What about Hathipole?" can reuse them.
+State is held in a bounded store with least-recently-used and time-to-live
+eviction, so memory stays flat regardless of how many sessions are open.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, Optional
+
+from src.query_processor import QueryIntent
+
+
+DEFAULT_MAX_SESSIONS = 50000
+DEFAULT_TTL_SECONDS = 30 * 60
+
+
+class ConversationState:
+    """The parts of the previous intent carried into the next query."""
+
+    __slots__ = ("category", "location", "time_context", "updated_at")
+
+    def __init__(self, category: str, location: Optional[str], time_context: Optional[str], updated_at: float):
+        self.category = category
+        self.location = location
+        self.time_context = time_context
+        self.updated_at = updated_at
+
+
+def resolve_follow_up(intent: QueryIntent, state: Optional[ConversationState]) -> QueryIntent:
+    """
+    Fill gaps in a follow-up intent from the previous turn.
+
+    A query with no recognizable category inherits the previous category.
+    Location and time context are only carried forward while the topic stays
+    the same, so switching from food to etiquette starts fresh.
+    """
+    if state is None:
+        return intent
+
+    category = intent.category
+    categories = intent.categories
+    if category == "general" and state.category != "general":
+        category = state.category
+        categories = [state.category]
+
+    if category != state.category:
+        return intent
+
+    location = intent.location or state.location
+    return replace(
+        intent,
+        category=category,
+        categories=categories,
+        location=location,
+        locations=intent.locations or ([location] if location else []),
+        time_context=intent.time_context or state.time_context
+    )
+
+
+class ConversationStore:
+    """Thread-safe, bounded, TTL-evicted map of session id to ConversationState."""
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_sessions <= 0:
+            raise ValueError("max_sessions must be positive")
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._states: "OrderedDict[str, ConversationState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, session_id: str) -> Optional[ConversationState]:
+        """Return the live state for a session, or None if absent or expired."""
+        now = self._clock()
+        with self._lock:
+            self._evict_expired(now)
+            return self._states.get(session_id)
+
+    def update(self, session_id: str, intent: QueryIntent) -> None:
+        """Record the resolved intent as the session's latest turn."""
+        now = self._clock()
+        state = ConversationState(intent.category, intent.location, intent.time_context, now)
+        with self._lock:
+            self._states[session_id] = state
+            self._states.move_to_end(session_id)
+            self._evict_expired(now)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+    def clear(self, session_id: str) -> None:
+        """Forget a session's state (e.g. when the user clears the chat)."""
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def _evict_expired(self, now: float) -> None:
+        # Entries are kept in update order, so expired ones are always at the front
+        cutoff = now - self.ttl_seconds
+        while self._states:
+            oldest = next(iter(self._states.values()))
+            if oldest.updated_at > cutoff:
+                break
+            self._states.popitem(last=False)
+
+
+# Shared by the CLI and every Streamlit session in this process
+DEFAULT_CONVERSATION_STORE = ConversationStore()
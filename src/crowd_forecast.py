@@ -0,0 +1,246 @@
+"""
+Crowd forecasts by location, hour, weekday and month.
+
+Holds a NumPy tensor of expected crowd level (0 = empty, 1 = packed) with
+shape (locations, 24 hours, 7 weekdays, 12 months). The tensor is built from
+the knowledge base (per-location hourly/weekday/month profiles, falling back
+to the peak times and peak season) and can be overridden cell by cell from a
+CSV file. "Best time this week" questions are answered with a single argmin
+over every requested attraction at once.
+"""
+
+import csv
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.crowd_model import UDAIPUR_TIMEZONE, crowd_model_for
+
+
+DEFAULT_FORECAST_CSV = ".kiro/crowd_forecast.csv"
+
+FORECAST_CACHE_SIZE = 8
+
+# City-wide guidance used for attractions without their own peak times
+DEFAULT_PEAK_WINDOW = "4 PM - 9 PM"
+
+# Hours (local time) at which a visit can be recommended
+VISITING_HOURS = range(7, 22)
+
+BASELINE_LEVEL = 0.1
+WEEKDAY_FACTORS = (1.0, 1.0, 1.0, 1.0, 1.1, 1.25, 1.3)
+PEAK_SEASON_FACTOR = 1.4
+OFF_SEASON_FACTOR = 0.8
+
+MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december")
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+class BestSlot(NamedTuple):
+    location: str
+    day: datetime
+    hour: int
+    level: float
+
+
+def parse_month_range(text: str) -> List[int]:
+    """Return month indexes (0 = January) covered by text such as "October to March"."""
+    found = [index for word in re.findall(r"[a-z]+", text.lower())
+             for index, month in enumerate(MONTHS) if month.startswith(word) and len(word) >= 3]
+    if len(found) < 2:
+        return found
+    start, end = found[0], found[-1]
+    if end >= start:
+        return list(range(start, end + 1))
+    return list(range(start, 12)) + list(range(0, end + 1))
+
+
+def crowd_level(level: float) -> str:
+    """The band of a crowd level: "light", "moderate" or "heavy"."""
+    if level < 0.3:
+        return "light"
+    if level < 0.6:
+        return "moderate"
+    return "heavy"
+
+
+def describe_level(level: float) -> str:
+    return f"{crowd_level(level)} crowds"
+
+
+class CrowdForecast:
+    """Expected crowd level tensor indexed by (location, hour, weekday, month)."""
+
+    def __init__(self, locations: Sequence[str], levels: np.ndarray):
+        if levels.shape != (len(locations), 24, 7, 12):
+            raise ValueError(f"Forecast tensor has shape {levels.shape}, expected ({len(locations)}, 24, 7, 12)")
+        self.locations = list(locations)
+        self.levels = levels.astype(np.float32, copy=False)
+        self._location_index = {name.lower(): index for index, name in enumerate(self.locations)}
+
+    @classmethod
+    def from_context(cls, context: Dict[str, Any], csv_path: Optional[str] = DEFAULT_FORECAST_CSV) -> "CrowdForecast":
+        """
+        Build the forecast for a knowledge base, compiling it once per distinct content.
+
+        Uses tourism.crowd_forecast profiles where present, otherwise derives
+        an hourly profile from the peak times and scales it by weekday and
+        peak season. Cells in csv_path (if it exists) override the result.
+
+        Looked up by the identity of the context's tourism and overview
+        sections, which ContextLoader reuses until the knowledge base changes;
+        the content key is only computed for sections not seen before, so an
+        edited csv_path is picked up with the next knowledge base.
+        """
+        sections = (context.get("tourism", {}), context.get("overview", {}))
+        identity = (id(sections[0]), id(sections[1]), csv_path)
+        cached = _FORECASTS_BY_SECTIONS.get(identity)
+        if cached is not None and cached[0][0] is sections[0] and cached[0][1] is sections[1]:
+            return cached[1]
+
+        key = forecast_key(context, csv_path)
+        forecast = _PRELOADED_FORECASTS.get(key)
+        if forecast is None:
+            forecast = _build_forecast(key)
+        with _FORECASTS_LOCK:
+            _FORECASTS_BY_SECTIONS[identity] = (sections, forecast)
+            while len(_FORECASTS_BY_SECTIONS) > FORECAST_CACHE_SIZE:
+                _FORECASTS_BY_SECTIONS.popitem(last=False)
+        return forecast
+
+    def location_indexes(self, locations: Sequence[str]) -> List[int]:
+        """Map location names to tensor rows, skipping unknown names."""
+        indexes = []
+        for location in locations:
+            location = location.lower()
+            index = self._location_index.get(location)
+            if index is None:
+                index = next((i for name, i in self._location_index.items() if location in name), None)
+            if index is not None:
+                indexes.append(index)
+        return indexes
+
+    def best_slots(self, locations: Sequence[str], days: int = 7,
+                   now: Optional[datetime] = None) -> List[BestSlot]:
+        """
+        Find the least crowded visiting hour in the next days for each location.
+
+        All requested locations are searched together: the forecast for the
+        coming days is gathered into a (locations, days, hours) block and a
+        single argmin picks each location's slot. Hours already past today
+        and hours outside VISITING_HOURS are excluded; a location with no
+        hour left in the window (a "today" question late in the evening) gets
+        no slot.
+        """
+        indexes = self.location_indexes(locations)
+        if not indexes:
+            return []
+
+        now = now or datetime.now(UDAIPUR_TIMEZONE)
+        dates = [now + timedelta(days=offset) for offset in range(days)]
+        weekdays = np.array([date.weekday() for date in dates])
+        months = np.array([date.month - 1 for date in dates])
+
+        # (locations, hours, days) -> (locations, days, hours)
+        block = self.levels[np.array(indexes)][:, :, weekdays, months].transpose(0, 2, 1)
+
+        allowed = np.zeros((days, 24), dtype=bool)
+        allowed[:, VISITING_HOURS.start:VISITING_HOURS.stop] = True
+        allowed[0, :now.hour + 1] = False
+        masked = np.where(allowed, block, np.inf)
+
+        flat = masked.reshape(len(indexes), -1)
+        open_rows = np.isfinite(flat).any(axis=1)
+        day_offsets, hours = np.divmod(flat.argmin(axis=1), 24)
+        return [
+            BestSlot(self.locations[index], dates[day], int(hour), float(block[row, day, hour]))
+            for row, (index, day, hour) in enumerate(zip(indexes, day_offsets, hours)) if open_rows[row]
+        ]
+
+
+def _hourly_profile_from_peaks(peak_text: str) -> np.ndarray:
+    levels = crowd_model_for({"location": peak_text}).levels[0].astype(np.float32) / 2
+    return BASELINE_LEVEL + (1 - BASELINE_LEVEL) * levels.reshape(24, 60).mean(axis=1)
+
+
+def _load_csv_overrides(csv_path: str, locations: List[str], levels: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """Apply location,hour,weekday,month,level rows from a CSV file onto the tensor."""
+    rows = []
+    with open(csv_path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            rows.append((row["location"], int(row["hour"]), int(row["weekday"]), int(row["month"]) - 1,
+                         float(row["level"])))
+
+    new_locations = [name for name in dict.fromkeys(row[0] for row in rows) if name not in locations]
+    if new_locations:
+        filler = np.full((len(new_locations), 24, 7, 12), BASELINE_LEVEL, dtype=np.float32)
+        levels = np.concatenate([levels, filler])
+        locations = locations + new_locations
+
+    position = {name: index for index, name in enumerate(locations)}
+    if rows:
+        location_rows = np.array([position[row[0]] for row in rows])
+        hours, weekdays, months, values = (np.array(column) for column in list(zip(*rows))[1:])
+        levels[location_rows, hours, weekdays, months] = values
+    return locations, levels
+
+
+def forecast_key(context: Dict[str, Any], csv_path: Optional[str] = DEFAULT_FORECAST_CSV) -> str:
+    """The content a knowledge base's forecast is compiled from, as a cache key."""
+    tourism = context.get("tourism", {})
+    key_areas = context.get("overview", {}).get("key_areas", [])
+    csv_mtime = os.path.getmtime(csv_path) if csv_path and os.path.exists(csv_path) else None
+    return json.dumps(
+        [tourism.get("peak_times", {}), tourism.get("peak_season", ""),
+         tourism.get("crowd_forecast", {}), key_areas, csv_path, csv_mtime],
+        sort_keys=True, default=dict
+    )
+
+
+# Forecasts compiled in another process (e.g. attached from shared memory), by content key
+_PRELOADED_FORECASTS: Dict[str, CrowdForecast] = {}
+
+# (id(tourism), id(overview), csv_path) -> ((tourism, overview), forecast)
+_FORECASTS_BY_SECTIONS: "OrderedDict[Tuple[int, int, Optional[str]], Tuple[Tuple[Any, Any], CrowdForecast]]" = \
+    OrderedDict()
+_FORECASTS_LOCK = threading.Lock()
+
+
+def preload_forecast(key: str, forecast: CrowdForecast) -> None:
+    """Serve forecast for the content key instead of compiling it."""
+    _PRELOADED_FORECASTS[key] = forecast
+
+
+@lru_cache(maxsize=8)
+def _build_forecast(key: str) -> CrowdForecast:
+    peak_times, peak_season, profiles, key_areas, csv_path, _ = json.loads(key)
+
+    locations = list(dict.fromkeys(list(peak_times) + list(key_areas) + list(profiles)))
+    season_months = parse_month_range(peak_season)
+    default_month = np.full(12, OFF_SEASON_FACTOR, dtype=np.float32)
+    default_month[season_months] = PEAK_SEASON_FACTOR
+
+    hourly = np.empty((len(locations), 24), dtype=np.float32)
+    weekday = np.empty((len(locations), 7), dtype=np.float32)
+    month = np.empty((len(locations), 12), dtype=np.float32)
+    for index, location in enumerate(locations):
+        profile = profiles.get(location, {})
+        hourly[index] = profile.get("hourly") or _hourly_profile_from_peaks(peak_times.get(location, DEFAULT_PEAK_WINDOW))
+        weekday[index] = profile.get("weekday") or WEEKDAY_FACTORS
+        month[index] = profile.get("month") or default_month
+
+    levels = hourly[:, :, None, None] * weekday[:, None, :, None] * month[:, None, None, :]
+    levels = np.clip(levels, 0.0, 1.0)
+
+    if csv_path and os.path.exists(csv_path):
+        locations, levels = _load_csv_overrides(csv_path, locations, np.ascontiguousarray(levels))
+
+    return CrowdForecast(locations, levels)
@@ -0,0 +1,192 @@
+"""
+Time-of-day crowd model for Udaipur attractions.
+
+Parses the free-text peak windows in the tourism section ("4 PM - 9 PM")
+into a per-location, minute-resolution array of crowd levels when a
+knowledge base is first seen. Questions such as "Is City Palace crowded at
+5:30pm?" are then answered by indexing one column of that array, which
+evaluates every location at once, together with the next quiet window.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+MINUTES_PER_DAY = 24 * 60
+
+# Minutes either side of a peak window that count as moderately busy
+SHOULDER_MINUTES = 60
+
+QUIET, MODERATE, PEAK = 0, 1, 2
+CROWD_LEVEL_NAMES = ("quiet", "moderate", "peak")
+
+# Udaipur local time (India has no daylight saving)
+UDAIPUR_TIMEZONE = timezone(timedelta(hours=5, minutes=30))
+
+_TIME_POINT = r"(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?"
+TIME_RANGE_PATTERN = re.compile(_TIME_POINT + r"\s*(?:-|–|to)\s*" + _TIME_POINT, re.IGNORECASE)
+CLOCK_12H_PATTERN = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)", re.IGNORECASE)
+CLOCK_24H_PATTERN = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)\b")
+NOW_PATTERN = re.compile(r"\b(now|right now|currently|at the moment)\b", re.IGNORECASE)
+
+
+class CrowdStatus(NamedTuple):
+    location: str
+    level: str
+    quiet_from: int
+    quiet_until: int
+
+
+def _to_minutes(hour: int, minute: int, meridiem: Optional[str]) -> int:
+    meridiem = (meridiem or "").replace(".", "").lower()
+    if meridiem == "pm" and hour != 12:
+        hour += 12
+    elif meridiem == "am" and hour == 12:
+        hour = 0
+    return (hour % 24) * 60 + minute
+
+
+def parse_time_range(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a peak window such as "4 PM - 9 PM" or "7-10 AM" into minutes.
+
+    Returns:
+        (start, end) minutes after midnight with end exclusive, or None if
+        the text contains no range. Windows may wrap past midnight.
+    """
+    match = TIME_RANGE_PATTERN.search(text)
+    if not match:
+        return None
+    start_hour, start_minute, start_meridiem, end_hour, end_minute, end_meridiem = match.groups()
+    # "7-10 AM": the first point borrows the second point's meridiem
+    start_meridiem = start_meridiem or end_meridiem
+    start = _to_minutes(int(start_hour), int(start_minute or 0), start_meridiem)
+    end = _to_minutes(int(end_hour), int(end_minute or 0), end_meridiem)
+    return start, end
+
+
+def parse_clock_time(text: str, now: Optional[datetime] = None) -> Optional[int]:
+    """
+    Find the time of day a query asks about, in minutes after midnight.
+
+    Understands "5:30pm", "5 pm", "17:00" and "now"; "now" is resolved in
+    Udaipur local time. Returns None if the query mentions no time.
+    """
+    match = CLOCK_12H_PATTERN.search(text)
+    if match:
+        return _to_minutes(int(match.group(1)), int(match.group(2) or 0), match.group(3))
+    match = CLOCK_24H_PATTERN.search(text)
+    if match:
+        return int(match.group(1)) * 60 + int(match.group(2))
+    if NOW_PATTERN.search(text):
+        now = now or datetime.now(UDAIPUR_TIMEZONE)
+        return now.hour * 60 + now.minute
+    return None
+
+
+def format_minutes(minutes: int) -> str:
+    """Format minutes after midnight as a 12-hour clock time ("5:30 PM")."""
+    hour, minute = divmod(minutes % MINUTES_PER_DAY, 60)
+    meridiem = "AM" if hour < 12 else "PM"
+    hour = hour % 12 or 12
+    return f"{hour}:{minute:02d} {meridiem}"
+
+
+def _mark_window(row: np.ndarray, start: int, end: int, level: int) -> None:
+    """Raise row to at least level over [start, end), wrapping past midnight."""
+    if start == end:
+        row[:] = np.maximum(row, level)
+        return
+    minutes = np.arange(start, end if end > start else end + MINUTES_PER_DAY) % MINUTES_PER_DAY
+    row[minutes] = np.maximum(row[minutes], level)
+
+
+class CrowdModel:
+    """Minute-resolution crowd levels for every location with known peak times."""
+
+    def __init__(self, peak_windows: Dict[str, List[Tuple[int, int]]]):
+        self.locations = list(peak_windows)
+        self._location_index = {name.lower(): index for index, name in enumerate(self.locations)}
+
+        levels = np.zeros((len(self.locations), MINUTES_PER_DAY), dtype=np.uint8)
+        for index, windows in enumerate(peak_windows.values()):
+            for start, end in windows:
+                _mark_window(levels[index], start - SHOULDER_MINUTES, end + SHOULDER_MINUTES, MODERATE)
+                _mark_window(levels[index], start, end, PEAK)
+        self.levels = levels
+
+        self.quiet_from, self.quiet_until = self._next_quiet_windows(levels == QUIET)
+
+    @staticmethod
+    def _next_quiet_windows(quiet: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        For every location and minute, find the start and end of the next quiet window.
+
+        Computed once with reverse running minima over two days of minutes so
+        wrap-around past midnight is handled without branching.
+        """
+        minutes = np.arange(2 * MINUTES_PER_DAY)
+        never = np.iinfo(np.int64).max
+        doubled = np.concatenate([quiet, quiet], axis=1)
+
+        def next_index(mask: np.ndarray) -> np.ndarray:
+            candidates = np.where(mask, minutes, never)
+            return np.minimum.accumulate(candidates[:, ::-1], axis=1)[:, ::-1]
+
+        next_quiet = next_index(doubled)
+        next_busy = next_index(~doubled)
+
+        quiet_from = next_quiet[:, :MINUTES_PER_DAY]
+        # A location that is never quiet (or never busy) keeps the sentinel
+        has_quiet = quiet_from != never
+        start = np.where(has_quiet, quiet_from, 0) % (2 * MINUTES_PER_DAY)
+        quiet_until = np.take_along_axis(next_busy, start, axis=1)
+
+        quiet_from = np.where(has_quiet, quiet_from % MINUTES_PER_DAY, -1)
+        quiet_until = np.where(has_quiet & (quiet_until != never), quiet_until % MINUTES_PER_DAY, -1)
+        return quiet_from, quiet_until
+
+    def evaluate(self, minute: int) -> List[CrowdStatus]:
+        """Crowd level and next quiet window for every location at the given minute."""
+        minute %= MINUTES_PER_DAY
+        levels = self.levels[:, minute]
+        quiet_from = self.quiet_from[:, minute]
+        quiet_until = self.quiet_until[:, minute]
+        return [
+            CrowdStatus(name, CROWD_LEVEL_NAMES[level], int(start), int(end))
+            for name, level, start, end in zip(self.locations, levels, quiet_from, quiet_until)
+        ]
+
+    def evaluate_location(self, location: str, minute: int) -> Optional[CrowdStatus]:
+        """Crowd status for one location, matched case-insensitively by substring."""
+        location = location.lower()
+        index = self._location_index.get(location)
+        if index is None:
+            index = next((i for name, i in self._location_index.items() if location in name), None)
+        if index is None:
+            return None
+        minute %= MINUTES_PER_DAY
+        return CrowdStatus(
+            self.locations[index],
+            CROWD_LEVEL_NAMES[self.levels[index, minute]],
+            int(self.quiet_from[index, minute]),
+            int(self.quiet_until[index, minute])
+        )
+
+
+@lru_cache(maxsize=8)
+def _build_crowd_model(peak_items: Tuple[Tuple[str, str], ...]) -> CrowdModel:
+    windows = {}
+    for location, text in peak_items:
+        parsed = [parse_time_range(part) for part in re.split(r"[,;]| and ", text)]
+        windows[location] = [window for window in parsed if window is not None]
+    return CrowdModel(windows)
+
+
+def crowd_model_for(peak_times: Dict[str, str]) -> CrowdModel:
+    """Return the compiled crowd model for a knowledge base's peak_times, building it once."""
+    return _build_crowd_model(tuple(peak_times.items()))
@@ -0,0 +1,248 @@
+"""
+Geospatial index for "near me / near X" lookups.
+
+Places (sights and food venues) are projected onto a local kilometre grid
+and bucketed into fixed-size cells stored as flat NumPy arrays (cell ids
+sorted, with offsets into one index array). Radius and k-nearest queries
+only touch the cells around the query point, so their cost depends on local
+density rather than on the total number of venues.
+"""
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_CELL_KM = 0.5
+
+# Beyond this many rings of cells a search scans every place instead
+MAX_SEARCH_RINGS = 64
+INDEX_CACHE_SIZE = 8
+
+COORDINATE_PATTERN = re.compile(r"(-?\d{1,2}\.\d+)\s*,\s*(-?\d{1,3}\.\d+)")
+RADIUS_PATTERN = re.compile(r"within\s+(\d+(?:\.\d+)?)\s*(km|kms|kilometers?|kilometres?|m|meters?|metres?)\b")
+
+
+class Place(NamedTuple):
+    name: str
+    kind: str
+    latitude: float
+    longitude: float
+    area: Optional[str]
+    dishes: Tuple[str, ...]
+
+
+class NearbyPlace(NamedTuple):
+    place: Place
+    distance_km: float
+
+
+# (id(coordinates), id(venues)) -> (coordinates, venues, GeoIndex)
+_INDEX_CACHE: "OrderedDict[Tuple[int, int], Tuple[Any, Any, GeoIndex]]" = OrderedDict()
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def parse_coordinates(text: str) -> Optional[Tuple[float, float]]:
+    """Find a "lat, lon" pair in text."""
+    match = COORDINATE_PATTERN.search(text)
+    if not match:
+        return None
+    return float(match.group(1)), float(match.group(2))
+
+
+def parse_radius_km(text: str) -> Optional[float]:
+    """Find a radius such as "within 1 km" or "within 500 m" in text, in kilometres."""
+    match = RADIUS_PATTERN.search(text)
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value if match.group(2).startswith("k") else value / 1000
+
+
+class GeoIndex:
+    """Uniform grid index over places with radius and k-nearest queries."""
+
+    def __init__(self, places: Sequence[Place], cell_km: float = DEFAULT_CELL_KM):
+        self.places = list(places)
+        self.cell_km = cell_km
+        self._by_name = {place.name.lower(): place for place in self.places}
+
+        latitudes = np.array([place.latitude for place in self.places], dtype=np.float64)
+        longitudes = np.array([place.longitude for place in self.places], dtype=np.float64)
+        self.kinds = np.array([place.kind for place in self.places])
+
+        # Equirectangular projection around the centre of the data set
+        self._reference_latitude = float(latitudes.mean()) if len(latitudes) else 0.0
+        self._x, self._y = self._project(latitudes, longitudes)
+
+        cell_x = np.floor(self._x / cell_km).astype(np.int64)
+        cell_y = np.floor(self._y / cell_km).astype(np.int64)
+        order = np.lexsort((cell_y, cell_x))
+        self._order = order
+        cells = np.stack([cell_x[order], cell_y[order]], axis=1)
+        unique, starts, counts = np.unique(cells, axis=0, return_index=True, return_counts=True)
+        self._cells = {(int(cx), int(cy)): (int(start), int(start + count))
+                       for (cx, cy), start, count in zip(unique, starts, counts)}
+        self._cell_min = tuple(int(v) for v in unique.min(axis=0)) if len(unique) else (0, 0)
+        self._cell_max = tuple(int(v) for v in unique.max(axis=0)) if len(unique) else (0, 0)
+
+    def _project(self, latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        scale = math.pi / 180 * EARTH_RADIUS_KM
+        x = longitudes * scale * math.cos(math.radians(self._reference_latitude))
+        y = latitudes * scale
+        return x, y
+
+    def locate(self, name: str) -> Optional[Place]:
+        """Find a place by name (case-insensitive, exact or substring)."""
+        name = name.lower()
+        place = self._by_name.get(name)
+        if place is None:
+            place = next((candidate for key, candidate in self._by_name.items() if name in key), None)
+        return place
+
+    def _cell_chunk(self, cell: Tuple[int, int]) -> Optional[np.ndarray]:
+        bounds = self._cells.get(cell)
+        return self._order[bounds[0]:bounds[1]] if bounds else None
+
+    def _square(self, cx: int, cy: int, ring: int) -> np.ndarray:
+        """Indexes of places in every cell within ring cells of (cx, cy)."""
+        chunks = [self._cell_chunk((cx + dx, cy + dy))
+                  for dx in range(-ring, ring + 1) for dy in range(-ring, ring + 1)]
+        return self._join(chunks)
+
+    def _ring(self, cx: int, cy: int, ring: int) -> np.ndarray:
+        """Indexes of places in the cells exactly ring cells away from (cx, cy)."""
+        if ring == 0:
+            return self._join([self._cell_chunk((cx, cy))])
+        chunks = []
+        for d in range(-ring, ring + 1):
+            chunks.append(self._cell_chunk((cx + d, cy - ring)))
+            chunks.append(self._cell_chunk((cx + d, cy + ring)))
+        for d in range(-ring + 1, ring):
+            chunks.append(self._cell_chunk((cx - ring, cy + d)))
+            chunks.append(self._cell_chunk((cx + ring, cy + d)))
+        return self._join(chunks)
+
+    @staticmethod
+    def _join(chunks: List[Optional[np.ndarray]]) -> np.ndarray:
+        chunks = [chunk for chunk in chunks if chunk is not None]
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_km)), int(math.floor(y / self.cell_km))
+
+    def _distances(self, x: float, y: float, indexes: np.ndarray) -> np.ndarray:
+        return np.hypot(self._x[indexes] - x, self._y[indexes] - y)
+
+    def within(self, latitude: float, longitude: float, radius_km: float,
+               kind: Optional[str] = None, limit: Optional[int] = None) -> List[NearbyPlace]:
+        """Places within radius_km of a point, nearest first."""
+        x, y = self._project(np.array([latitude]), np.array([longitude]))
+        x, y = float(x[0]), float(y[0])
+        ring = int(math.ceil(radius_km / self.cell_km))
+        if ring > MAX_SEARCH_RINGS:
+            indexes = np.arange(len(self.places))
+        else:
+            indexes = self._square(*self._cell_of(x, y), ring)
+        if kind is not None and len(indexes):
+            indexes = indexes[self.kinds[indexes] == kind]
+        distances = self._distances(x, y, indexes)
+        keep = distances <= radius_km
+        indexes, distances = indexes[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")[:limit]
+        return [NearbyPlace(self.places[i], round(float(d), 3)) for i, d in zip(indexes[order], distances[order])]
+
+    def nearest(self, latitude: float, longitude: float, k: int,
+                kind: Optional[str] = None, exclude: Optional[str] = None) -> List[NearbyPlace]:
+        """
+        The k places closest to a point.
+
+        Rings of cells are added around the query point until k candidates
+        are found and the next ring cannot contain anything closer.
+        """
+        x, y = self._project(np.array([latitude]), np.array([longitude]))
+        x, y = float(x[0]), float(y[0])
+        exclude = exclude.lower() if exclude else None
+
+        cx, cy = self._cell_of(x, y)
+        max_ring = max(abs(cx - self._cell_min[0]), abs(cx - self._cell_max[0]),
+                       abs(cy - self._cell_min[1]), abs(cy - self._cell_max[1])) if self._cells else 0
+        outside = max(self._cell_min[0] - cx, cx - self._cell_max[0],
+                      self._cell_min[1] - cy, cy - self._cell_max[1], 0)
+        if outside > MAX_SEARCH_RINGS:
+            # Query point far from the data: one vectorized pass is cheaper than walking rings
+            return self._nearest_scan(x, y, k, kind, exclude)
+
+        found_indexes = np.empty(0, dtype=np.int64)
+        found_distances = np.empty(0)
+        ring = 0
+        while ring <= max_ring:
+            indexes = self._ring(cx, cy, ring)
+            if kind is not None and len(indexes):
+                indexes = indexes[self.kinds[indexes] == kind]
+            if exclude is not None and len(indexes):
+                indexes = np.array([i for i in indexes if self.places[i].name.lower() != exclude], dtype=np.int64)
+            found_indexes = np.concatenate([found_indexes, indexes])
+            found_distances = np.concatenate([found_distances, self._distances(x, y, indexes)])
+
+            # Anything outside the searched square is at least ring * cell_km away
+            if len(found_indexes) >= k and np.partition(found_distances, k - 1)[k - 1] <= ring * self.cell_km:
+                break
+            ring += 1
+
+        order = np.argsort(found_distances, kind="stable")[:k]
+        return [NearbyPlace(self.places[i], round(float(found_distances[j]), 3))
+                for j, i in zip(order, found_indexes[order])]
+
+
+    def _nearest_scan(self, x: float, y: float, k: int, kind: Optional[str],
+                      exclude: Optional[str]) -> List[NearbyPlace]:
+        indexes = np.arange(len(self.places))
+        if kind is not None:
+            indexes = indexes[self.kinds == kind]
+        if exclude is not None:
+            indexes = np.array([i for i in indexes if self.places[i].name.lower() != exclude], dtype=np.int64)
+        distances = self._distances(x, y, indexes)
+        order = np.argsort(distances, kind="stable")[:k]
+        return [NearbyPlace(self.places[i], round(float(d), 3)) for i, d in zip(indexes[order], distances[order])]
+
+
+def places_from_context(context: Dict[str, Any]) -> List[Place]:
+    """Collect sights (overview.coordinates) and food venues (food.venues) with coordinates."""
+    places = []
+    for name, (latitude, longitude) in context.get("overview", {}).get("coordinates", {}).items():
+        places.append(Place(name, "sight", float(latitude), float(longitude), None, ()))
+    for venue in context.get("food", {}).get("venues", []):
+        places.append(Place(venue["name"], "food", float(venue["lat"]), float(venue["lon"]),
+                            venue.get("area"), tuple(venue.get("dishes", ()))))
+    return places
+
+
+def geo_index_for(context: Dict[str, Any]) -> GeoIndex:
+    """
+    Return the spatial index for a knowledge base, building it on first use.
+
+    Keyed on the identity of the coordinate and venue collections, which
+    ContextLoader reuses until the knowledge base changes, so the lookup
+    does not grow with the number of venues.
+    """
+    coordinates = context.get("overview", {}).get("coordinates", {})
+    venues = context.get("food", {}).get("venues", [])
+    key = (id(coordinates), id(venues))
+    cached = _INDEX_CACHE.get(key)
+    if cached is not None and cached[0] is coordinates and cached[1] is venues:
+        return cached[2]
+
+    index = GeoIndex(places_from_context(context))
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE[key] = (coordinates, venues, index)
+        while len(_INDEX_CACHE) > INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
+    return index
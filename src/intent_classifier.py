@@ -0,0 +1,329 @@
+"""
+Trainable intent classifier for the Udaipur Local Guide AI.
+
+A multinomial logistic regression over hashed word unigrams, word bigrams
+and character 3-5 grams. Hashing keeps the model a fixed-size weight array
+(categories x HASH_BUCKETS) with no vocabulary to store, and character
+n-grams let it generalise to paraphrases and misspellings that the keyword
+lists in QueryProcessor miss. Inference for a batch of queries is one
+gather and one segmented sum over the weight array.
+
+Train and evaluate offline from a tab-separated "query<TAB>category" file:
+
+    python -m src.intent_classifier train
+    python -m src.intent_classifier bench
+"""
+
+import argparse
+import io
+import os
+import re
+import time
+import zlib
+from functools import lru_cache
+from typing import IO, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.resources import INTENT_MODEL_NAME, INTENT_TRAINING_NAME, bundled_resource
+
+
+DEFAULT_TRAINING_PATH = ".kiro/intent_training.tsv"
+DEFAULT_MODEL_PATH = ".kiro/intent_model.npz"
+
+HASH_BUCKETS = 1 << 13
+CHAR_NGRAM_SIZES = (3, 4, 5)
+
+DEFAULT_EPOCHS = 300
+DEFAULT_LEARNING_RATE = 2.0
+DEFAULT_L2 = 1e-4
+
+# The bench command predicts every labeled query with a model trained on the other folds
+BENCH_FOLDS = 5
+# Classifier confidence thresholds the bench compares for QueryProcessor
+BENCH_THRESHOLDS = (0.0, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class Prediction(NamedTuple):
+    category: str
+    confidence: float
+
+
+@lru_cache(maxsize=50000)
+def _token_features(token: str) -> Tuple[int, ...]:
+    """Hashed word and character n-gram features of one token."""
+    padded = f"<{token}>"
+    grams = ["w:" + token]
+    for size in CHAR_NGRAM_SIZES:
+        grams.extend("c:" + padded[start:start + size] for start in range(len(padded) - size + 1))
+    return tuple(zlib.crc32(gram.encode("utf-8")) % HASH_BUCKETS for gram in grams)
+
+
+def hash_features(text: str) -> np.ndarray:
+    """Distinct hashed feature ids for a query (word 1-2 grams and character 3-5 grams)."""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    features = [feature for token in tokens for feature in _token_features(token)]
+    features.extend(zlib.crc32(f"b:{first} {second}".encode("utf-8")) % HASH_BUCKETS
+                    for first, second in zip(tokens, tokens[1:]))
+    return np.unique(np.array(features, dtype=np.int64))
+
+
+def _featurize(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten the features of a batch.
+
+    Returns:
+        (feature ids, row of each feature, value of each feature); each query's
+        features are L2-normalised so long and short queries score alike.
+    """
+    per_text = [hash_features(text) for text in texts]
+    counts = np.array([len(ids) for ids in per_text], dtype=np.int64)
+    ids = np.concatenate(per_text) if per_text else np.empty(0, dtype=np.int64)
+    rows = np.repeat(np.arange(len(texts)), counts)
+    values = (1.0 / np.sqrt(np.maximum(counts, 1)))[rows].astype(np.float32)
+    return ids, rows, values
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class IntentClassifier:
+    """Linear classifier over hashed n-gram features."""
+
+    def __init__(self, labels: Sequence[str], weights: np.ndarray, bias: np.ndarray):
+        if weights.shape != (HASH_BUCKETS, len(labels)) or bias.shape != (len(labels),):
+            raise ValueError(f"Weights have shape {weights.shape}, expected ({HASH_BUCKETS}, {len(labels)})")
+        self.labels = list(labels)
+        # Stored feature-major so a batch gathers contiguous rows
+        self.weights = weights.astype(np.float32, copy=False)
+        self.bias = bias.astype(np.float32, copy=False)
+
+    def _scores(self, ids: np.ndarray, rows: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+        scores = np.tile(self.bias, (size, 1))
+        if len(ids):
+            gathered = self.weights[ids] * values[:, None]
+            # rows are sorted, so each query's features form one segment
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            scores[rows[starts]] += np.add.reduceat(gathered, starts, axis=0)
+        return scores
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """Category probabilities, shape (len(texts), len(labels))."""
+        ids, rows, values = _featurize(texts)
+        return _softmax(self._scores(ids, rows, values, len(texts)))
+
+    def predict(self, texts: Sequence[str]) -> List[Prediction]:
+        """Most likely category and its probability for every query in a batch."""
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [Prediction(self.labels[index], float(probabilities[row, index]))
+                for row, index in enumerate(best)]
+
+    @classmethod
+    def train(cls, texts: Sequence[str], categories: Sequence[str], epochs: int = DEFAULT_EPOCHS,
+              learning_rate: float = DEFAULT_LEARNING_RATE, l2: float = DEFAULT_L2) -> "IntentClassifier":
+        """
+        Fit the weights by full-batch gradient descent on the cross-entropy loss.
+
+        Args:
+            texts: Training queries, normalised with QueryProcessor.normalize_query
+            categories: Category label of each query
+            epochs: Number of gradient steps
+            learning_rate: Step size
+            l2: Weight decay
+
+        Returns:
+            The trained classifier
+        """
+        if len(texts) != len(categories) or not texts:
+            raise ValueError("Training needs the same, non-zero number of texts and categories")
+        labels = sorted(set(categories))
+        targets = np.zeros((len(texts), len(labels)), dtype=np.float32)
+        targets[np.arange(len(texts)), [labels.index(category) for category in categories]] = 1.0
+
+        ids, rows, values = _featurize(texts)
+        model = cls(labels, np.zeros((HASH_BUCKETS, len(labels)), dtype=np.float32),
+                    np.zeros(len(labels), dtype=np.float32))
+        for _ in range(epochs):
+            error = (_softmax(model._scores(ids, rows, values, len(texts))) - targets) / len(texts)
+            gradient = l2 * model.weights
+            np.add.at(gradient, ids, error[rows] * values[:, None])
+            model.weights -= learning_rate * gradient
+            model.bias -= learning_rate * error.sum(axis=0)
+        return model
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> None:
+        """Write the model as a compressed float16 weight array."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, labels=np.array(self.labels), weights=self.weights.astype(np.float16),
+                            bias=self.bias.astype(np.float16))
+
+    @classmethod
+    def load(cls, path: Union[str, IO[bytes]] = DEFAULT_MODEL_PATH) -> "IntentClassifier":
+        with np.load(path) as data:
+            return cls([str(label) for label in data["labels"]], data["weights"].astype(np.float32),
+                       data["bias"].astype(np.float32))
+
+
+@lru_cache(maxsize=4)
+def _load_cached(path: str, mtime: float) -> IntentClassifier:
+    return IntentClassifier.load(path)
+
+
+@lru_cache(maxsize=1)
+def _bundled_classifier() -> Optional[IntentClassifier]:
+    data = bundled_resource(INTENT_MODEL_NAME)
+    if data is None:
+        return None
+    try:
+        return IntentClassifier.load(io.BytesIO(data))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def default_classifier(path: str = DEFAULT_MODEL_PATH) -> Optional[IntentClassifier]:
+    """
+    Return the trained model at path, loading it once per file version; None if unavailable.
+
+    A zipapp build falls back to its bundled model when the default model file is missing.
+    """
+    try:
+        return _load_cached(path, os.path.getmtime(path))
+    except (OSError, ValueError, KeyError):
+        return _bundled_classifier() if path == DEFAULT_MODEL_PATH else None
+
+
+def _parse_training_lines(lines: Iterable[str], path: str) -> Tuple[List[str], List[str]]:
+    texts, categories = [], []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if "\t" not in line:
+            raise ValueError(f"{path}:{number}: expected 'query<TAB>category'")
+        text, category = line.rsplit("\t", 1)
+        texts.append(text.strip())
+        categories.append(category.strip())
+    return texts, categories
+
+
+def load_training_file(path: str = DEFAULT_TRAINING_PATH) -> Tuple[List[str], List[str]]:
+    """
+    Read "query<TAB>category" lines, skipping blanks and # comments.
+
+    A zipapp build falls back to its bundled copy when the default file is missing.
+    """
+    if path == DEFAULT_TRAINING_PATH and not os.path.exists(path):
+        data = bundled_resource(INTENT_TRAINING_NAME)
+        if data is not None:
+            return _parse_training_lines(data.decode("utf-8").splitlines(), path)
+    with open(path, encoding="utf-8") as handle:
+        return _parse_training_lines(handle, path)
+
+
+def _normalize(texts: Sequence[str]) -> List[str]:
+    """Labeled queries normalised exactly as QueryProcessor normalises a query before classifying it."""
+    from src.query_processor import QueryProcessor
+    processor = QueryProcessor()
+    return [processor.normalize_query(text) for text in texts]
+
+
+def _accuracy(predicted: Sequence[str], expected: Sequence[str]) -> float:
+    return sum(p == e for p, e in zip(predicted, expected)) / max(len(expected), 1)
+
+
+def _time_per_query(function, texts: Sequence[str], repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function(texts)
+        best = min(best, time.perf_counter() - started)
+    return best / max(len(texts), 1)
+
+
+def cross_validated_predictions(texts: Sequence[str], categories: Sequence[str],
+                                folds: int = BENCH_FOLDS) -> List[Prediction]:
+    """Predict every query with a model trained on the folds it is not in."""
+    predictions: List[Optional[Prediction]] = [None] * len(texts)
+    for fold in range(folds):
+        train = [index for index in range(len(texts)) if index % folds != fold]
+        test = [index for index in range(len(texts)) if index % folds == fold]
+        model = IntentClassifier.train([texts[index] for index in train], [categories[index] for index in train])
+        for index, prediction in zip(test, model.predict([texts[index] for index in test])):
+            predictions[index] = prediction
+    return predictions  # type: ignore[return-value]
+
+
+def bench(path: str = DEFAULT_TRAINING_PATH) -> None:
+    """Compare the classifier, the keyword scorer and their combination with cross-validation."""
+    from src.query_processor import CLASSIFIER_MIN_CONFIDENCE, QueryProcessor
+
+    texts, categories = load_training_file(path)
+    texts = _normalize(texts)
+
+    started = time.perf_counter()
+    predictions = cross_validated_predictions(texts, categories)
+    train_seconds = (time.perf_counter() - started) / BENCH_FOLDS
+    model = IntentClassifier.train(texts, categories)
+
+    processor = QueryProcessor()
+    processor.classifier = None
+    keyword_lists = [processor._determine_categories(text) for text in texts]
+
+    def keyword_categories(batch: Sequence[str]) -> List[str]:
+        return [processor._determine_category(text) for text in batch]
+
+    def combined_accuracy(threshold: float) -> float:
+        combined = [processor._determine_categories(text, prediction, threshold)
+                    for text, prediction in zip(texts, predictions)]
+        return _accuracy([found[0] if found else "general" for found in combined], categories)
+
+    def classifier_categories(batch: Sequence[str]) -> List[str]:
+        return [prediction.category for prediction in model.predict(batch)]
+
+    def classifier_one_by_one(batch: Sequence[str]) -> None:
+        for text in batch:
+            model.predict([text])
+
+    print(f"Labeled queries: {len(texts)} ({BENCH_FOLDS}-fold cross-validation)")
+    print(f"Training time: {train_seconds * 1000:.1f} ms per fold")
+    print(f"Keyword scorer accuracy:  "
+          f"{_accuracy([found[0] if found else 'general' for found in keyword_lists], categories):.1%}")
+    print(f"Classifier accuracy:      {_accuracy([p.category for p in predictions], categories):.1%}")
+    print(f"Combined accuracy:        {combined_accuracy(CLASSIFIER_MIN_CONFIDENCE):.1%} "
+          f"(threshold {CLASSIFIER_MIN_CONFIDENCE})")
+    print("Combined by threshold:    " + ", ".join(
+        f"{threshold:.1f}: {combined_accuracy(threshold):.1%}" for threshold in BENCH_THRESHOLDS))
+    print(f"Keyword scorer:           {_time_per_query(keyword_categories, texts) * 1e6:.1f} us/query")
+    print(f"Classifier (batch):       {_time_per_query(classifier_categories, texts) * 1e6:.1f} us/query")
+    print(f"Classifier (one by one):  {_time_per_query(classifier_one_by_one, texts) * 1e6:.1f} us/query")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train or benchmark the intent classifier.")
+    parser.add_argument("command", choices=["train", "bench"])
+    parser.add_argument("--data", default=DEFAULT_TRAINING_PATH, help="labeled query<TAB>category file")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="where to write the trained weights")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        bench(args.data)
+        return
+
+    texts, categories = load_training_file(args.data)
+    started = time.perf_counter()
+    model = IntentClassifier.train(_normalize(texts), categories)
+    model.save(args.model)
+    print(f"Trained on {len(texts)} queries in {time.perf_counter() - started:.2f}s; "
+          f"wrote {args.model} ({os.path.getsize(args.model)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
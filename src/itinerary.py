@@ -0,0 +1,297 @@
+"""
+Crowd-aware day itinerary planner.
+
+Orders a set of attractions within a time window so that the total of
+travel time and expected crowding is as low as possible. Every set gets a
+greedy construction; small sets are also planned with dynamic programming
+over (visited set, last stop), and the cheaper of the two plans is kept,
+while larger sets improve the greedy order with 2-opt. The dynamic program
+keeps one partial route per state, but the crowd cost of a stop depends on
+the time it is reached, so a dearer prefix that arrives at a quieter hour
+can be dropped: it is a strong heuristic, not an exact solver. A plan that
+runs past the end of the window leaves out one stop at a time (the one
+whose removal leaves the cheapest schedule) until the rest fit. Every
+request runs under a hard compute budget, and the best plan found so far is
+returned when the budget runs out.
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.crowd_forecast import CrowdForecast
+
+
+# Average door-to-door speed (km/h) and fixed per-leg overhead (minutes, e.g. parking)
+TRANSPORT_MODES: Dict[str, Tuple[float, float]] = {
+    "walking": (4.5, 0.0),
+    "two_wheeler": (18.0, 3.0),
+    "auto_rickshaw": (15.0, 5.0),
+    "car": (12.0, 10.0),
+}
+DEFAULT_TRANSPORT_MODE = "two_wheeler"
+
+# Roads are longer than the straight line between two points
+ROAD_DISTANCE_FACTOR = 1.4
+
+DEFAULT_VISIT_MINUTES = 60
+
+# Minutes of travel a fully packed hour at an attraction is worth avoiding
+CROWD_PENALTY_MINUTES = 45.0
+# Cost per minute of running past the end of the requested window
+OVERRUN_PENALTY = 10.0
+# Crowd level assumed for attractions the forecast does not cover
+UNKNOWN_CROWD_LEVEL = 0.5
+
+DP_MAX_STOPS = 8
+DEFAULT_BUDGET_SECONDS = 0.05
+
+
+class ScheduledStop(NamedTuple):
+    location: str
+    arrive: int
+    depart: int
+    travel_minutes: float
+    crowd_level: float
+
+
+class Itinerary(NamedTuple):
+    stops: List[ScheduledStop]
+    cost: float
+    method: str
+    fits_window: bool
+    # Attractions left out so that the rest fit the window
+    skipped: Tuple[str, ...] = ()
+
+
+def haversine_km(a: Sequence[float], b: Sequence[float]) -> float:
+    """Great-circle distance in kilometres between two (lat, lon) points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+class ItineraryPlanner:
+    """Plans the visiting order and schedule for a set of attractions."""
+
+    def __init__(self, coordinates: Dict[str, Sequence[float]], visit_minutes: Dict[str, int],
+                 forecast: CrowdForecast):
+        self.coordinates = coordinates
+        self.visit_minutes = visit_minutes
+        self.forecast = forecast
+
+    def plan(self, attractions: Sequence[str], start_minute: int, end_minute: int, date: datetime,
+             transport_mode: str = DEFAULT_TRANSPORT_MODE, start_location: Optional[str] = None,
+             budget_seconds: float = DEFAULT_BUDGET_SECONDS) -> Itinerary:
+        """
+        Plan a day across attractions.
+
+        Args:
+            attractions: Places to visit (names with known coordinates)
+            start_minute: Earliest start, minutes after midnight
+            end_minute: Time the day should finish by, minutes after midnight
+            date: Day of the visit (selects weekday and month in the forecast)
+            transport_mode: One of TRANSPORT_MODES
+            start_location: Optional starting point (e.g. a hotel's area)
+            budget_seconds: Hard limit on search time
+
+        Returns:
+            The lowest-cost itinerary found within the budget, leaving out
+            stops that do not fit the window; a single stop is never left out
+        """
+        if transport_mode not in TRANSPORT_MODES:
+            raise ValueError(f"Unknown transport mode '{transport_mode}'")
+        names = [name for name in dict.fromkeys(attractions) if name in self.coordinates]
+        if not names:
+            return Itinerary([], 0.0, "empty", True)
+
+        deadline = time.perf_counter() + budget_seconds
+        travel = self._travel_matrix(names, transport_mode, start_location)
+        crowd = self._hourly_crowd(names, date)
+        durations = [self.visit_minutes.get(name, DEFAULT_VISIT_MINUTES) for name in names]
+
+        def evaluate(order: Sequence[int]) -> Tuple[float, List[ScheduledStop]]:
+            return self._evaluate(order, names, travel, crowd, durations, start_minute, end_minute)
+
+        order = self._greedy(len(names), evaluate, deadline)
+        method = "heuristic"
+        if len(names) <= DP_MAX_STOPS:
+            planned = self._dynamic_programming(len(names), travel, crowd, durations, start_minute, end_minute,
+                                                deadline)
+            if planned is not None and evaluate(planned)[0] <= evaluate(order)[0]:
+                order, method = planned, "dynamic_programming"
+        if method == "heuristic":
+            order = self._two_opt(order, evaluate, deadline)
+
+        cost, stops = evaluate(order)
+        fits = not stops or stops[-1].depart <= end_minute
+        if not fits and len(order) > 1:
+            # Leave out the stop whose removal leaves the cheapest schedule, and plan the rest afresh
+            keep = min((order[:index] + order[index + 1:] for index in range(len(order))),
+                       key=lambda candidate: evaluate(candidate)[0])
+            rest = self.plan([names[stop] for stop in keep], start_minute, end_minute, date, transport_mode,
+                             start_location, max(0.0, deadline - time.perf_counter()))
+            skipped = tuple(names[stop] for stop in order if stop not in keep)
+            return rest._replace(skipped=skipped + rest.skipped)
+        return Itinerary(stops, round(cost, 1), method, fits)
+
+    def _travel_matrix(self, names: List[str], mode: str, start_location: Optional[str]) -> np.ndarray:
+        """Travel minutes between stops; the last row is from the starting point."""
+        speed, overhead = TRANSPORT_MODES[mode]
+        points = [self.coordinates[name] for name in names]
+        origin = self.coordinates.get(start_location) if start_location else None
+
+        size = len(names)
+        travel = np.zeros((size + 1, size))
+        for i in range(size):
+            for j in range(size):
+                if i != j:
+                    travel[i, j] = haversine_km(points[i], points[j]) * ROAD_DISTANCE_FACTOR / speed * 60 + overhead
+            if origin is not None:
+                travel[size, i] = haversine_km(origin, points[i]) * ROAD_DISTANCE_FACTOR / speed * 60 + overhead
+        return travel
+
+    def _hourly_crowd(self, names: List[str], date: datetime) -> np.ndarray:
+        """Expected crowd level per stop and hour of the given day."""
+        crowd = np.full((len(names), 24), UNKNOWN_CROWD_LEVEL, dtype=np.float32)
+        for row, name in enumerate(names):
+            indexes = self.forecast.location_indexes([name])
+            if indexes:
+                crowd[row] = self.forecast.levels[indexes[0], :, date.weekday(), date.month - 1]
+        return crowd
+
+    @staticmethod
+    def _visit_cost(crowd_row: np.ndarray, arrive: float, duration: int) -> Tuple[float, float]:
+        """Crowd penalty and mean crowd level for a visit starting at arrive."""
+        first_hour = int(arrive // 60)
+        last_hour = int((arrive + duration - 1) // 60)
+        level = float(crowd_row[[hour % 24 for hour in range(first_hour, last_hour + 1)]].mean())
+        return CROWD_PENALTY_MINUTES * level * duration / 60, level
+
+    def _evaluate(self, order: Sequence[int], names: List[str], travel: np.ndarray, crowd: np.ndarray,
+                  durations: List[int], start_minute: int, end_minute: int) -> Tuple[float, List[ScheduledStop]]:
+        clock = float(start_minute)
+        cost = 0.0
+        stops = []
+        previous = len(names)
+        for stop in order:
+            leg = travel[previous, stop]
+            clock += leg
+            penalty, level = self._visit_cost(crowd[stop], clock, durations[stop])
+            cost += leg + penalty
+            stops.append(ScheduledStop(names[stop], int(round(clock)), int(round(clock + durations[stop])),
+                                       round(float(leg), 1), round(level, 2)))
+            clock += durations[stop]
+            previous = stop
+        cost += OVERRUN_PENALTY * max(0.0, clock - end_minute)
+        return cost, stops
+
+    def _greedy(self, size: int, evaluate, deadline: float) -> List[int]:
+        """Build an order by repeatedly appending the stop that adds the least cost."""
+        order: List[int] = []
+        remaining = set(range(size))
+        while remaining:
+            if time.perf_counter() > deadline:
+                # Out of budget: keep the remaining stops in their given order
+                return order + sorted(remaining)
+            best = min(remaining, key=lambda stop: evaluate(order + [stop])[0])
+            order.append(best)
+            remaining.remove(best)
+        return order
+
+    def _two_opt(self, order: List[int], evaluate, deadline: float) -> List[int]:
+        """Reverse segments while it lowers the cost and the budget allows."""
+        best_cost = evaluate(order)[0]
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                for j in range(i + 2, len(order) + 1):
+                    if time.perf_counter() > deadline:
+                        return order
+                    candidate = order[:i] + order[i:j][::-1] + order[j:]
+                    cost = evaluate(candidate)[0]
+                    if cost < best_cost - 1e-9:
+                        order, best_cost, improved = candidate, cost, True
+        return order
+
+    @staticmethod
+    def _visit_costs(crowd_sums: np.ndarray, stops: np.ndarray, arrive: np.ndarray,
+                     durations: np.ndarray) -> np.ndarray:
+        """
+        _visit_cost for many visits at once.
+
+        Args:
+            crowd_sums: Per stop, cumulative crowd level over the hours of a few days from midnight
+            stops: Stop of each visit
+            arrive: Arrival minute of each visit, broadcast against stops
+            durations: Visit minutes of each stop in stops
+        """
+        first_hour = arrive // 60
+        hours = (arrive + durations - 1) // 60 - first_hour + 1
+        start = (first_hour % 24).astype(int)
+        level = (crowd_sums[stops, start + hours.astype(int)] - crowd_sums[stops, start]) / hours
+        return CROWD_PENALTY_MINUTES * level * durations / 60
+
+    def _dynamic_programming(self, size: int, travel: np.ndarray, crowd: np.ndarray, durations: List[int],
+                             start_minute: int, end_minute: int, deadline: float) -> Optional[List[int]]:
+        """
+        Dynamic programming over (visited set, last stop).
+
+        Each state keeps its cheapest partial plan and the clock time at which
+        it ends; every move out of a visited set is costed in one array step.
+        Returns None if the budget runs out before all states are expanded,
+        in which case the caller keeps the greedy plan.
+        """
+        minutes = np.array(durations, dtype=float)
+        days = 2 + int(minutes.max()) // (24 * 60)
+        crowd_sums = np.zeros((size, 24 * days + 1))
+        crowd_sums[:, 1:] = np.cumsum(np.tile(crowd.astype(float), days), axis=1)
+
+        states = 1 << size
+        # Per (visited set, last stop): cost, clock and the previous stop (-1 for the first)
+        cost = np.full((states, size), np.inf)
+        clock = np.zeros((states, size))
+        previous = np.full((states, size), -1, dtype=int)
+        everyone = np.arange(size)
+        singles = 1 << everyone
+        arrive = start_minute + travel[size]
+        cost[singles, everyone] = travel[size] + self._visit_costs(crowd_sums, everyone, arrive, minutes)
+        clock[singles, everyone] = arrive + minutes
+
+        for mask in range(1, states - 1):
+            if time.perf_counter() > deadline:
+                return None
+            visited = (mask >> everyone) & 1 == 1
+            lasts = everyone[visited & np.isfinite(cost[mask])]
+            stops = everyone[~visited]
+            if not len(lasts):
+                continue
+            legs = travel[lasts][:, stops]
+            arrive = clock[mask, lasts][:, None] + legs
+            candidates = (cost[mask, lasts][:, None] + legs
+                          + self._visit_costs(crowd_sums, stops, arrive, minutes[stops]))
+            best_rows = candidates.argmin(axis=0)
+            best = candidates[best_rows, np.arange(len(stops))]
+            targets = mask | (1 << stops)
+            better = best < cost[targets, stops]
+            targets, chosen, rows = targets[better], stops[better], best_rows[better]
+            cost[targets, chosen] = best[better]
+            clock[targets, chosen] = arrive[rows, better.nonzero()[0]] + minutes[chosen]
+            previous[targets, chosen] = lasts[rows]
+
+        full = states - 1
+        finals = cost[full] + OVERRUN_PENALTY * np.maximum(0.0, clock[full] - end_minute)
+        last = int(finals.argmin())
+
+        order = []
+        mask = full
+        while last != -1:
+            order.append(last)
+            before = int(previous[mask, last])
+            mask &= ~(1 << last)
+            last = before
+        return order[::-1]
@@ -0,0 +1,201 @@
+"""
+Localized response templates for the Udaipur Local Guide AI.
+
+Every sentence the guide writes is a template in a per-language catalog,
+src/locales/<locale>.json, keyed by a short id ("food.area") with
+str.format placeholders ("For authentic food in {location}, ...").
+English is the source catalog; hi, fr and de translate it, and any key a
+translation leaves out falls back to the English text.
+
+A catalog is read and checked the first time its locale is asked for:
+every template must parse, its placeholders must be plain names (with an
+optional format spec), and a translation may only use the placeholders of
+its English template, so a bad catalog entry fails when it loads rather
+than when an answer is written. Constant texts are rendered once; the rest
+are filled in with str.format. The default locale's catalog is kept for the
+life of the process and is reached without touching the cache; other
+locales live in a small LRU cache, so memory stays bounded however many
+locales are shipped. Knowledge base content (place names, dish names,
+etiquette notes) is not translated.
+
+Check every shipped catalog against the English one with:
+
+    python -m src.localization check
+"""
+
+import argparse
+import json
+import pkgutil
+import re
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Dict, Optional, Set
+
+
+DEFAULT_LOCALE = "en"
+# Catalogs shipped in src/locales; a locale outside this list is answered in the default locale
+SUPPORTED_LOCALES = ("en", "hi", "fr", "de")
+# Compiled catalogs kept besides the default one
+LOCALE_CACHE_SIZE = 4
+
+LOCALES_DIRECTORY = "locales"
+
+# Placeholders are plain names with an optional simple format spec ("{radius:g}")
+FIELD_NAME_PATTERN = re.compile(r"[A-Za-z_]\w*\Z")
+FORMAT_SPEC_PATTERN = re.compile(r"[\w.,<>=^+\- #%]*\Z")
+
+
+def resolve_locale(locale: Optional[str]) -> str:
+    """
+    The supported locale for a requested one: "fr-FR" and "fr_CA" are
+    "fr", and unknown or missing locales are the default locale.
+    """
+    if not locale:
+        return DEFAULT_LOCALE
+    language = locale.strip().replace("_", "-").split("-")[0].lower()
+    return language if language in SUPPORTED_LOCALES else DEFAULT_LOCALE
+
+
+def _fields(template: str) -> Set[str]:
+    """
+    Names of the placeholders in a template.
+
+    Raises:
+        ValueError: If the template is malformed or a placeholder is more than a name and a format spec
+    """
+    fields = set()
+    for _, name, spec, conversion in Formatter().parse(template):
+        if name is None:
+            continue
+        if (not FIELD_NAME_PATTERN.match(name) or not FORMAT_SPEC_PATTERN.match(spec or "")
+                or conversion not in (None, "r", "s", "a")):
+            raise ValueError(f"unsupported placeholder {{{name}}}")
+        fields.add(name)
+    return fields
+
+
+class Catalog:
+    """The checked response templates of one locale."""
+
+    def __init__(self, locale: str, templates: Dict[str, str],
+                 fallback: Optional["Catalog"] = None):
+        """
+        Args:
+            locale: Locale code, e.g. "hi"
+            templates: Template id -> template text
+            fallback: Catalog whose templates are used for ids missing here,
+                and whose placeholders every template must stay within
+
+        Raises:
+            ValueError: If a template is malformed, has an id the fallback
+                does not, or uses a placeholder the fallback's template does not
+        """
+        self.locale = locale
+        self.templates: Dict[str, str] = dict(fallback.templates) if fallback is not None else {}
+        # Texts without placeholders, rendered once ("{{" becomes "{")
+        self._constants: Dict[str, str] = dict(fallback._constants) if fallback is not None else {}
+        for key, template in templates.items():
+            if not isinstance(template, str):
+                raise ValueError(f"{locale}: template {key!r} is not a string")
+            try:
+                fields = _fields(template)
+            except ValueError as e:
+                raise ValueError(f"{locale}: template {key!r} is malformed: {e}") from e
+            if fallback is not None:
+                if key not in fallback.templates:
+                    raise ValueError(f"{locale}: unknown template {key!r}")
+                unknown = fields - _fields(fallback.templates[key])
+                if unknown:
+                    raise ValueError(f"{locale}: template {key!r} uses unknown placeholders {sorted(unknown)}")
+            self.templates[key] = template
+            if fields:
+                self._constants.pop(key, None)
+            else:
+                self._constants[key] = template.format()
+        self.missing = sorted(set(self.templates) - set(templates))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.templates
+
+    def text(self, key: str, **values) -> str:
+        """The template for key with its placeholders filled from values; unused values are ignored."""
+        constant = self._constants.get(key)
+        return constant if constant is not None else self.templates[key].format(**values)
+
+
+def _read_templates(locale: str) -> Dict[str, str]:
+    data = pkgutil.get_data(__package__ or "src", f"{LOCALES_DIRECTORY}/{locale}.json")
+    if data is None:
+        raise FileNotFoundError(f"No response catalog for locale {locale!r}")
+    return json.loads(data.decode("utf-8"))
+
+
+_default_catalog: Optional[Catalog] = None
+_catalogs: "OrderedDict[str, Catalog]" = OrderedDict()
+_catalog_lock = threading.Lock()
+
+
+def default_catalog() -> Catalog:
+    """The default locale's catalog, loaded on first use and kept for the life of the process."""
+    global _default_catalog
+    if _default_catalog is None:
+        with _catalog_lock:
+            if _default_catalog is None:
+                _default_catalog = Catalog(DEFAULT_LOCALE, _read_templates(DEFAULT_LOCALE))
+    return _default_catalog
+
+
+def catalog_for(locale: Optional[str] = None) -> Catalog:
+    """
+    The catalog for a locale, loading and checking it on first use.
+
+    Args:
+        locale: Requested locale; see resolve_locale
+
+    Returns:
+        The locale's catalog, or the default catalog for the default or an unsupported locale
+    """
+    if locale is None or locale == DEFAULT_LOCALE:
+        return default_catalog()
+    locale = resolve_locale(locale)
+    if locale == DEFAULT_LOCALE:
+        return default_catalog()
+    with _catalog_lock:
+        catalog = _catalogs.get(locale)
+        if catalog is not None:
+            _catalogs.move_to_end(locale)
+            return catalog
+    fallback = default_catalog()
+    catalog = Catalog(locale, _read_templates(locale), fallback)
+    with _catalog_lock:
+        _catalogs[locale] = catalog
+        _catalogs.move_to_end(locale)
+        while len(_catalogs) > LOCALE_CACHE_SIZE:
+            _catalogs.popitem(last=False)
+    return catalog
+
+
+def loaded_locales() -> Dict[str, int]:
+    """Locales whose catalogs are loaded right now, with their template counts."""
+    with _catalog_lock:
+        loaded = {locale: len(catalog.templates) for locale, catalog in _catalogs.items()}
+    if _default_catalog is not None:
+        loaded[DEFAULT_LOCALE] = len(_default_catalog.templates)
+    return loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the shipped response catalogs against the English one.")
+    parser.add_argument("command", choices=["check"])
+    parser.parse_args()
+
+    for locale in SUPPORTED_LOCALES:
+        catalog = catalog_for(locale)
+        note = f", {len(catalog.missing)} falling back to {DEFAULT_LOCALE}: {', '.join(catalog.missing)}" \
+            if catalog.missing else ""
+        print(f"{locale}: {len(catalog.templates)} templates{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Opening hours for attractions and food venues.
+
+Weekly schedules ("daily 09:30-17:30", "Mon-Sat 10:00-21:00; Sun 12:00-18:00")
+are compiled into an interval index over the minutes of the week: the week
+is cut at every opening and closing time, and each resulting segment stores
+a packed bitset of the places open throughout it. "What is open at t?" is
+then a binary search for t's segment plus one bitset unpack, covering every
+place at once. Holiday exceptions (closed, or special hours on a date)
+override the weekly schedule for the places they name on that date; their
+hours may run past midnight into the next morning, like weekly ones.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.geo_index import geo_index_for
+
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+INDEX_CACHE_SIZE = 8
+
+_RANGE = r"(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})"
+RANGE_PATTERN = re.compile(_RANGE)
+CLAUSE_PATTERN = re.compile(r"^(?P<days>[a-z,\s-]+?)\s+(?P<ranges>closed|\d.*)$")
+EXCEPTION_PATTERN = re.compile(r"^(?P<name>.+?)\s+(?P<hours>closed|\d{1,2}:\d{2}\s*-.*)$", re.IGNORECASE)
+
+Interval = Tuple[int, int]
+
+logger = logging.getLogger(__name__)
+
+
+class PlaceHours(NamedTuple):
+    name: str
+    is_open: bool
+    # Minute of the week the place next closes (if open) or opens (if closed); None if never
+    next_change: Optional[int]
+    special: bool
+
+
+def _parse_ranges(text: str) -> List[Interval]:
+    """Parse "09:00-13:00, 17:00-22:00" into (start, end) minutes of the day; end may pass midnight."""
+    intervals = []
+    for match in RANGE_PATTERN.finditer(text):
+        start_hour, start_minute, end_hour, end_minute = (int(group) for group in match.groups())
+        if start_hour > 24 or end_hour > 24 or start_minute > 59 or end_minute > 59:
+            raise ValueError(f"Invalid time range '{match.group(0)}'")
+        start = start_hour * 60 + start_minute
+        end = end_hour * 60 + end_minute
+        if end <= start:
+            end += MINUTES_PER_DAY
+        intervals.append((start, end))
+    if not intervals:
+        raise ValueError(f"No time ranges in '{text}'")
+    return intervals
+
+
+def _parse_days(text: str) -> List[int]:
+    text = text.strip()
+    if text in ("daily", "every day", "all days"):
+        return list(range(7))
+    days: List[int] = []
+    for part in text.split(","):
+        bounds = [bound.strip()[:3] for bound in part.split("-")]
+        if not all(bound in DAY_NAMES for bound in bounds) or len(bounds) > 2:
+            raise ValueError(f"Unrecognised days '{part.strip()}'")
+        first, last = DAY_NAMES.index(bounds[0]), DAY_NAMES.index(bounds[-1])
+        days.extend((first + offset) % 7 for offset in range((last - first) % 7 + 1))
+    return days
+
+
+def parse_schedule(schedule: Union[str, Sequence[str]]) -> List[Interval]:
+    """
+    Parse a weekly schedule into (start, end) minutes of the week.
+
+    Clauses are separated by ";" and each is "<days> <ranges>", "<days> closed"
+    or "24 hours"; days are "daily", a day ("Mon") or ranges and lists of days
+    ("Mon-Fri", "Sat, Sun"). Ranges that end after midnight run into the next
+    day, and Sunday night wraps into Monday.
+
+    Raises:
+        ValueError: If the schedule cannot be parsed
+    """
+    if not isinstance(schedule, str):
+        schedule = ", ".join(schedule)
+    intervals: List[Interval] = []
+    for clause in schedule.lower().split(";"):
+        clause = clause.strip()
+        if not clause:
+            continue
+        if clause in ("24 hours", "24h", "open 24 hours", "always open"):
+            return [(0, MINUTES_PER_WEEK)]
+        match = CLAUSE_PATTERN.match(clause)
+        if not match:
+            raise ValueError(f"Unrecognised opening hours '{clause}'")
+        if match.group("ranges") == "closed":
+            continue
+        for day in _parse_days(match.group("days")):
+            for start, end in _parse_ranges(match.group("ranges")):
+                start, end = day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end
+                if end > MINUTES_PER_WEEK:
+                    intervals.append((start, MINUTES_PER_WEEK))
+                    intervals.append((0, end - MINUTES_PER_WEEK))
+                else:
+                    intervals.append((start, end))
+    return sorted(intervals)
+
+
+def parse_exceptions(exceptions: Dict[str, str]) -> Dict[date, Dict[str, List[Interval]]]:
+    """
+    Parse holiday exceptions: {"2026-11-08": "City Palace closed; Jagdish Temple 04:30-23:00"}.
+
+    A malformed date or clause is logged and skipped; the rest still apply.
+
+    Returns:
+        Date -> place name (lower case) -> that day's opening ranges (empty if closed)
+    """
+    parsed: Dict[date, Dict[str, List[Interval]]] = {}
+    for day, text in exceptions.items():
+        try:
+            when = date.fromisoformat(str(day).strip())
+        except ValueError:
+            logger.warning("Skipping holiday exceptions for unrecognised date '%s'", day)
+            continue
+        for clause in str(text).split(";"):
+            match = EXCEPTION_PATTERN.match(clause.strip())
+            try:
+                if not match:
+                    raise ValueError(f"Unrecognised holiday exception '{clause.strip()}'")
+                hours = match.group("hours").lower()
+                intervals = [] if hours == "closed" else _parse_ranges(hours)
+            except ValueError as error:
+                logger.warning("Skipping holiday exception on %s: %s", when.isoformat(), error)
+                continue
+            parsed.setdefault(when, {})[match.group("name").strip().lower()] = intervals
+    return parsed
+
+
+def week_minute(when: datetime) -> int:
+    return when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+
+
+class OpeningHoursIndex:
+    """Stabbing-query index over the weekly opening intervals of many places."""
+
+    def __init__(self, names: Sequence[str], schedules: Sequence[Optional[List[Interval]]],
+                 exceptions: Optional[Dict[date, Dict[str, List[Interval]]]] = None):
+        self.names = list(names)
+        self.positions = {name.lower(): index for index, name in enumerate(self.names)}
+        # Places without (parseable) hours are never reported open
+        self.known = np.array([schedule is not None for schedule in schedules], dtype=bool)
+        self._intervals = [schedule or [] for schedule in schedules]
+
+        points = {0, MINUTES_PER_WEEK}
+        for intervals in self._intervals:
+            for start, end in intervals:
+                points.update((start, end))
+        self._boundaries = np.array(sorted(points), dtype=np.int64)
+
+        open_segments = np.zeros((len(self._boundaries) - 1, len(self.names)), dtype=bool)
+        for place, intervals in enumerate(self._intervals):
+            for start, end in intervals:
+                first, last = np.searchsorted(self._boundaries, [start, end])
+                open_segments[first:last, place] = True
+        self._segments = np.packbits(open_segments, axis=1)
+
+        self._exceptions: Dict[date, List[Tuple[int, List[Interval]]]] = {}
+        for day, overrides in (exceptions or {}).items():
+            self._exceptions[day] = [(self.positions[name], intervals) for name, intervals in overrides.items()
+                                     if name in self.positions]
+
+    @classmethod
+    def from_hours(cls, names: Sequence[str], hours: Sequence[Any],
+                   exceptions: Optional[Dict[str, str]] = None) -> "OpeningHoursIndex":
+        """Build from raw schedule text per place; unparseable schedules count as unknown."""
+        schedules: List[Optional[List[Interval]]] = []
+        for text in hours:
+            try:
+                schedules.append(parse_schedule(text) if text else None)
+            except ValueError:
+                schedules.append(None)
+        return cls(names, schedules, parse_exceptions(exceptions or {}))
+
+    def open_mask(self, when: datetime) -> np.ndarray:
+        """Boolean array, one entry per place, of which places are open at when."""
+        segment = int(np.searchsorted(self._boundaries, week_minute(when), side="right")) - 1
+        mask = np.unpackbits(self._segments[segment], count=len(self.names)).astype(bool)
+        minute = when.hour * 60 + when.minute
+        for place, intervals in self._exceptions.get(when.date(), ()):
+            mask[place] = any(start <= minute < end for start, end in intervals)
+        # The day before's special hours may run past midnight into this morning
+        for place, intervals in self._exceptions.get(when.date() - timedelta(days=1), ()):
+            if any(start <= minute + MINUTES_PER_DAY < end for start, end in intervals):
+                mask[place] = True
+        return mask
+
+    def open_places(self, when: datetime) -> List[str]:
+        return [name for name, is_open in zip(self.names, self.open_mask(when)) if is_open]
+
+    def status(self, name: str, when: datetime) -> Optional[PlaceHours]:
+        """Whether a place is open at when, and when that next changes; None if its hours are unknown."""
+        position = self.positions.get(name.lower())
+        if position is None or not self.known[position]:
+            return None
+        is_open = bool(self.open_mask(when)[position])
+        minute = when.hour * 60 + when.minute
+        yesterday = self._exceptions.get(when.date() - timedelta(days=1), ())
+        special = (any(place == position for place, _ in self._exceptions.get(when.date(), ()))
+                   or any(place == position and start <= minute + MINUTES_PER_DAY < end
+                          for place, intervals in yesterday for start, end in intervals))
+        if special:
+            return PlaceHours(self.names[position], is_open, None, True)
+        return PlaceHours(self.names[position], is_open, self._next_change(position, week_minute(when), is_open),
+                          False)
+
+    def _next_change(self, position: int, now: int, is_open: bool) -> Optional[int]:
+        # Two weeks of merged openings, so closing after midnight on Sunday is found too
+        merged: List[List[int]] = []
+        for start, end in sorted(self._intervals[position] + [(start + MINUTES_PER_WEEK, end + MINUTES_PER_WEEK)
+                                                             for start, end in self._intervals[position]]):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            if end - start >= MINUTES_PER_WEEK:
+                return None
+            if is_open and start <= now < end:
+                return end % MINUTES_PER_WEEK
+            if not is_open and start > now:
+                return start % MINUTES_PER_WEEK
+        return None
+
+
+# (id(places), id(opening_hours), id(exceptions)) -> (collections, index)
+_INDEX_CACHE: "OrderedDict[Tuple[int, int, int], Tuple[Tuple[Any, Any, Any], OpeningHoursIndex]]" = OrderedDict()
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def opening_hours_for(context: Dict[str, Any]) -> OpeningHoursIndex:
+    """
+    Return the opening-hours index for a knowledge base's places, building it on first use.
+
+    Places are those of the knowledge base's geo index, in the same order, so
+    open masks line up with geo index positions. Sights take their hours from
+    overview.opening_hours and venues from their own hours column.
+    """
+    places = geo_index_for(context).places
+    opening_hours = context.get("overview", {}).get("opening_hours", {})
+    exceptions = context.get("tourism", {}).get("holiday_exceptions", {})
+    collections = (places, opening_hours, exceptions)
+    key = (id(places), id(opening_hours), id(exceptions))
+    cached = _INDEX_CACHE.get(key)
+    if cached is not None and all(a is b for a, b in zip(cached[0], collections)):
+        return cached[1]
+
+    venue_hours = {venue["name"]: venue.get("hours") for venue in context.get("food", {}).get("venues", [])}
+    hours = [opening_hours.get(place.name) if place.kind == "sight" else venue_hours.get(place.name)
+             for place in places]
+    index = OpeningHoursIndex.from_hours([place.name for place in places], hours, exceptions)
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE[key] = (collections, index)
+        while len(_INDEX_CACHE) > INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
+    return index
@@ -0,0 +1,184 @@
+"""
+Structured query-event log for the Udaipur Local Guide AI.
+
+Records which questions are asked, how they were classified, which branch
+produced the answer, how long it took and which knowledge base version was
+used. Events go onto a bounded in-memory queue and are written as compact
+JSONL by a background thread; when the queue is full the event is dropped
+and counted, so logging never blocks a request. A batch that cannot be
+written (a failed rotation, a full disk) is dropped and counted the same
+way, and the file is reopened for the next batch, so the writer thread
+outlives any write error and flush() always returns. Events still queued
+when the process exits are written first, waiting at most
+EXIT_FLUSH_TIMEOUT seconds.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, TextIO
+
+from src.query_processor import QueryIntent
+
+
+DEFAULT_LOG_PATH = ".data/logs/query_events.jsonl"
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_ROTATE_INTERVAL = 24 * 3600
+DEFAULT_BACKUP_COUNT = 7
+WRITER_BATCH_SIZE = 256
+# Longest the interpreter waits at exit for queued events to be written
+EXIT_FLUSH_TIMEOUT = 2.0
+
+
+class QueryLog:
+    """Non-blocking JSONL query-event log with size and time based rotation."""
+
+    def __init__(self, path: str = DEFAULT_LOG_PATH, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 max_bytes: int = DEFAULT_MAX_BYTES, rotate_interval: float = DEFAULT_ROTATE_INTERVAL,
+                 backup_count: int = DEFAULT_BACKUP_COUNT):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+
+        self.written = 0
+        self.dropped = 0
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=queue_size)
+        self._counter_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+    def record(self, query: str, intent: Optional[QueryIntent], branch: str,
+               latency_seconds: float, kb_version: Optional[str]) -> bool:
+        """
+        Queue one query event without blocking.
+
+        Returns:
+            True if the event was queued, False if it was dropped because the queue is full
+        """
+        event = {
+            "ts": round(time.time(), 3),
+            "query": query,
+            "category": intent.category if intent else None,
+            "categories": intent.categories if intent else [],
+            "location": intent.location if intent else None,
+            "time_context": intent.time_context if intent else None,
+            "branch": branch,
+            "latency_ms": round(latency_seconds * 1000, 3),
+            "kb_version": kb_version,
+        }
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped += 1
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of queued, written and dropped events."""
+        return {"queued": self._queue.qsize(), "written": self.written, "dropped": self.dropped}
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued event has been written.
+
+        Args:
+            timeout: Longest to wait in seconds; None waits for as long as it takes
+
+        Returns:
+            True if the queue drained, False if the timeout passed first
+        """
+        if self._writer is None:
+            return True
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._start_lock:
+            if self._writer is None:
+                writer = threading.Thread(target=self._write_loop, name="query-log-writer", daemon=True)
+                writer.start()
+                self._writer = writer
+                # The writer is a daemon thread, so nothing waits for it at exit otherwise
+                atexit.register(self.flush, EXIT_FLUSH_TIMEOUT)
+
+    def _open(self) -> TextIO:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _write_loop(self) -> None:
+        handle: Optional[TextIO] = None
+        opened_at = 0.0
+        size = 0
+
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITER_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                if handle is not None and (size >= self.max_bytes
+                                           or time.time() - opened_at >= self.rotate_interval):
+                    handle.close()
+                    handle = None
+                    self._rotate()
+                if handle is None:
+                    handle = self._open()
+                    opened_at = time.time()
+                    size = handle.tell()
+
+                lines = "".join(
+                    json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n" for event in batch
+                )
+                handle.write(lines)
+                handle.flush()
+                size += len(lines.encode("utf-8"))
+                self.written += len(batch)
+            except Exception:
+                with self._counter_lock:
+                    self.dropped += len(batch)
+                if handle is not None:
+                    try:
+                        handle.close()
+                    except Exception:
+                        pass
+                    handle = None
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _rotate(self) -> None:
+        """Move the current file aside with a timestamp suffix and prune old backups."""
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            base, extension = os.path.splitext(self.path)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            os.replace(self.path, f"{base}-{stamp}{extension}")
+
+        directory = os.path.dirname(self.path) or "."
+        base_name, extension = os.path.splitext(os.path.basename(self.path))
+        backups = sorted(
+            name for name in os.listdir(directory)
+            if name.startswith(base_name + "-") and name.endswith(extension)
+        )
+        for name in backups[:-self.backup_count] if self.backup_count else backups:
+            os.remove(os.path.join(directory, name))
+
+
+# Shared by every caller of local_guide in this process
+DEFAULT_QUERY_LOG = QueryLog()
@@ -0,0 +1,356 @@
+"""
+Query processor for the Udaipur Local Guide AI.
+
+Analyzes a user's question and extracts its intent: the topic category,
+keywords, and any location or time-of-day context. The category comes from
+the trained intent classifier when it is confident and from the keyword lists
+otherwise; a query matching neither is "general"
+(see `python -m src.intent_classifier bench`). Misspelled words are corrected against the query
+vocabulary and the knowledge base's area and location names before classification (see src/spelling.py).
+
+Queries are tokenized once into lemmatized vocabulary ids (see
+src/tokenizer.py); category keywords, locations and time words are
+compiled to ids when the processor is created, so matching compares
+integers rather than searching the text for each keyword.
+
+Location and dish aliases ("the lake" -> Lake Pichola, "monsoon palace" ->
+Sajjangarh, "dal bati" -> Dal Baati Churma) are maintained in the knowledge
+base ("Location Aliases" and "Dish Aliases") and compiled into the same
+phrase table as the canonical names, so one scan over the token ids finds
+every location and dish, however it was named. A one-word alias that is
+also a category keyword ("palace") names a kind of place rather than one
+place, and is not compiled.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Mapping, NamedTuple, Optional, List, Sequence, Tuple, Union
+
+from src.context_loader import ContextLoader
+from src.intent_classifier import IntentClassifier, Prediction, default_classifier
+from src.localization import DEFAULT_LOCALE
+from src.spelling import SpellCorrector, spell_corrector_for
+from src.tokenizer import TIME, Token, Tokenizer, Vocabulary
+from src.transliteration import DEFAULT_TRANSLITERATOR, TOKEN_PUNCTUATION
+
+
+@dataclass
+class QueryIntent:
+    category: str
+    keywords: List[str]
+    location: Optional[str] = None
+    time_context: Optional[str] = None
+    categories: List[str] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    # Dishes named in the query, by their knowledge-base names
+    dishes: List[str] = field(default_factory=list)
+    # Lemmas of the non-stop-word tokens and their vocabulary ids
+    tokens: List[str] = field(default_factory=list)
+    token_ids: List[int] = field(default_factory=list)
+    # Clock times mentioned, in minutes after midnight
+    times: List[int] = field(default_factory=list)
+    # Misspelled word -> the word it was corrected to
+    corrections: Dict[str, str] = field(default_factory=dict)
+    # Language the answer is written in (see src/localization.py)
+    locale: str = DEFAULT_LOCALE
+
+
+# A secondary category is reported when it scores at least this many keyword
+# hits and at least this fraction of the winning category's score.
+MIN_CATEGORY_SCORE = 1
+SECONDARY_CATEGORY_RATIO = 0.5
+
+# The classifier's category wins over the keyword lists at or above this
+# probability, and is ignored below it. On the cross-validated bench lower
+# thresholds score higher (71.1% at 0.3, 64.9% here, 60.1% for the keywords
+# alone), because every labeled query has a topic; but topic-less follow-ups
+# such as "What about the evening?" (0.31) or "How about tomorrow?" (0.47)
+# must stay "general" so that they inherit the previous turn's topic.
+CLASSIFIER_MIN_CONFIDENCE = 0.5
+
+# Kinds of phrase in the compiled phrase table
+LOCATION = "location"
+DISH = "dish"
+
+
+class CompiledMatcher(NamedTuple):
+    vocabulary: Vocabulary
+    tokenizer: Tokenizer
+    # Keyword id -> categories it counts towards
+    category_ids: Dict[int, List[str]]
+    # First word id -> (word ids, kind, canonical name) of every location and dish phrase, longest first
+    phrase_ids: Dict[int, List[Tuple[Tuple[int, ...], str, str]]]
+    # Time word id -> priority (lower wins)
+    time_ids: Dict[int, int]
+    # Words the spelling corrector prefers: the vocabulary and the known Hinglish spellings
+    spelling_words: Tuple[str, ...]
+
+
+@lru_cache(maxsize=8)
+def compile_matcher(category_keywords: Tuple[Tuple[str, Tuple[str, ...]], ...], locations: Tuple[str, ...],
+                    time_keywords: Tuple[str, ...], location_aliases: Tuple[Tuple[str, str], ...] = (),
+                    dishes: Tuple[Tuple[str, str], ...] = ()) -> CompiledMatcher:
+    """
+    Build the vocabulary and the id lookups every matcher uses; shared by processors with the same tables.
+
+    Args:
+        category_keywords: (category, keywords) pairs
+        locations: Lowercase location names
+        time_keywords: Time words, highest priority first
+        location_aliases: (alias, location) pairs
+        dishes: (phrase, dish) pairs, including each dish's own name
+    """
+    # Phrases are normalized like queries are, so "daal bati" and "dal baati" compile to the same ids
+    normalize = DEFAULT_TRANSLITERATOR.normalize_query
+    phrases = [(location, LOCATION, location.title()) for location in locations]
+    keywords = {keyword for _, words in category_keywords for keyword in words}
+    for alias, location in location_aliases:
+        phrase = normalize(alias.lower())
+        # "which palace is best at sunset?" asks about palaces in general, not City Palace
+        if phrase not in keywords:
+            phrases.append((phrase, LOCATION, location))
+    phrases += [(normalize(phrase.lower()), DISH, dish) for phrase, dish in dishes]
+
+    terms = [keyword for _, keywords in category_keywords for keyword in keywords]
+    terms += [word for phrase, _, _ in phrases for word in phrase.split()] + list(time_keywords)
+    vocabulary = Vocabulary(terms)
+    # Alias words are vocabulary terms, so stop words inside them are kept: "the lake" is Lake Pichola while a
+    # bare "lake" (a keyword) names no place. "the" is then a token of every query, but it has no category,
+    # time or phrase of its own, so it changes nothing else
+    tokenizer = Tokenizer(vocabulary)
+
+    category_ids: Dict[int, List[str]] = {}
+    for category, keywords in category_keywords:
+        for keyword in keywords:
+            category_ids.setdefault(vocabulary.id(keyword), []).append(category)
+    phrase_ids: Dict[int, List[Tuple[Tuple[int, ...], str, str]]] = {}
+    for phrase, kind, name in phrases:
+        ids = tuple(token.id for token in tokenizer.tokenize(phrase))
+        if ids and (ids, kind, name) not in phrase_ids.get(ids[0], ()):
+            phrase_ids.setdefault(ids[0], []).append((ids, kind, name))
+    for entries in phrase_ids.values():
+        entries.sort(key=lambda entry: -len(entry[0]))
+    time_ids = {vocabulary.id(keyword): rank for rank, keyword in enumerate(time_keywords)}
+    spelling_words = tuple(vocabulary.terms[1:]) + tuple(
+        spelling for spelling in DEFAULT_TRANSLITERATOR.exact_index if spelling.isascii() and spelling.isalpha())
+    return CompiledMatcher(vocabulary, tokenizer, category_ids, phrase_ids, time_ids, spelling_words)
+
+
+class QueryProcessor:
+    """Extracts category, keywords, location and time context from queries."""
+
+    def __init__(self, classifier: Optional[IntentClassifier] = None, context: Optional[Mapping[str, Any]] = None,
+                 kb_version: Optional[str] = None):
+        self.category_keywords = {
+            "language": ["khamma", "ghani", "greeting", "phrase", "hindi", "mewari", "language", "speak", "say"],
+            "food": ["food", "eat", "dish", "restaurant", "dal", "baati", "churma", "kachori", "mirchi", "vada"],
+            "tourism": ["visit", "tourist", "crowd", "timing", "palace", "lake", "transport", "traffic", "season", "itinerary",
+                        "open", "closed"],
+            "culture": ["culture", "etiquette", "temple", "custom", "tradition", "respect", "dress", "behavior"]
+        }
+
+        self.locations = ["surajpole", "hathipole", "city palace", "lake pichola", "fateh sagar", "sajjangarh", "chetak circle",
+                          "jagdish temple"]
+
+        self.time_keywords = ["morning", "evening", "afternoon", "night", "peak", "busy", "crowd"]
+
+        # Aliases and dishes come from the given knowledge base (by default the current one)
+        if context is None:
+            snapshot = ContextLoader().snapshot()
+            context, kb_version = snapshot.context, snapshot.kb_version
+        overview, food = context.get("overview", {}), context.get("food", {})
+        self.location_aliases: Dict[str, str] = dict(overview.get("location_aliases", {}))
+        self.dishes: List[str] = list(food.get("dishes", []))
+        self.dish_aliases: Dict[str, str] = dict(food.get("dish_aliases", {}))
+
+        self.transliterator = DEFAULT_TRANSLITERATOR
+        self._compile()
+
+        # None when no trained model is available; the keyword lists are used alone
+        self.classifier = classifier if classifier is not None else default_classifier()
+
+        # Corrects towards the query vocabulary and the knowledge base's place names; shared per kb_version
+        self.spelling: SpellCorrector = spell_corrector_for(context, self.matcher.spelling_words, kb_version)
+
+    def _compile(self) -> None:
+        """Compile the keyword, location, alias, dish and time tables; call again after changing them."""
+        self.matcher = compile_matcher(
+            tuple((category, tuple(keywords)) for category, keywords in self.category_keywords.items()),
+            tuple(self.locations),
+            tuple(self.time_keywords),
+            tuple(sorted(self.location_aliases.items())),
+            tuple((dish, dish) for dish in self.dishes) + tuple(sorted(self.dish_aliases.items()))
+        )
+        self.vocabulary = self.matcher.vocabulary
+        self.tokenizer = self.matcher.tokenizer
+
+    def tokenize(self, query: str) -> List[Token]:
+        """Tokens of a lowercased, transliterated query."""
+        return self.tokenizer.tokenize(query)
+
+    def _ids(self, query: Union[str, Sequence[int]]) -> Sequence[int]:
+        return [token.id for token in self.tokenize(query)] if isinstance(query, str) else query
+
+    def process_query(self, query: str) -> QueryIntent:
+        """Process user query and return intent."""
+        return self.process_queries([query])[0]
+
+    def normalize_query(self, query: str) -> str:
+        """
+        A query as the classifier sees it: lowercased, spelling-corrected and
+        transliterated. The classifier is trained on labeled queries
+        normalized the same way.
+        """
+        return self.transliterator.normalize_query(self.correct_spelling(query.lower())[0])
+
+    def process_queries(self, queries: List[str]) -> List[QueryIntent]:
+        """Process a batch of queries, classifying them all in one pass."""
+        corrected = [self.correct_spelling(query.lower()) for query in queries]
+        normalized = [self.transliterator.normalize_query(query) for query, _ in corrected]
+        if self.classifier is not None and normalized:
+            predictions: List[Optional[Prediction]] = list(self.classifier.predict(normalized))
+        else:
+            predictions = [None] * len(normalized)
+        return [self._build_intent(query, prediction, corrections)
+                for query, prediction, (_, corrections) in zip(normalized, predictions, corrected)]
+
+    def correct_spelling(self, query_lower: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Replace misspelled words of a lowercased query with their dictionary words.
+
+        Words that are known spellings, or whose lemma is a vocabulary term
+        ("palaces"), are kept as typed, as is surrounding punctuation.
+
+        Returns:
+            The corrected query and the corrections made
+        """
+        corrections: Dict[str, str] = {}
+        words = query_lower.split()
+        for index, word in enumerate(words):
+            core = word.strip(TOKEN_PUNCTUATION)
+            if (not core or self.transliterator.resolve_token(core) is not None
+                    or self.tokenizer.lemma(core) in self.vocabulary):
+                continue
+            correction = self.spelling.correct(core)
+            if correction is not None:
+                corrections[core] = correction
+                words[index] = word.replace(core, correction, 1)
+        return (" ".join(words), corrections) if corrections else (query_lower, corrections)
+
+    def _build_intent(self, query_lower: str, prediction: Optional[Prediction],
+                      corrections: Optional[Dict[str, str]] = None) -> QueryIntent:
+        # The words as typed; the response patterns (times, dates, coordinates) read these
+        keywords = query_lower.split()
+        tokens = self.tokenize(query_lower)
+        token_ids = [token.id for token in tokens]
+
+        categories = self._determine_categories(token_ids, prediction)
+        category = categories[0] if categories else "general"
+        locations, dishes = self._extract_phrases(token_ids)
+        location = locations[0] if locations else None
+        time_context = self._extract_time_context(token_ids)
+
+        return QueryIntent(
+            category=category,
+            keywords=keywords,
+            location=location,
+            time_context=time_context,
+            categories=categories,
+            locations=locations,
+            dishes=dishes,
+            tokens=[token.lemma for token in tokens],
+            token_ids=token_ids,
+            times=[int(token.value) for token in tokens if token.kind == TIME],
+            corrections=corrections or {}
+        )
+
+    def _score_categories(self, query: Union[str, Sequence[int]]) -> Dict[str, int]:
+        """Count the distinct keywords of every category among the query's token ids."""
+        category_scores = dict.fromkeys(self.category_keywords, 0)
+        for token_id in set(self._ids(query)):
+            for category in self.matcher.category_ids.get(token_id, ()):
+                category_scores[category] += 1
+        return category_scores
+
+    def _determine_category(self, query: Union[str, Sequence[int]]) -> str:
+        """Determine the primary category of the query."""
+        categories = self._determine_categories(query)
+        return categories[0] if categories else "general"
+
+    def _determine_categories(self, query: Union[str, Sequence[int]], prediction: Optional[Prediction] = None,
+                              min_confidence: float = CLASSIFIER_MIN_CONFIDENCE) -> List[str]:
+        """
+        Determine every category the query asks about, strongest first.
+
+        All categories are scored once; any category within
+        SECONDARY_CATEGORY_RATIO of the top score is kept so that compound
+        questions ("best kachori near City Palace and when is it less
+        crowded?") get answered in full. A classifier prediction of at least
+        min_confidence becomes the primary category, with keyword matches
+        kept as secondary categories; a confident "general" prediction
+        means the query is off the guide's topics. A less confident
+        prediction is ignored, so a query with no keyword or dish stays
+        "general" (which lets a follow-up question inherit the previous topic).
+        """
+        ids = self._ids(query)
+        category_scores = self._score_categories(ids)
+        top_score = max(category_scores.values())
+        if top_score < MIN_CATEGORY_SCORE:
+            categories = []
+        else:
+            threshold = max(MIN_CATEGORY_SCORE, top_score * SECONDARY_CATEGORY_RATIO)
+            ranked = sorted(category_scores, key=category_scores.get, reverse=True)
+            categories = [category for category in ranked if category_scores[category] >= threshold]
+        # A dish named without any keyword ("ghevar kaha milega") is still a food question
+        if not categories and self._extract_phrases(ids)[1]:
+            categories = ["food"]
+
+        if prediction is not None and prediction.confidence >= min_confidence:
+            if prediction.category in self.category_keywords:
+                categories = [prediction.category] + [category for category in categories
+                                                      if category != prediction.category]
+            else:
+                categories = []
+        return categories
+
+    def _extract_location(self, query: Union[str, Sequence[int]]) -> Optional[str]:
+        """Extract location from query."""
+        locations = self._extract_locations(query)
+        return locations[0] if locations else None
+
+    def _extract_locations(self, query: Union[str, Sequence[int]]) -> List[str]:
+        """Extract every known location in the query, in the order mentioned."""
+        return self._extract_phrases(query)[0]
+
+    def _extract_dishes(self, query: Union[str, Sequence[int]]) -> List[str]:
+        """Extract every known dish in the query, in the order mentioned."""
+        return self._extract_phrases(query)[1]
+
+    def _extract_phrases(self, query: Union[str, Sequence[int]]) -> Tuple[List[str], List[str]]:
+        """
+        Find the locations and dishes of the query, by name or alias, in one scan.
+
+        At each token the longest matching phrase wins, so "the lake palace"
+        is one mention of Lake Pichola even though "the lake" alone is also an alias.
+
+        Returns:
+            The canonical locations and dishes, each in the order mentioned
+        """
+        ids = self._ids(query)
+        found: Dict[str, List[str]] = {LOCATION: [], DISH: []}
+        position = 0
+        while position < len(ids):
+            for phrase, kind, name in self.matcher.phrase_ids.get(ids[position], ()):
+                if tuple(ids[position:position + len(phrase)]) == phrase:
+                    if name not in found[kind]:
+                        found[kind].append(name)
+                    position += len(phrase) - 1
+                    break
+            position += 1
+        return found[LOCATION], found[DISH]
+
+    def _extract_time_context(self, query: Union[str, Sequence[int]]) -> Optional[str]:
+        """Extract time-related context from query."""
+        time_ids = self.matcher.time_ids
+        ranks = [time_ids[token_id] for token_id in self._ids(query) if token_id in time_ids]
+        return self.time_keywords[min(ranks)] if ranks else None
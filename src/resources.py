@@ -0,0 +1,32 @@
+"""
+Data files bundled into a zipapp build of the Udaipur Local Guide AI.
+
+A build made with `python -m src.bundle build` carries the compiled
+knowledge base snapshot, the intent model and the labeled training queries
+inside the archive, under src/_bundled/. Loaders use these only when the
+loose file they normally read (.kiro/product.md, .kiro/intent_model.npz,
+...) is missing, so an unpacked checkout behaves exactly as before and a
+kiosk can still override the bundled data by placing the files next to it.
+"""
+
+import pkgutil
+from typing import Dict, Optional
+
+
+BUNDLE_DIRECTORY = "_bundled"
+KB_SNAPSHOT_NAME = "kb_snapshot.json"
+INTENT_MODEL_NAME = "intent_model.npz"
+INTENT_TRAINING_NAME = "intent_training.tsv"
+
+# Resource name -> its bytes, or None when the build does not bundle it
+_resources: Dict[str, Optional[bytes]] = {}
+
+
+def bundled_resource(name: str) -> Optional[bytes]:
+    """The contents of a bundled data file, or None outside a bundle; read once per process."""
+    if name not in _resources:
+        try:
+            _resources[name] = pkgutil.get_data(__package__ or "src", f"{BUNDLE_DIRECTORY}/{name}")
+        except OSError:
+            _resources[name] = None
+    return _resources[name]
@@ -0,0 +1,669 @@
+"""
+Response generator for the Udaipur Local Guide AI.
+
+Turns a QueryIntent into a culturally-aware answer using the sections of the
+knowledge base returned by ContextLoader. Answers that depend only on the
+categories, location and keyword flags are served from a precomputed
+AnswerTable; the rest are generated per query.
+
+Every sentence comes from the response catalog of the intent's locale
+(see src/localization.py). The answer table holds default-locale answers;
+answers in other locales are generated per query.
+"""
+
+import re
+from dataclasses import replace
+from datetime import datetime, timedelta
+from itertools import permutations, product
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.answer_table import AnswerTable, answer_table_for, cached_answer_table
+from src.crowd_forecast import WEEKDAYS, CrowdForecast, crowd_level
+from src.crowd_model import (
+    NOW_PATTERN, UDAIPUR_TIMEZONE, CrowdStatus, crowd_model_for, format_minutes, parse_clock_time, parse_time_range
+)
+from src.geo_index import geo_index_for, parse_coordinates, parse_radius_km
+from src.itinerary import DEFAULT_TRANSPORT_MODE, ItineraryPlanner
+from src.localization import DEFAULT_LOCALE, Catalog, catalog_for, default_catalog
+from src.opening_hours import MINUTES_PER_DAY, PlaceHours, opening_hours_for
+from src.query_processor import QueryIntent
+from src.venue_store import VenueStore, default_venue_store
+
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?।])\s+")
+
+BEST_TIME_PATTERN = re.compile(r"\b(best|when|least crowded|quiet|quietest)\b")
+FORECAST_PERIOD_PATTERN = re.compile(r"\b(this week|next week|today|tomorrow|weekend|next few days|coming days)\b")
+NEARBY_PATTERN = re.compile(r"\b(near|nearby|within|around|close to|closest|nearest)\b")
+SIGHTSEEING_PATTERN = re.compile(r"\b(visit|see|sights?|sightseeing|attractions?|places)\b")
+DEFINITION_PATTERN = re.compile(r"\b(what is|what's|what are|meaning of)\b")
+NON_VEG_PATTERN = re.compile(r"\b(non[- ]?veg|non[- ]?vegetarian|meat|chicken|mutton)\b")
+VEG_PATTERN = re.compile(r"\b(veg|vegetarian|vegan|pure veg)\b")
+BUDGET_PATTERN = re.compile(r"\b(cheap|budget|affordable|inexpensive)\b")
+ITINERARY_PATTERN = re.compile(r"\b(plan|itinerary|day trip|route|schedule)\b")
+DATE_PATTERN = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+# "close to" asks for nearby places, not closing time
+OPEN_PATTERN = re.compile(r"\b(open|opens|opening|closed|closes|closing|close(?!\s+to\b))\b")
+
+# Keyword tests that pick a fixed branch of a category answer; part of the answer table key
+GREETING_WORD = "khamma"
+TRANSPORT_WORDS = ["transport", "traffic", "vehicle", "bike", "car"]
+SEASON_WORDS = ["season", "weather", "october", "march"]
+
+ANSWER_CATEGORIES = ["language", "food", "tourism", "culture"]
+# Compound questions spanning more categories than this are generated per query
+MAX_TABULATED_CATEGORIES = 2
+
+# Knowledge base sections each category's fixed answers read
+CATEGORY_SECTIONS = {
+    "language": ("language",),
+    "food": ("food",),
+    "tourism": ("tourism",),
+    "culture": ("culture",),
+    "general": (),
+}
+
+# Matched against the query's lemmas, with or without a plural or -ing/-ed ending ("walking", "taxis")
+TRANSPORT_MODE_WORDS = {
+    "walking": ["walk", "foot"],
+    "two_wheeler": ["bike", "scooter", "scooty", "wheeler", "motorcycle", "motorbike"],
+    "auto_rickshaw": ["auto", "rickshaw", "tuk"],
+    "car": ["car", "taxi", "cab"],
+}
+TRANSPORT_MODE_PATTERNS = {
+    mode: re.compile(rf"(?:{'|'.join(words)})(?:s|es|ing|ed)?\Z") for mode, words in TRANSPORT_MODE_WORDS.items()
+}
+
+# Search radius for "near X" questions that give no distance
+DEFAULT_NEARBY_RADIUS_KM = 1.5
+NEARBY_RESULT_LIMIT = 5
+# Closest places offered when nothing is inside the radius
+NEARBY_FALLBACK_LIMIT = 3
+
+# Used when an itinerary question gives no time window
+DEFAULT_DAY_WINDOW = (9 * 60, 18 * 60)
+
+
+class ResponseGenerator:
+    """Generates responses from query intent and local context."""
+
+    def __init__(self, venue_store: Optional[VenueStore] = None):
+        # Venue recommendations are used once venues have been imported
+        self.venue_store = venue_store if venue_store is not None else default_venue_store()
+
+    def generate_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """Generate response based on query intent and context."""
+        key = self._answer_key(intent)
+        if key is not None:
+            answer = self.answer_table(context).get(key)
+            if answer is not None:
+                return answer
+        return self._generate_uncached(intent, context)
+
+    def precomputed_response(self, intent: QueryIntent, context: Dict[str, Any]) -> Optional[str]:
+        """
+        The intent's answer if it is already in the answer table, without generating anything.
+
+        Used under overload, when only answers that cost a dict lookup are served.
+        Returns None if the answer needs fresh work or no table has been built yet.
+        """
+        key = self._answer_key(intent)
+        table = cached_answer_table(context, self._table_variant()) if key is not None else None
+        return table.get(key) if table is not None else None
+
+    def _generate_uncached(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        query_text = " ".join(intent.keywords)
+        if OPEN_PATTERN.search(query_text):
+            # Opening hours get one answer rather than one per detected category
+            open_response = self._generate_open_response(intent, context, query_text)
+            if open_response:
+                return open_response
+        if len(intent.categories) > 1:
+            return self._generate_composed_response(intent, context)
+        return self._generate_category_response(intent, context)
+
+    def answer_table(self, context: Dict[str, Any]) -> AnswerTable:
+        """The precomputed answers for a knowledge base, built once per context."""
+        return answer_table_for(
+            context,
+            lambda previous: AnswerTable.build(
+                self._answer_space(context),
+                lambda intent: self._generate_uncached(intent, context),
+                sections={name: context[name] for names in CATEGORY_SECTIONS.values()
+                          for name in names if name in context},
+                depends_on=lambda key: [section for category in key[0] for section in CATEGORY_SECTIONS[category]],
+                previous=previous
+            ),
+            self._table_variant()
+        )
+
+    def _table_variant(self) -> Optional[str]:
+        """
+        The venue database the answer table is built for.
+
+        With a venue store, food answers that could come from it are left
+        out of the table; without one they are answered from the knowledge base.
+        """
+        return self.venue_store.db_path if self.venue_store is not None else None
+
+    @staticmethod
+    def _answer_flags(query_text: str) -> Tuple[bool, bool, bool]:
+        """The keyword tests the fixed answer branches depend on."""
+        return (
+            GREETING_WORD in query_text,
+            any(word in query_text for word in TRANSPORT_WORDS),
+            any(word in query_text for word in SEASON_WORDS),
+        )
+
+    def _answer_key(self, intent: QueryIntent) -> Optional[Tuple]:
+        """
+        Key of the intent's answer in the answer table.
+
+        Returns None for queries whose answer depends on more than the key:
+        a time of day, a forecast period, a place to search around, an
+        itinerary, what is open, or a venue search (an area, dish, cuisine,
+        diet or budget to look up in the venue database), and for answers
+        outside the default locale.
+        """
+        if intent.locale != DEFAULT_LOCALE:
+            return None
+        query_text = " ".join(intent.keywords).lower()
+        if (NEARBY_PATTERN.search(query_text) or ITINERARY_PATTERN.search(query_text) or OPEN_PATTERN.search(query_text)
+                or FORECAST_PERIOD_PATTERN.search(query_text) or parse_clock_time(query_text) is not None
+                or parse_coordinates(query_text) is not None):
+            return None
+        categories = tuple(intent.categories) if len(intent.categories) > 1 else (intent.category,)
+        if "food" in categories and self.venue_store is not None and (
+                intent.location or any(value is not None for value in self._venue_filters(intent, query_text))):
+            # Answered from the venue database, which changes independently of the knowledge base
+            return None
+        return self._canonical_key(categories, intent.location, self._answer_flags(query_text))
+
+    @staticmethod
+    def _canonical_key(categories: Tuple[str, ...], location: Optional[str],
+                       flags: Tuple[bool, bool, bool]) -> Tuple:
+        """Drop the parts of a key that none of its categories read."""
+        if "food" not in categories and "tourism" not in categories:
+            location = None
+        greeting, transport, season = flags
+        flags = (greeting and "language" in categories, transport and "tourism" in categories,
+                 season and "tourism" in categories)
+        return categories, location, flags
+
+    def _answer_space(self, context: Dict[str, Any]) -> Iterator[Tuple[Tuple, QueryIntent]]:
+        """Every answer key with a representative intent that produces it."""
+        overview = context.get("overview", {})
+        names = (list(context.get("food", {}).get("areas", []))
+                 + list(context.get("tourism", {}).get("peak_times", {}))
+                 + list(overview.get("coordinates", {})) + list(overview.get("key_areas", [])))
+        locations: List[Optional[str]] = [None] + list(dict.fromkeys(names))
+
+        category_sets = [(category,) for category in ANSWER_CATEGORIES + ["general"]]
+        for size in range(2, MAX_TABULATED_CATEGORIES + 1):
+            category_sets.extend(permutations(ANSWER_CATEGORIES, size))
+
+        flag_words = (GREETING_WORD, TRANSPORT_WORDS[0], SEASON_WORDS[0])
+        seen = set()
+        for categories, location, flags in product(category_sets, locations, product((False, True), repeat=3)):
+            key = self._canonical_key(categories, location, flags)
+            if key in seen or (self.venue_store is not None and "food" in key[0] and key[1] is not None):
+                continue
+            seen.add(key)
+            categories, location, flags = key
+            keywords = [word for word, flag in zip(flag_words, flags) if flag]
+            intent = QueryIntent(
+                category=categories[0],
+                keywords=keywords,
+                location=location,
+                categories=list(categories) if categories != ("general",) else [],
+                locations=[location] if location else []
+            )
+            yield key, intent
+
+    def _generate_composed_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """
+        Answer every detected category in one response.
+
+        Every part reads from the same context mapping, and sentences repeated
+        across parts (greeting tips, crowd timing) are only kept the first
+        time they appear.
+        """
+        seen_sentences = set()
+        parts: List[str] = []
+
+        for category in intent.categories:
+            part_intent = replace(intent, category=category, categories=[category])
+            part = self._generate_category_response(part_intent, context)
+
+            sentences = []
+            for sentence in SENTENCE_BOUNDARY.split(part.strip()):
+                key = sentence.strip().lower()
+                if key and key not in seen_sentences:
+                    seen_sentences.add(key)
+                    sentences.append(sentence.strip())
+            if sentences:
+                parts.append(" ".join(sentences))
+
+        return "\n\n".join(parts)
+
+    def _generate_category_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """Generate the response for the intent's primary category."""
+        try:
+            if intent.category == "language":
+                return self._generate_language_response(intent, context)
+            elif intent.category == "food":
+                return self._generate_food_response(intent, context)
+            elif intent.category == "tourism":
+                return self._generate_tourism_response(intent, context)
+            elif intent.category == "culture":
+                return self._generate_culture_response(intent, context)
+            else:
+                return self._generate_general_response(intent, context)
+        except Exception as e:
+            return catalog_for(intent.locale).text("response.error")
+
+    def _generate_language_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """Generate language-related responses."""
+        language_data = context.get("language", {})
+        catalog = catalog_for(intent.locale)
+
+        if self._answer_flags(" ".join(intent.keywords).lower())[0]:
+            phrase_info = language_data.get("phrases", {}).get("Khamma Ghani", "")
+            return catalog.text("language.khamma_ghani", meaning=phrase_info)
+
+        greetings = language_data.get("greetings", [])
+        if greetings:
+            return catalog.text("language.greetings", greetings=", ".join(greetings))
+
+        return catalog.text("language.default")
+
+    def _generate_food_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """Generate food-related responses."""
+        food_data = context.get("food", {})
+        catalog = catalog_for(intent.locale)
+
+        query_text = " ".join(intent.keywords)
+        open_at = self._asked_time(query_text)[0] if OPEN_PATTERN.search(query_text) else None
+        if NEARBY_PATTERN.search(query_text):
+            nearby_response = self._generate_nearby_response(intent, context, query_text, "food", open_at)
+            if nearby_response:
+                return nearby_response
+
+        if self.venue_store is not None and not DEFINITION_PATTERN.search(query_text):
+            venue_response = self._generate_venue_response(intent, query_text, open_at)
+            if venue_response:
+                return venue_response
+
+        if intent.location:
+            areas = food_data.get("areas", [])
+            if any(intent.location.lower() in area.lower() for area in areas):
+                return catalog.text("food.area", location=intent.location)
+
+        dishes = food_data.get("dishes", [])
+        if dishes:
+            return catalog.text("food.dishes", dishes=", ".join(dishes))
+
+        return catalog.text("food.default")
+
+    def _generate_tourism_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """Generate tourism-related responses."""
+        tourism_data = context.get("tourism", {})
+        catalog = catalog_for(intent.locale)
+
+        query_text = " ".join(intent.keywords)
+        if ITINERARY_PATTERN.search(query_text) and len(intent.locations) >= 2:
+            itinerary_response = self._generate_itinerary_response(intent, context, query_text)
+            if itinerary_response:
+                return itinerary_response
+
+        period = FORECAST_PERIOD_PATTERN.search(query_text)
+        if period and BEST_TIME_PATTERN.search(query_text):
+            forecast_response = self._generate_best_time_response(intent, context, period.group(1))
+            if forecast_response:
+                return forecast_response
+
+        peak_times = tourism_data.get("peak_times", {})
+        asked_minute = parse_clock_time(" ".join(intent.keywords))
+        if asked_minute is not None and peak_times:
+            crowd_response = self._generate_crowd_at_time_response(intent, peak_times, asked_minute)
+            if crowd_response:
+                return crowd_response
+
+        if NEARBY_PATTERN.search(query_text) and SIGHTSEEING_PATTERN.search(query_text):
+            nearby_response = self._generate_nearby_response(intent, context, query_text, "sight")
+            if nearby_response:
+                return nearby_response
+
+        if intent.location:
+            peak_times = tourism_data.get("peak_times", {})
+            location_key = next((key for key in peak_times.keys() if intent.location.lower() in key.lower()), None)
+            if location_key:
+                peak_time = peak_times[location_key]
+                return catalog.text("tourism.peak_times", location=intent.location, peak_time=peak_time)
+
+        _, asks_transport, asks_season = self._answer_flags(query_text.lower())
+        if asks_transport:
+            transport_info = tourism_data.get("transportation", {}).get("heritage_areas", "")
+            return catalog.text("tourism.transport", advice=transport_info.lower())
+
+        if asks_season:
+            peak_season = tourism_data.get("peak_season", "")
+            return catalog.text("tourism.season", season=peak_season)
+
+        return catalog.text("tourism.default")
+
+    @staticmethod
+    def _asked_time(query_text: str, catalog: Optional[Catalog] = None) -> Tuple[datetime, str]:
+        """The Udaipur local time a query asks about (default now) and how to phrase it."""
+        catalog = catalog or default_catalog()
+        when = datetime.now(UDAIPUR_TIMEZONE)
+        label = catalog.text("when.now")
+        minute = parse_clock_time(NOW_PATTERN.sub(" ", query_text))
+        if minute is not None:
+            when = when.replace(hour=minute // 60, minute=minute % 60, second=0, microsecond=0)
+            label = catalog.text("when.at", time=format_minutes(minute))
+        day_label = None
+        day = DATE_PATTERN.search(query_text)
+        if day:
+            try:
+                when = when.replace(year=int(day.group(1)), month=int(day.group(2)), day=int(day.group(3)))
+                day_label = catalog.text("when.on", date=day.group(0))
+            except ValueError:
+                pass
+        elif "tomorrow" in query_text.lower():
+            when += timedelta(days=1)
+            day_label = catalog.text("when.tomorrow")
+        if day_label is not None:
+            label = catalog.text("when.time_and_day", time=label, day=day_label) if minute is not None else day_label
+        return when, label
+
+    @staticmethod
+    def _weekday(day: int, catalog: Catalog) -> str:
+        return catalog.text(f"weekday.{WEEKDAYS[day].lower()}")
+
+    @staticmethod
+    def _crowd_level(level: float, catalog: Catalog) -> str:
+        return catalog.text(f"level.{crowd_level(level)}")
+
+    @staticmethod
+    def _asked_dishes(intent: QueryIntent, names: Iterable[str], query_text: str) -> Set[str]:
+        """The dishes among names that the query names, directly or by a knowledge-base alias."""
+        asked = {dish.lower() for dish in intent.dishes}
+        query_lower = query_text.lower()
+        return {name for name in names if name.lower() in asked or name.lower() in query_lower}
+
+    @classmethod
+    def _describe_hours(cls, status: PlaceHours, when: datetime, label: str, catalog: Catalog) -> str:
+        if status.special:
+            key = "hours.special_open" if status.is_open else "hours.special_closed"
+            return catalog.text(key, name=status.name, when=label)
+        if status.next_change is None:
+            return catalog.text("hours.always_open" if status.is_open else "hours.closed", name=status.name)
+        day, minute = divmod(status.next_change, MINUTES_PER_DAY)
+        if status.is_open:
+            return catalog.text("hours.closes_at", name=status.name, when=label, time=format_minutes(minute))
+        if day == when.weekday():
+            return catalog.text("hours.opens_at", name=status.name, when=label, time=format_minutes(minute))
+        return catalog.text("hours.opens_on", name=status.name, when=label, day=cls._weekday(day, catalog),
+                            time=format_minutes(minute))
+
+    def _generate_open_response(self, intent: QueryIntent, context: Dict[str, Any], query_text: str) -> str:
+        """Answer "is X open?" and "what's open (near X) now?" from the opening-hours index."""
+        catalog = catalog_for(intent.locale)
+        when, label = self._asked_time(query_text, catalog)
+        if "food" in intent.categories:
+            kind: Optional[str] = "food"
+        else:
+            kind = "sight" if SIGHTSEEING_PATTERN.search(query_text) else None
+        if NEARBY_PATTERN.search(query_text) or parse_coordinates(query_text) is not None:
+            return self._generate_nearby_response(intent, context, query_text, kind, when)
+
+        hours = opening_hours_for(context)
+        if intent.location:
+            status = hours.status(intent.location, when)
+            return self._describe_hours(status, when, label, catalog) if status is not None else ""
+        if kind == "food" and self.venue_store is not None:
+            venue_response = self._generate_venue_response(intent, query_text, when)
+            if venue_response:
+                return venue_response
+
+        places = geo_index_for(context).places
+        dishes = self._asked_dishes(intent, {dish for place in places for dish in place.dishes}, query_text)
+        open_names = [place.name for place, is_open in zip(places, hours.open_mask(when))
+                      if is_open and (kind is None or place.kind == kind)
+                      and (not dishes or dishes.intersection(place.dishes))]
+        if not open_names:
+            return catalog.text("open.none", when=label)
+        listing = ", ".join(open_names[:NEARBY_RESULT_LIMIT * 2])
+        if len(open_names) > NEARBY_RESULT_LIMIT * 2:
+            listing = catalog.text("open.more", listing=listing, count=len(open_names) - NEARBY_RESULT_LIMIT * 2)
+        return catalog.text("open.listing", when=label, listing=listing)
+
+    def _generate_nearby_response(self, intent: QueryIntent, context: Dict[str, Any], query_text: str,
+                                  kind: Optional[str], open_at: Optional[datetime] = None) -> str:
+        """
+        List food venues or sights around a named place or a "lat, lon" point.
+
+        With open_at, only places open at that time are listed; one stabbing
+        query over the opening-hours index covers every candidate.
+        """
+        catalog = catalog_for(intent.locale)
+        index = geo_index_for(context)
+        point = parse_coordinates(query_text)
+        if point is not None:
+            origin_name = catalog.text("nearby.you")
+        elif intent.location:
+            place = index.locate(intent.location)
+            if place is None:
+                return ""
+            point, origin_name = (place.latitude, place.longitude), place.name
+        else:
+            return ""
+
+        radius_km = parse_radius_km(query_text) or DEFAULT_NEARBY_RADIUS_KM
+        label = catalog.text({"food": "nearby.food", "sight": "nearby.sight"}.get(kind, "nearby.places"))
+        # "kachori near X" only lists venues serving kachori
+        dishes = self._asked_dishes(intent, {dish for place in index.places for dish in place.dishes}, query_text)
+        if dishes:
+            label = catalog.text("nearby.dishes", dishes=", ".join(sorted(dishes)))
+
+        hours = opening_hours_for(context) if open_at is not None else None
+        open_mask = hours.open_mask(open_at) if hours is not None else None
+        when_label = self._asked_time(query_text, catalog)[1] if hours is not None else ""
+        if hours is not None:
+            label = catalog.text("nearby.open", label=label, when=when_label)
+
+        def wanted(result) -> bool:
+            if open_mask is not None and not open_mask[hours.positions[result.place.name.lower()]]:
+                return False
+            return result.place.name != origin_name and (not dishes or bool(dishes.intersection(result.place.dishes)))
+
+        results = [result for result in index.within(point[0], point[1], radius_km, kind=kind)
+                   if wanted(result)][:NEARBY_RESULT_LIMIT]
+        if results:
+            heading = catalog.text("nearby.within", label=label, radius=radius_km, origin=origin_name)
+        else:
+            # Ask the index for a few places and widen only when the dish or open-now filters reject them
+            k = NEARBY_FALLBACK_LIMIT
+            while True:
+                candidates = index.nearest(point[0], point[1], k, kind=kind, exclude=origin_name)
+                results = [result for result in candidates if wanted(result)][:NEARBY_FALLBACK_LIMIT]
+                if len(results) == NEARBY_FALLBACK_LIMIT or len(candidates) < k:
+                    break
+                k *= 4
+            if not results:
+                return ""
+            if hours is not None:
+                heading = catalog.text("nearby.closest_open", when=when_label, radius=radius_km, origin=origin_name)
+            else:
+                heading = catalog.text("nearby.closest", radius=radius_km, origin=origin_name)
+
+        listing = "; ".join(
+            catalog.text("nearby.place_dishes", name=result.place.name, distance=result.distance_km,
+                         dishes=", ".join(result.place.dishes))
+            if result.place.dishes else
+            catalog.text("nearby.place", name=result.place.name, distance=result.distance_km)
+            for result in results
+        )
+        return catalog.text("listing", heading=heading, listing=listing)
+
+    def _venue_filters(self, intent: QueryIntent, query_text: str) -> Tuple[Optional[str], Optional[str],
+                                                                            Optional[bool], Optional[int]]:
+        """The dish, cuisine, diet and price band a food query asks the venue database for; None if not asked."""
+        dishes, cuisines = self.venue_store.vocabulary()
+        dish = next(iter(sorted(self._asked_dishes(intent, dishes, query_text))), None)
+        cuisine = next((name for name in cuisines if name.lower() in query_text), None)
+        if NON_VEG_PATTERN.search(query_text):
+            veg: Optional[bool] = False
+        else:
+            veg = True if VEG_PATTERN.search(query_text) else None
+        max_price_band = 1 if BUDGET_PATTERN.search(query_text) else None
+        return dish, cuisine, veg, max_price_band
+
+    def _generate_venue_response(self, intent: QueryIntent, query_text: str,
+                                 open_at: Optional[datetime] = None) -> str:
+        """Recommend the best-rated venues matching the area, dish, cuisine, diet and budget asked for."""
+        dish, cuisine, veg, max_price_band = self._venue_filters(intent, query_text)
+        if not (intent.location or dish or cuisine or veg is not None or max_price_band or open_at):
+            return ""
+
+        venues = self.venue_store.top_venues(area=intent.location, dish=dish, cuisine=cuisine, veg=veg,
+                                             max_price_band=max_price_band, limit=NEARBY_RESULT_LIMIT,
+                                             open_at=open_at)
+        if not venues:
+            return ""
+
+        catalog = catalog_for(intent.locale)
+        descriptors = [word for word in (catalog.text("venue.budget") if max_price_band else None,
+                                         {True: catalog.text("venue.vegetarian"),
+                                          False: catalog.text("venue.non_vegetarian"), None: None}[veg],
+                                         cuisine) if word]
+        if descriptors:
+            heading = catalog.text("venue.described_places", descriptors=" ".join(descriptors))
+        else:
+            heading = catalog.text("venue.places")
+        if dish:
+            heading += " " + catalog.text("venue.for_dish", dish=dish)
+        if intent.location:
+            heading += " " + catalog.text("venue.in_area", area=intent.location)
+        if open_at is not None:
+            heading += " " + catalog.text("venue.open", when=self._asked_time(query_text, catalog)[1])
+        listing = "; ".join(
+            catalog.text("venue.item", name=venue.name, cuisine=venue.cuisine or catalog.text("venue.local_food"),
+                         diet=catalog.text("venue.veg" if venue.veg else "venue.non_veg"),
+                         price="₹" * venue.price_band, rating=venue.rating)
+            for venue in venues
+        )
+        return catalog.text("listing", heading=heading, listing=listing)
+
+    def _generate_crowd_at_time_response(self, intent: QueryIntent, peak_times: Dict[str, str], minute: int) -> str:
+        """Answer "is it crowded at <time>?" from the compiled crowd model."""
+        catalog = catalog_for(intent.locale)
+        model = crowd_model_for(peak_times)
+        when = format_minutes(minute)
+
+        if intent.location:
+            status = model.evaluate_location(intent.location, minute)
+            if status is None:
+                return ""
+            return catalog.text("crowd.location_at", time=when, location=status.location,
+                                description=self._describe_crowd(status, catalog))
+
+        statuses = model.evaluate(minute)
+        summary = "; ".join(catalog.text("crowd.item", location=status.location,
+                                         description=self._describe_crowd(status, catalog))
+                            for status in statuses)
+        return catalog.text("crowd.all_at", time=when, summary=summary)
+
+    def _generate_best_time_response(self, intent: QueryIntent, context: Dict[str, Any], period: str) -> str:
+        """Recommend the least crowded slot in the asked period for each mentioned attraction."""
+        forecast = CrowdForecast.from_context(context)
+        locations = intent.locations or forecast.locations
+        now = datetime.now(UDAIPUR_TIMEZONE)
+
+        if period == "today":
+            slots = forecast.best_slots(locations, days=1, now=now)
+        elif period == "tomorrow":
+            slots = forecast.best_slots(locations, days=1, now=(now + timedelta(days=1)).replace(hour=0, minute=0))
+        else:
+            slots = forecast.best_slots(locations, days=7, now=now)
+
+        if not slots:
+            return ""
+        catalog = catalog_for(intent.locale)
+        suggestions = "; ".join(
+            catalog.text("forecast.slot", location=slot.location, day=self._weekday(slot.day.weekday(), catalog),
+                         time=format_minutes(slot.hour * 60), level=self._crowd_level(slot.level, catalog))
+            for slot in slots
+        )
+        return catalog.text("forecast.best_times", period=catalog.text("period." + period.replace(" ", "_")),
+                            suggestions=suggestions)
+
+    def _generate_itinerary_response(self, intent: QueryIntent, context: Dict[str, Any], query_text: str) -> str:
+        """Plan a crowd-aware day across the attractions named in the query."""
+        overview = context.get("overview", {})
+        planner = ItineraryPlanner(
+            overview.get("coordinates", {}),
+            overview.get("visit_minutes", {}),
+            CrowdForecast.from_context(context)
+        )
+
+        start_minute, end_minute = parse_time_range(query_text) or DEFAULT_DAY_WINDOW
+        transport_mode = next(
+            (mode for mode, pattern in TRANSPORT_MODE_PATTERNS.items()
+             if any(pattern.match(token) for token in intent.tokens)),
+            DEFAULT_TRANSPORT_MODE
+        )
+        date = datetime.now(UDAIPUR_TIMEZONE)
+        if "tomorrow" in query_text:
+            date += timedelta(days=1)
+
+        itinerary = planner.plan(intent.locations, start_minute, end_minute, date, transport_mode)
+        if not itinerary.stops:
+            return ""
+
+        catalog = catalog_for(intent.locale)
+        steps = " -> ".join(
+            catalog.text("itinerary.stop", arrive=format_minutes(stop.arrive), location=stop.location,
+                         depart=format_minutes(stop.depart), level=self._crowd_level(stop.crowd_level, catalog))
+            for stop in itinerary.stops
+        )
+        travel = round(sum(stop.travel_minutes for stop in itinerary.stops))
+        response = catalog.text("itinerary.plan", mode=catalog.text(f"mode.{transport_mode}"),
+                                start=format_minutes(start_minute), end=format_minutes(end_minute), steps=steps,
+                                travel=travel)
+        if itinerary.skipped:
+            response += " " + catalog.text("itinerary.skipped", locations=", ".join(itinerary.skipped))
+        if not itinerary.fits_window:
+            response += " " + catalog.text("itinerary.overrun")
+        return response
+
+    def _describe_crowd(self, status: CrowdStatus, catalog: Catalog) -> str:
+        """Describe one location's crowd level and its next quiet window."""
+        if status.level == "quiet":
+            if status.quiet_until < 0:
+                return catalog.text("crowd.quiet_all_day")
+            return catalog.text("crowd.quiet_until", time=format_minutes(status.quiet_until))
+        description = catalog.text("crowd.peak" if status.level == "peak" else "crowd.busy")
+        if status.quiet_from < 0:
+            return description
+        if status.quiet_until < 0:
+            return catalog.text("crowd.quietens_from", description=description, time=format_minutes(status.quiet_from))
+        return catalog.text("crowd.next_quiet", description=description, start=format_minutes(status.quiet_from),
+                            end=format_minutes(status.quiet_until))
+
+    def _generate_culture_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """Generate culture-related responses."""
+        culture_data = context.get("culture", {})
+        etiquette = culture_data.get("etiquette", [])
+
+        catalog = catalog_for(intent.locale)
+
+        if etiquette:
+            return catalog.text("culture.etiquette", etiquette=". ".join(etiquette))
+
+        return catalog.text("culture.default")
+
+    def _generate_general_response(self, intent: QueryIntent, context: Dict[str, Any]) -> str:
+        """Generate general fallback responses."""
+        return catalog_for(intent.locale).text("general.default")
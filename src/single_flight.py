@@ -0,0 +1,86 @@
+"""
+Single-flight request coalescing for the Udaipur Local Guide AI.
+
+When many visitors press the same example button at once, the same question
+arrives many times within a few milliseconds. SingleFlight runs the first
+call for a key (the leader). Identical calls that arrive while it is still
+running wait for it and share its result or exception, instead of
+repeating the work. Once the leader finishes, the key is forgotten, so
+nothing is cached beyond the burst.
+
+Thread callers use do(); asyncio callers use do_async(). Both share one
+in-flight table, so a coroutine can wait on a computation a thread started,
+and the reverse. An asyncio leader runs the computation on the loop's
+default executor, and asyncio followers wait without tying up a thread.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return compute()'s result, sharing one call among concurrent callers with the same key.
+
+        Raises:
+            Whatever compute raised, in the leader and every waiting caller
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, compute)
+        return future.result()
+
+    async def do_async(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Like do(), awaiting the shared call; compute is a plain function run on the default executor."""
+        future, leader = self._join(key)
+        if leader:
+            await asyncio.get_running_loop().run_in_executor(None, self._run, key, future, compute)
+        return await asyncio.wrap_future(future)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of computed and shared calls, and the number in flight."""
+        return {"computed": self.computed, "shared": self.shared, "in_flight": self.in_flight()}
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """The in-flight call for key, and whether the caller must run it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.computed += 1
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, compute: Callable[[], Any]) -> None:
+        try:
+            result = compute()
+        except BaseException as error:
+            self._forget(key)
+            future.set_exception(error)
+        else:
+            self._forget(key)
+            future.set_result(result)
+
+    def _forget(self, key: Hashable) -> None:
+        # Before the result is published, so later callers start a fresh computation
+        with self._lock:
+            del self._calls[key]
+
+
+DEFAULT_SINGLE_FLIGHT = SingleFlight()
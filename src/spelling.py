@@ -0,0 +1,270 @@
+"""
+Spelling correction for query terms.
+
+Tourists misspell dish and place names ("ghever", "pichla", "etiquete"),
+and a misspelled keyword silently loses the query's intent. SpellCorrector
+is a symmetric-delete index in the style of SymSpell: every dictionary
+word is stored under each string reachable from it by deleting up to two
+characters. A query token is corrected by generating its own deletes and
+looking them up, so a candidate costs a few dict lookups, with no scan of
+the dictionary. Candidates are confirmed with a true edit distance
+(adjacent transpositions count as one edit), and the closest, most
+frequent word wins.
+
+Corrections only ever produce a word of the query vocabulary (category
+keywords, dish names and aliases, locations and their aliases, time words),
+a known Hinglish spelling, or an area or location name of the knowledge
+base. That dictionary is small and does not grow with the knowledge base's
+text, so building it is cheap in every process. Known words are never
+corrected: besides the dictionary, they are common English and Hinglish
+words, together with their plurals and -ed/-ing forms. Without that shield,
+"take" would become "lake" and "polite" would become "police". Words
+shorter than MIN_WORD_LENGTH are left alone, and tokens shorter than
+LONG_WORD_LENGTH may be at most one edit away.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+MAX_EDIT_DISTANCE = 2
+MIN_WORD_LENGTH = 4
+LONG_WORD_LENGTH = 6
+CORRECTOR_CACHE_SIZE = 8
+TOKEN_CACHE_SIZE = 20000
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Frequency given to the query vocabulary, so keywords win ties with incidental knowledge base words
+KEYWORD_FREQUENCY = 1000
+# Endings removed when deciding whether a word is a form of a known word
+INFLECTIONS = ("s", "es", "ed", "d", "ing", "ly", "er", "est")
+
+COMMON_WORDS = frozenset("""
+able about above across actually add address after afternoon again against ago ahead air all allow almost alone along
+already also always among amount another answer any anyone anything anywhere area around arrive art ask away
+baby back bad bag bank base beach beautiful became because become bed been before began begin behind being
+believe below beside best better between big bike bill bit black blue boat body book both bottom bought box
+boy bread break breakfast bridge bring brother brought build building built bus business busy but buy cake
+call came camera can car card care carry case cash cat catch cause center central change charge cheap check
+child children choose church city class clean clear climb clock close closer clothes coffee cold come comes
+coming company cook cool corner cost could count country couple course cover create cross crowd cup current
+cut dance dark date daughter day days dead deal dear decide deep did different dinner direction dirty distance
+does dog doing done door down drink drive driver drop during each early east easy eating else end enjoy enough
+enter entry even evening event ever every everyone everything exact example except expensive experience explain
+eye face fact fair fall family famous far farm fast father fee feel feet festival few field fill film find
+fine finish fire first fish five floor fly follow foot for form four free fresh friend from front fruit full
+fun game garden gate gave get gift girl give given glass goes going gold gone good got great green ground
+group grow guide hair half hand happen happy hard has hat have head hear heard heart heat heavy held help her
+here high hike hill him hindu his history hold holiday home hope horse hot hotel hour hours house how however huge
+hungry husband idea important inside interesting into island its just keep kept kid kids kind king knew know
+lady land large last late later lay lead learn least leave left less let letter life light like line list
+listen little live local long look lose lost lot love low lunch made main make man many map market may
+maybe meal mean meet menu might mile milk mind minute miss money month more morning most mother move movie much
+museum music must name nature near nearby need never new news next nice night none noon north nothing notice
+now number ocean off offer office often old once one only open order other our out outside over own paid
+pair paper park part party pass past pay people perfect person photo pick picture piece place plan play
+please point police polite poor possible post pretty price problem public pull put question quick quickly quiet
+quite rain ran rather reach read ready real really reason red remember rent rest return rich ride right
+river road rock room round route run safe said sale same sand saw says school sea seat second see seem seen
+sell send sent service set seven shall she shoe shop shopping short should show shown side sight sign simple
+since sing sister sit six size sleep slow small smile snow some someone something sometimes son song soon
+sorry sound south space special spend spot spring square stand star start station stay step still stop
+store story street strong student study such suggest summer sun sure sweet swim table take taken talk taste
+taxi tea teach tell ten than thank that the their them then there these they thing things think this those
+though thought three through ticket till time tip tipping tired today together told tomorrow too took top tour tourist
+toward town train travel tree trip true try turn two under until upon use used usual very view village
+visit wait wake walk wall want warm was wash watch water way week weekend well went were west what wheel
+when where which while white who whole why wide wife will win window winter wish with within without woman
+women wonder word work world worry would write wrong yard year yellow yes yesterday yet young your
+""".split()) | frozenset(
+    # Dates and weather, which sit one or two edits from Hinglish spellings ("march" and "mirch")
+    "january february march april may june july august september october november december "
+    "monday tuesday wednesday thursday friday saturday sunday weather".split())
+
+# Everyday romanized Hindi, so Hinglish questions are not "corrected" into English
+HINGLISH_WORDS = frozenset("""
+aap accha acha achha aur bada bade badi batao bataiye bhaisa chahiye chhota chota dekhna hai hain hota idhar
+jaana jana kaha kahan kaise kaisa kab kidhar kitna kitne kuch kya liye mein mewar milega milegi milta milti
+mojari mujhe nahi nahin sabse theek udhar wala wale wali yahan
+""".split())
+
+
+def edit_distance(source: str, target: str, limit: int = MAX_EDIT_DISTANCE) -> int:
+    """
+    Optimal string alignment distance between two words, or limit + 1 if it exceeds limit.
+
+    Insertions, deletions, substitutions and adjacent transpositions each count as one edit.
+    """
+    # Shared prefixes and suffixes never cost an edit
+    start = 0
+    while start < len(source) and start < len(target) and source[start] == target[start]:
+        start += 1
+    end = 0
+    while (end < len(source) - start and end < len(target) - start
+           and source[-1 - end] == target[-1 - end]):
+        end += 1
+    source, target = source[start:len(source) - end], target[start:len(target) - end]
+    if abs(len(source) - len(target)) > limit:
+        return limit + 1
+    if not source or not target:
+        return max(len(source), len(target))
+
+    # Only cells within limit of the diagonal can stay within limit
+    beyond = limit + 1
+    previous_previous: List[int] = []
+    previous = [j if j <= limit else beyond for j in range(len(target) + 1)]
+    for i in range(1, len(source) + 1):
+        current = [i if i <= limit else beyond] + [beyond] * len(target)
+        for j in range(max(1, i - limit), min(len(target), i + limit) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = min(value, beyond)
+        # Later rows can only build on this row or, by a transposition, the one before it
+        if min(current) > limit and min(previous) >= limit:
+            return beyond
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def _next_deletes(level: Set[str]) -> Set[str]:
+    """Every string reachable from a string of level by deleting one more character."""
+    return {candidate[:index] + candidate[index + 1:] for candidate in level for index in range(len(candidate))}
+
+
+def _deletes_by_count(word: str, distance: int) -> List[Set[str]]:
+    """Strings reachable from word by deleting exactly 0, 1, ... distance characters."""
+    levels = [{word}]
+    for _ in range(distance):
+        levels.append(_next_deletes(levels[-1]))
+    return levels
+
+
+class SpellCorrector:
+    """Symmetric-delete spelling index over a fixed dictionary of lower-case words."""
+
+    def __init__(self, frequencies: Mapping[str, int], known_words: Iterable[str] = (),
+                 max_distance: int = MAX_EDIT_DISTANCE):
+        """
+        Args:
+            frequencies: Words corrections may produce, with their weights
+            known_words: Further words that are never corrected, but never produced either
+            max_distance: Largest edit distance corrected
+        """
+        self.max_distance = max_distance
+        self.frequencies = dict(frequencies)
+        self.known_words = frozenset(known_words) | frozenset(self.frequencies)
+        # Delete string (including the word itself) -> dictionary words it came from
+        self._index: Dict[str, List[str]] = {}
+        for word in self.frequencies:
+            for level in _deletes_by_count(word, max_distance):
+                for variant in level:
+                    self._index.setdefault(variant, []).append(word)
+        self._cache: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_words(cls, keywords: Iterable[str], text_words: Iterable[str] = (), known_words: Iterable[str] = (),
+                   max_distance: int = MAX_EDIT_DISTANCE) -> "SpellCorrector":
+        """
+        Build the dictionary from query keywords and knowledge base words.
+
+        Args:
+            keywords: Terms the query matchers know; preferred on ties
+            text_words: Further words of the knowledge base, weighted by how often they occur
+            known_words: Words to leave alone in addition to COMMON_WORDS and HINGLISH_WORDS
+        """
+        frequencies: Counter = Counter(word for word in text_words if word.isascii() and word.isalpha())
+        for keyword in keywords:
+            for word in keyword.lower().split():
+                if word.isascii() and word.isalpha():
+                    frequencies[word] += KEYWORD_FREQUENCY
+        return cls(frequencies, COMMON_WORDS | HINGLISH_WORDS | frozenset(known_words), max_distance)
+
+    def __len__(self) -> int:
+        return len(self.frequencies)
+
+    def is_known(self, word: str) -> bool:
+        """Whether a word, or the word without an inflection ending, is known."""
+        if word in self.known_words:
+            return True
+        return any(word.endswith(ending) and word[:-len(ending)] in self.known_words for ending in INFLECTIONS)
+
+    def correct(self, token: str) -> Optional[str]:
+        """The dictionary word a lower-case token was meant to be, or None if it is known or has no close match."""
+        if len(token) < MIN_WORD_LENGTH or not (token.isascii() and token.isalpha()):
+            return None
+        if token in self._cache:
+            return self._cache[token]
+
+        correction = None if self.is_known(token) else self._lookup(token)
+        if len(self._cache) >= TOKEN_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[token] = correction
+        return correction
+
+    def _lookup(self, token: str) -> Optional[str]:
+        limit = min(self.max_distance, 1 if len(token) < LONG_WORD_LENGTH else 2)
+        best: Optional[Tuple[int, int, str]] = None
+        checked: Set[str] = set()
+        level = {token}
+        for deleted in range(limit + 1):
+            # A word within distance d shares a delete string with the token at d deletes or fewer,
+            # so the next (larger) level of deletes is only generated while nothing that close is found
+            if best is not None and best[0] <= deleted:
+                break
+            if deleted:
+                level = _next_deletes(level)
+            for variant in level:
+                for word in self._index.get(variant, ()):
+                    bound = best[0] if best is not None else limit
+                    if word in checked or abs(len(word) - len(token)) > bound:
+                        continue
+                    checked.add(word)
+                    distance = edit_distance(token, word, bound)
+                    if distance > bound:
+                        continue
+                    candidate = (distance, -self.frequencies[word], word)
+                    if best is None or candidate < best:
+                        best = candidate
+        return best[2] if best is not None else None
+
+
+def place_name_words(context: Mapping[str, Any]) -> List[str]:
+    """Words of the area and location names of a knowledge base's overview and food sections."""
+    overview, food = context.get("overview", {}), context.get("food", {})
+    names = list(overview.get("key_areas", ())) + list(overview.get("coordinates", {})) + list(food.get("areas", ()))
+    return [word for name in names for word in WORD_PATTERN.findall(str(name).lower())]
+
+
+# (kb_version, keywords) -> corrector
+_CORRECTOR_CACHE: "OrderedDict[Tuple[str, Tuple[str, ...]], SpellCorrector]" = OrderedDict()
+_CORRECTOR_CACHE_LOCK = threading.Lock()
+
+
+def spell_corrector_for(context: Mapping[str, Any], keywords: Tuple[str, ...],
+                        kb_version: Optional[str] = None) -> SpellCorrector:
+    """
+    Return the corrector for a knowledge base and keyword set, building it on first use.
+
+    Args:
+        context: Knowledge base whose area and location names join the keywords
+        keywords: Words of the query vocabulary
+        kb_version: Version of the knowledge base; correctors are cached per version, and built afresh when None
+    """
+    key = (kb_version, keywords)
+    if kb_version is not None:
+        cached = _CORRECTOR_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+    corrector = SpellCorrector.from_words(keywords, place_name_words(context))
+    if kb_version is not None:
+        with _CORRECTOR_CACHE_LOCK:
+            _CORRECTOR_CACHE[key] = corrector
+            while len(_CORRECTOR_CACHE) > CORRECTOR_CACHE_SIZE:
+                _CORRECTOR_CACHE.popitem(last=False)
+    return corrector
@@ -0,0 +1,174 @@
+"""
+Tokenizer for the Udaipur Local Guide AI.
+
+Splits a query into word, number and time-of-day tokens with one
+precompiled regular expression. Words are lower-cased and reduced to a
+light lemma: suffixes such as "-s", "-ed", "-ing", "-al" and "-ation" are
+removed only when the result is a word of the vocabulary ("palaces?" ->
+"palace", "crowded" -> "crowd", "cultural" -> "culture",
+"transportation" -> "transport"), and otherwise only plurals are folded.
+English stop words are dropped unless they are vocabulary terms.
+
+Clock times ("5pm", "5:30 p.m.", "17:00") become one time token carrying
+minutes after midnight, and numbers become number tokens. Every token
+carries its id in the vocabulary (UNKNOWN_ID for words outside it), so
+matchers compare integers instead of re-scanning the query text.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+UNKNOWN_ID = 0
+TIME_TERM = "<time>"
+NUMBER_TERM = "<number>"
+
+WORD = "word"
+NUMBER = "number"
+TIME = "time"
+
+TOKEN_PATTERN = re.compile(
+    r"(?P<clock12>\b(?P<hour12>\d{1,2})(?::(?P<minute12>\d{2}))?\s*(?P<meridiem>am\b|pm\b|a\.m\.|p\.m\.))"
+    r"|(?P<clock24>\b(?P<hour24>[01]?\d|2[0-3]):(?P<minute24>[0-5]\d)\b)"
+    r"|(?P<number>\d+(?:\.\d+)?)"
+    r"|(?P<word>[^\W\d_]+(?:'[^\W\d_]+)?)",
+    re.IGNORECASE
+)
+
+STOP_WORDS = frozenset("""
+a about above after again all am an and any are as at be been being below between both but by can could
+did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just let me more most my no nor not of off on once only or other our ours
+out over own same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who whom why will with
+would you your yours
+""".split())
+
+# Irregular forms and spellings the suffix rules cannot reach
+LEMMA_EXCEPTIONS = {
+    "tonight": "night",
+    "behaviour": "behavior",
+    "behaviours": "behavior",
+    "ate": "eat",
+    "eaten": "eat",
+    "spoke": "speak",
+    "spoken": "speak",
+}
+
+# (suffix, endings to put back), longest suffixes first; a candidate is used only if it is in the vocabulary
+SUFFIX_RULES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("ations", ("", "e")), ("fully", ("",)), ("ation", ("", "e")), ("ings", ("", "e")), ("ness", ("",)),
+    ("ment", ("",)), ("ally", ("", "al")), ("ies", ("y",)), ("ied", ("y",)), ("ful", ("",)), ("ing", ("", "e")),
+    ("ers", ("", "e")), ("ors", ("",)), ("al", ("", "e")), ("ly", ("",)), ("er", ("", "e")), ("or", ("",)),
+    ("ed", ("", "e")), ("es", ("", "e")), ("s", ("",)),
+)
+MIN_STEM_LENGTH = 3
+LEMMA_CACHE_SIZE = 50000
+
+
+class Token(NamedTuple):
+    text: str
+    lemma: str
+    id: int
+    kind: str
+    # Minutes after midnight for time tokens, the value for number tokens
+    value: Optional[float] = None
+
+
+class Vocabulary:
+    """Dense integer ids for a fixed set of terms; id 0 is reserved for unknown words."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = ["<unknown>"]
+        self.ids: Dict[str, int] = {}
+        for term in [TIME_TERM, NUMBER_TERM] + list(terms):
+            term = term.lower()
+            if term not in self.ids:
+                self.ids[term] = len(self.terms)
+                self.terms.append(term)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.ids
+
+    def id(self, term: str) -> int:
+        return self.ids.get(term, UNKNOWN_ID)
+
+    def term(self, term_id: int) -> str:
+        return self.terms[term_id]
+
+
+def _clock_minutes(match: "re.Match") -> int:
+    if match.group("clock24"):
+        return int(match.group("hour24")) * 60 + int(match.group("minute24"))
+    hour, minute = int(match.group("hour12")), int(match.group("minute12") or 0)
+    if match.group("meridiem").lower().startswith("p") and hour != 12:
+        hour += 12
+    elif match.group("meridiem").lower().startswith("a") and hour == 12:
+        hour = 0
+    return (hour % 24) * 60 + minute
+
+
+class Tokenizer:
+    """Turns query text into lemmatized, vocabulary-indexed tokens."""
+
+    def __init__(self, vocabulary: Vocabulary, stop_words: Iterable[str] = STOP_WORDS):
+        self.vocabulary = vocabulary
+        # Vocabulary terms are never dropped, even when they are common English words
+        self.stop_words = frozenset(word for word in stop_words if word not in vocabulary)
+        self._time_id = vocabulary.id(TIME_TERM)
+        self._number_id = vocabulary.id(NUMBER_TERM)
+        self._lemmas: Dict[str, str] = {}
+
+    def lemma(self, word: str) -> str:
+        """The vocabulary form of a lower-case word, or the word with plurals folded if it has none."""
+        lemma = self._lemmas.get(word)
+        if lemma is None:
+            lemma = self._lemmatize(word)
+            if len(self._lemmas) >= LEMMA_CACHE_SIZE:
+                self._lemmas.clear()
+            self._lemmas[word] = lemma
+        return lemma
+
+    def _lemmatize(self, word: str) -> str:
+        vocabulary = self.vocabulary
+        if word in vocabulary:
+            return word
+        if word in LEMMA_EXCEPTIONS:
+            return LEMMA_EXCEPTIONS[word]
+        for suffix, endings in SUFFIX_RULES:
+            if not word.endswith(suffix) or len(word) - len(suffix) < MIN_STEM_LENGTH:
+                continue
+            stem = word[:-len(suffix)]
+            for ending in endings:
+                if stem + ending in vocabulary:
+                    return stem + ending
+            # "shopping" -> "shop"
+            if len(stem) > MIN_STEM_LENGTH and stem[-1] == stem[-2] and stem[:-1] in vocabulary:
+                return stem[:-1]
+        if len(word) > 4 and word.endswith("ies"):
+            return word[:-3] + "y"
+        if word.endswith(("sses", "shes", "ches", "xes")):
+            return word[:-2]
+        if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+            return word[:-1]
+        return word
+
+    def tokenize(self, text: str) -> List[Token]:
+        """Tokens of text in order, without stop words."""
+        tokens: List[Token] = []
+        for match in TOKEN_PATTERN.finditer(text):
+            if match.group("word"):
+                word = match.group("word").lower()
+                if word in self.stop_words:
+                    continue
+                lemma = self.lemma(word)
+                tokens.append(Token(match.group(0), lemma, self.vocabulary.id(lemma), WORD))
+            elif match.group("number"):
+                tokens.append(Token(match.group(0), NUMBER_TERM, self._number_id, NUMBER,
+                                    float(match.group("number"))))
+            else:
+                tokens.append(Token(match.group(0), TIME_TERM, self._time_id, TIME, _clock_minutes(match)))
+        return tokens
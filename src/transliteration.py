@@ -0,0 +1,243 @@
+"""
+Transliteration support for Devanagari and romanized Hindi/Mewari queries.
+
+Maps Devanagari script and common Hinglish spellings ("khaana", "jheel",
+"dal bati") onto the English keyword and location vocabulary used by
+QueryProcessor. The spelling index is compiled once at import time so that
+resolving a token is a single dictionary lookup.
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+# Independent vowels
+DEVANAGARI_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ii", "उ": "u", "ऊ": "uu", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऑ": "o",
+}
+
+# Dependent vowel signs (matras)
+DEVANAGARI_MATRAS = {
+    "ा": "aa", "ि": "i", "ी": "ii", "ु": "u", "ू": "uu", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॉ": "o",
+}
+
+DEVANAGARI_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "ळ": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+    # Precomposed nukta forms
+    "क़": "q", "ख़": "kh", "ग़": "g", "ज़": "z", "ड़": "r", "ढ़": "rh", "फ़": "f", "य़": "y",
+}
+
+# Consonant + combining nukta (U+093C) spellings
+DEVANAGARI_NUKTA_FORMS = {
+    "क": "q", "ख": "kh", "ग": "g", "ज": "z", "ड": "r", "ढ": "rh", "फ": "f", "य": "y",
+}
+
+# Signs that close the current syllable
+DEVANAGARI_CODAS = {"ं": "n", "ँ": "n", "ः": "h"}
+
+VIRAMA = "्"
+NUKTA = "़"
+
+DEVANAGARI_DIGITS = {chr(0x0966 + i): str(i) for i in range(10)}
+
+TOKEN_PUNCTUATION = ".,!?;:\"'()[]{}।॥"
+
+# Canonical vocabulary term -> spellings that should resolve to it.
+# Entries may be Devanagari or romanized; they are normalized when the index
+# is compiled, so only distinct spellings need to be listed. Spellings that
+# are also everyday Hinglish words are left out, since they would add a
+# category to queries that never mention it ("bada" is "big", not "vada").
+VARIANT_SPELLINGS: Dict[str, List[str]] = {
+    # Language
+    "khamma": ["खम्मा", "khama", "khammaa"],
+    "ghani": ["घणी", "घनी", "ghanni", "ghanee"],
+    "greeting": ["namaste", "नमस्ते", "namaskar", "नमस्कार", "pranam", "प्रणाम"],
+    "phrase": ["matlab", "मतलब", "arth", "अर्थ", "shabd", "शब्द"],
+    "say": ["bolna", "बोलना", "bolte", "बोलते", "bolo", "बोलो", "kehte", "कहते"],
+    "language": ["bhasha", "भाषा", "boli", "बोली"],
+    "hindi": ["हिंदी", "हिन्दी"],
+    "mewari": ["मेवाड़ी", "mewadi", "mevari"],
+    # Food
+    "food": ["khana", "खाना", "khane", "खाने", "bhojan", "भोजन", "nashta", "नाश्ता"],
+    "eat": ["khao", "खाओ", "khayen", "खाएं", "khaye", "खाए"],
+    "restaurant": ["dhaba", "ढाबा"],
+    "dal": ["दाल", "daal"],
+    "baati": ["बाटी", "bati", "baatti"],
+    "churma": ["चूरमा"],
+    "kachori": ["कचौरी", "kachauri", "kachodi"],
+    "mirchi": ["मिर्ची", "मिर्च", "mirch"],
+    "vada": ["वड़ा", "वडा", "wada"],
+    "ghewar": ["घेवर", "ghevar"],
+    # Tourism
+    "visit": ["ghoomna", "घूमना", "ghumne", "घूमने", "dekhne", "देखने"],
+    "palace": ["mahal", "महल", "पैलेस"],
+    "lake": ["jheel", "झील"],
+    "crowd": ["bheed", "भीड़", "bhid"],
+    "timing": ["samay", "समय", "waqt", "वक्त", "vakt"],
+    "traffic": ["yatayat", "यातायात", "जाम"],
+    "season": ["mausam", "मौसम"],
+    # Culture
+    "temple": ["mandir", "मंदिर", "मन्दिर"],
+    "culture": ["sanskriti", "संस्कृति"],
+    "tradition": ["parampara", "परंपरा", "परम्परा"],
+    "custom": ["riwaj", "रिवाज", "rivaaj"],
+    "respect": ["samman", "सम्मान", "izzat", "इज़्ज़त", "इज्जत"],
+    "dress": ["kapde", "कपड़े", "kapade", "poshak", "पोशाक", "sari", "saree", "साड़ी", "poshaak"],
+    # Locations
+    "surajpole": ["सूरजपोल", "surajpol", "sooraj pol"],
+    "hathipole": ["हाथीपोल", "hathipol", "haathipol"],
+    "city": ["सिटी"],
+    "lake pichola": ["पिछोला", "picchola"],
+    "fateh": ["फतेह", "फ़तेह", "fatah"],
+    "sagar": ["सागर"],
+    "sajjangarh": ["सज्जनगढ़", "सज्जनगढ", "sajangarh", "sajjangad"],
+    "chetak": ["चेतक"],
+    "circle": ["सर्कल"],
+}
+
+
+def _is_devanagari(char: str) -> bool:
+    return "ऀ" <= char <= "ॿ"
+
+
+def transliterate(word: str) -> str:
+    """
+    Transliterate a Devanagari word into a loose Latin spelling.
+
+    Consonants carry an inherent 'a' which is dropped at the end of the word
+    and in the usual VC_CV positions (मतलब -> matlab), which is close enough
+    to how the same words are typed in Hinglish for the normalized index to
+    line them up. Non-Devanagari characters are passed through unchanged.
+    """
+    # Each syllable is [onset, vowel, coda, has_inherent_vowel]
+    syllables: List[List] = []
+    chars = unicodedata.normalize("NFC", word)
+    i = 0
+    while i < len(chars):
+        char = chars[i]
+        if char in DEVANAGARI_CONSONANTS:
+            onset = DEVANAGARI_CONSONANTS[char]
+            if i + 1 < len(chars) and chars[i + 1] == NUKTA:
+                onset = DEVANAGARI_NUKTA_FORMS.get(char, onset)
+                i += 1
+            following = chars[i + 1] if i + 1 < len(chars) else ""
+            if following == VIRAMA:
+                syllables.append([onset, "", "", False])
+                i += 1
+            elif following in DEVANAGARI_MATRAS:
+                syllables.append([onset, DEVANAGARI_MATRAS[following], "", False])
+                i += 1
+            else:
+                syllables.append([onset, "a", "", True])
+        elif char in DEVANAGARI_VOWELS:
+            syllables.append(["", DEVANAGARI_VOWELS[char], "", False])
+        elif char in DEVANAGARI_CODAS:
+            if syllables:
+                syllables[-1][2] += DEVANAGARI_CODAS[char]
+        elif char in DEVANAGARI_DIGITS:
+            syllables.append(["", DEVANAGARI_DIGITS[char], "", False])
+        elif not _is_devanagari(char):
+            syllables.append(["", char, "", False])
+        i += 1
+
+    if len(syllables) > 1 and syllables[-1][3] and not syllables[-1][2]:
+        syllables[-1][1] = ""
+
+    for index in range(len(syllables) - 2, 0, -1):
+        current, previous, following = syllables[index], syllables[index - 1], syllables[index + 1]
+        if (current[3] and not current[2]
+                and previous[1] and not previous[2]
+                and following[0] and following[1]):
+            current[1] = ""
+
+    return "".join(onset + vowel + coda for onset, vowel, coda, _ in syllables)
+
+
+def normalize_spelling(token: str) -> str:
+    """
+    Reduce a token to the key used by the spelling index.
+
+    Devanagari is transliterated first; Latin spellings are then folded so
+    that common romanization variants coincide (aa/a, ee/i, oo/u, w/v, ph/f,
+    doubled letters).
+    """
+    if any(_is_devanagari(char) for char in token):
+        token = transliterate(token)
+    token = unicodedata.normalize("NFKD", token.lower())
+    token = "".join(char for char in token if not unicodedata.combining(char))
+    token = token.replace("ee", "i").replace("oo", "u").replace("w", "v").replace("ph", "f")
+
+    collapsed = []
+    for char in token:
+        if not collapsed or collapsed[-1] != char:
+            collapsed.append(char)
+    return "".join(collapsed)
+
+
+class Transliterator:
+    """Resolves Devanagari and romanized Hindi/Mewari tokens to English vocabulary."""
+
+    def __init__(self, variants: Optional[Dict[str, List[str]]] = None):
+        self.variants = VARIANT_SPELLINGS if variants is None else variants
+        self.exact_index, self.normalized_index = self._compile_index(self.variants)
+        self.resolve_token = lru_cache(maxsize=4096)(self._resolve_token)
+
+    def _compile_index(self, variants: Dict[str, List[str]]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Build the exact and normalized spelling -> canonical term indexes."""
+        exact_index: Dict[str, str] = {}
+        normalized_index: Dict[str, str] = {}
+
+        for canonical, spellings in variants.items():
+            for spelling in [canonical] + list(spellings):
+                exact_index[spelling.lower()] = canonical
+                if " " in spelling:
+                    continue
+                key = normalize_spelling(spelling)
+                existing = normalized_index.get(key)
+                if existing is not None and existing != canonical:
+                    raise ValueError(
+                        f"Spelling '{spelling}' for '{canonical}' collides with '{existing}'"
+                    )
+                normalized_index[key] = canonical
+
+        return exact_index, normalized_index
+
+    def _resolve_token(self, token: str) -> Optional[str]:
+        """Return the canonical vocabulary term for a single token, if known."""
+        token = token.strip(TOKEN_PUNCTUATION)
+        if not token:
+            return None
+        canonical = self.exact_index.get(token)
+        if canonical is None:
+            canonical = self.normalized_index.get(normalize_spelling(token))
+        return canonical
+
+    def normalize_query(self, query: str) -> str:
+        """
+        Rewrite a lowercased query so known multilingual tokens use English vocabulary.
+
+        Tokens that already match the English vocabulary, or that are not
+        recognized at all, are left exactly as typed.
+        """
+        tokens = query.split()
+        rewritten = []
+        for token in tokens:
+            canonical = self.resolve_token(token)
+            if canonical is None or canonical == token.strip(TOKEN_PUNCTUATION):
+                rewritten.append(token)
+            else:
+                rewritten.append(canonical)
+        return " ".join(rewritten)
+
+
+# Compiled once at startup and shared by every QueryProcessor
+DEFAULT_TRANSLITERATOR = Transliterator()
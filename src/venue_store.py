@@ -0,0 +1,393 @@
+"""
+Venue database for the Udaipur Local Guide AI.
+
+Restaurants and food stalls (cuisine, veg/non-veg, price band, rating,
+area, location, opening hours and dishes served) are kept in an indexed
+SQLite database so food questions can be answered with filtered top-k
+queries over thousands of venues. Venues are loaded with a streaming
+importer that reads CSV or JSONL one row at a time and commits in batches:
+
+    python -m src.venue_store import .kiro/venues.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.opening_hours import OpeningHoursIndex
+
+
+DEFAULT_DB_PATH = ".data/venues.db"
+DEFAULT_IMPORT_BATCH_SIZE = 1000
+DEFAULT_TOP_K = 5
+
+# Dishes in a CSV cell are separated by semicolons
+CSV_LIST_SEPARATOR = ";"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS venues (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL COLLATE NOCASE,
+    area TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    cuisine TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    veg INTEGER NOT NULL DEFAULT 0,
+    price_band INTEGER NOT NULL DEFAULT 2,
+    rating REAL NOT NULL DEFAULT 0,
+    lat REAL,
+    lon REAL,
+    hours TEXT NOT NULL DEFAULT '',
+    UNIQUE (name, area)
+);
+CREATE INDEX IF NOT EXISTS idx_venues_rating ON venues (rating DESC);
+CREATE INDEX IF NOT EXISTS idx_venues_area ON venues (area, rating DESC);
+CREATE INDEX IF NOT EXISTS idx_venues_cuisine ON venues (cuisine, rating DESC);
+CREATE TABLE IF NOT EXISTS venue_dishes (
+    dish TEXT NOT NULL COLLATE NOCASE,
+    venue_id INTEGER NOT NULL REFERENCES venues (id) ON DELETE CASCADE,
+    PRIMARY KEY (dish, venue_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_venue_dishes_venue ON venue_dishes (venue_id);
+"""
+
+UPSERT_VENUE = """
+INSERT INTO venues (name, area, cuisine, veg, price_band, rating, lat, lon, hours)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name, area) DO UPDATE SET
+    cuisine = excluded.cuisine, veg = excluded.veg, price_band = excluded.price_band,
+    rating = excluded.rating, lat = excluded.lat, lon = excluded.lon, hours = excluded.hours
+"""
+DELETE_DISHES = "DELETE FROM venue_dishes WHERE venue_id = (SELECT id FROM venues WHERE name = ? AND area = ?)"
+INSERT_DISH = """
+INSERT OR IGNORE INTO venue_dishes (dish, venue_id)
+SELECT ?, id FROM venues WHERE name = ? AND area = ?
+"""
+
+TRUE_WORDS = {"1", "true", "yes", "y", "veg", "vegetarian", "pure veg"}
+FALSE_WORDS = {"", "0", "false", "no", "n", "non-veg", "nonveg", "non veg"}
+
+
+class Venue(NamedTuple):
+    id: int
+    name: str
+    area: str
+    cuisine: str
+    veg: bool
+    price_band: int
+    rating: float
+    latitude: Optional[float]
+    longitude: Optional[float]
+    hours: str
+    dishes: Tuple[str, ...]
+
+
+class ImportResult(NamedTuple):
+    imported: int
+    skipped: int
+    seconds: float
+
+
+def _parse_bool(value: Any) -> int:
+    if isinstance(value, bool):
+        return int(value)
+    text = str(value if value is not None else "").strip().lower()
+    if text in TRUE_WORDS:
+        return 1
+    if text in FALSE_WORDS:
+        return 0
+    raise ValueError(f"Unrecognised veg value '{value}'")
+
+
+def _parse_price_band(value: Any) -> int:
+    """Price band 1 (cheapest) to 4; accepts a number or a run of currency symbols."""
+    text = str(value if value is not None else "").strip()
+    if not text:
+        return 2
+    band = int(text) if text.isdigit() else len(text)
+    if not 1 <= band <= 4:
+        raise ValueError(f"Price band '{value}' is outside 1-4")
+    return band
+
+
+def _parse_optional_float(value: Any) -> Optional[float]:
+    if value is None or str(value).strip() == "":
+        return None
+    return float(value)
+
+
+def _parse_dishes(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(dish).strip() for dish in value if str(dish).strip()]
+    return [dish.strip() for dish in str(value or "").split(CSV_LIST_SEPARATOR) if dish.strip()]
+
+
+def parse_venue_record(record: Dict[str, Any]) -> Tuple[Tuple[Any, ...], List[str]]:
+    """
+    Validate one imported record.
+
+    Returns:
+        The venues row values and the dishes served
+
+    Raises:
+        ValueError: If a required field is missing or a value cannot be parsed
+    """
+    name = str(record.get("name") or "").strip()
+    if not name:
+        raise ValueError("Venue has no name")
+    row = (
+        name,
+        str(record.get("area") or "").strip(),
+        str(record.get("cuisine") or "").strip(),
+        _parse_bool(record.get("veg")),
+        _parse_price_band(record.get("price_band")),
+        float(record.get("rating") or 0),
+        _parse_optional_float(record.get("lat")),
+        _parse_optional_float(record.get("lon")),
+        str(record.get("hours") or "").strip(),
+    )
+    return row, _parse_dishes(record.get("dishes"))
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream records from a .csv or .jsonl file without reading it all into memory."""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        yield {}
+    else:
+        with open(path, newline="", encoding="utf-8") as handle:
+            yield from csv.DictReader(handle)
+
+
+class VenueStore:
+    """SQLite-backed venue database with filtered top-k queries."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self._local = threading.local()
+        # (data signature when built, value); rebuilt when any connection commits
+        self._vocabulary: Optional[Tuple[Tuple, Tuple[Tuple[str, ...], Tuple[str, ...]]]] = None
+        self._opening_hours: Optional[Tuple[Tuple, Tuple[np.ndarray, OpeningHoursIndex]]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _data_signature(self) -> Tuple:
+        """
+        Size and modification time of the database file and its write-ahead
+        log. Every commit, from this process or another, changes them.
+        """
+        signature = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def __len__(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM venues").fetchone()[0]
+
+    def import_records(self, records: Iterable[Dict[str, Any]],
+                       batch_size: int = DEFAULT_IMPORT_BATCH_SIZE) -> ImportResult:
+        """
+        Insert or update venues, committing every batch_size records.
+
+        Records that fail validation are skipped and counted. A venue is
+        identified by (name, area); importing it again replaces its details
+        and dishes.
+        """
+        started = time.perf_counter()
+        imported = skipped = 0
+        batch: List[Tuple[Tuple[Any, ...], List[str]]] = []
+        connection = self._connect()
+        try:
+            for record in records:
+                try:
+                    batch.append(parse_venue_record(record))
+                except (ValueError, TypeError, AttributeError):
+                    skipped += 1
+                    continue
+                if len(batch) >= batch_size:
+                    self._write_batch(connection, batch)
+                    imported += len(batch)
+                    batch = []
+            if batch:
+                self._write_batch(connection, batch)
+                imported += len(batch)
+        finally:
+            connection.close()
+        self._vocabulary = None
+        self._opening_hours = None
+        return ImportResult(imported, skipped, time.perf_counter() - started)
+
+    def import_file(self, path: str, batch_size: int = DEFAULT_IMPORT_BATCH_SIZE) -> ImportResult:
+        """Stream a CSV or JSONL file of venues into the store."""
+        return self.import_records(read_records(path), batch_size)
+
+    @staticmethod
+    def _write_batch(connection: sqlite3.Connection, batch: List[Tuple[Tuple[Any, ...], List[str]]]) -> None:
+        with connection:
+            connection.executemany(UPSERT_VENUE, [row for row, _ in batch])
+            connection.executemany(DELETE_DISHES, [(row[0], row[1]) for row, _ in batch])
+            connection.executemany(INSERT_DISH, [(dish, row[0], row[1]) for row, dishes in batch for dish in dishes])
+
+    def vocabulary(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Every distinct (dish, cuisine) name in the store, for matching against queries."""
+        # Taken before reading, so a commit made meanwhile rebuilds it on the next call
+        signature = self._data_signature()
+        cached = self._vocabulary
+        if cached is None or cached[0] != signature:
+            connection = self._reader()
+            dishes = tuple(row[0] for row in connection.execute("SELECT DISTINCT dish FROM venue_dishes"))
+            cuisines = tuple(row[0] for row in connection.execute("SELECT DISTINCT cuisine FROM venues WHERE cuisine != ''"))
+            cached = self._vocabulary = (signature, (dishes, cuisines))
+        return cached[1]
+
+    def opening_hours(self) -> Tuple[np.ndarray, OpeningHoursIndex]:
+        """Venue ids and the opening-hours index over them, compiled once per version of the database."""
+        signature = self._data_signature()
+        cached = self._opening_hours
+        if cached is None or cached[0] != signature:
+            rows = self._reader().execute("SELECT id, name, hours FROM venues ORDER BY id").fetchall()
+            index = OpeningHoursIndex.from_hours([row[1] for row in rows], [row[2] for row in rows])
+            cached = self._opening_hours = (signature, (np.array([row[0] for row in rows], dtype=np.int64), index))
+        return cached[1]
+
+    def open_venue_ids(self, when: datetime) -> List[int]:
+        """Ids of every venue open at when, from one stabbing query over the opening-hours index."""
+        ids, index = self.opening_hours()
+        return ids[index.open_mask(when)].tolist()
+
+    def top_venues(self, area: Optional[str] = None, dish: Optional[str] = None, cuisine: Optional[str] = None,
+                   veg: Optional[bool] = None, max_price_band: Optional[int] = None,
+                   limit: int = DEFAULT_TOP_K, open_at: Optional[datetime] = None) -> List[Venue]:
+        """
+        Best-rated venues matching every given filter.
+
+        Args:
+            area: Only venues in this area (case-insensitive)
+            dish: Only venues serving this dish (case-insensitive)
+            cuisine: Only venues of this cuisine (case-insensitive)
+            veg: True for vegetarian-only venues, False for those serving non-veg
+            max_price_band: Only venues at or below this price band
+            limit: Maximum number of venues to return
+            open_at: Only venues open at this local time
+
+        Returns:
+            Venues ordered by rating, highest first
+        """
+        joins, conditions, parameters = "", [], []
+        if dish:
+            joins = " JOIN venue_dishes d ON d.venue_id = v.id AND d.dish = ?"
+            parameters.append(dish)
+        if area:
+            conditions.append("v.area = ?")
+            parameters.append(area)
+        if cuisine:
+            conditions.append("v.cuisine = ?")
+            parameters.append(cuisine)
+        if veg is not None:
+            conditions.append("v.veg = ?")
+            parameters.append(int(veg))
+        if max_price_band is not None:
+            conditions.append("v.price_band <= ?")
+            parameters.append(max_price_band)
+        if open_at is not None:
+            conditions.append("v.id IN (SELECT value FROM json_each(?))")
+            parameters.append(json.dumps(self.open_venue_ids(open_at)))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        connection = self._reader()
+        rows = connection.execute(
+            "SELECT v.id, v.name, v.area, v.cuisine, v.veg, v.price_band, v.rating, v.lat, v.lon, v.hours"
+            f" FROM venues v{joins}{where} ORDER BY v.rating DESC, v.name LIMIT ?",
+            parameters + [limit]
+        ).fetchall()
+        if not rows:
+            return []
+
+        ids = [row[0] for row in rows]
+        dishes: Dict[int, List[str]] = {venue_id: [] for venue_id in ids}
+        placeholders = ",".join("?" * len(ids))
+        for venue_id, dish_name in connection.execute(
+                f"SELECT venue_id, dish FROM venue_dishes WHERE venue_id IN ({placeholders}) ORDER BY dish", ids):
+            dishes[venue_id].append(dish_name)
+        return [Venue(row[0], row[1], row[2], row[3], bool(row[4]), row[5], row[6], row[7], row[8], row[9],
+                      tuple(dishes[row[0]])) for row in rows]
+
+
+_DEFAULT_STORES: Dict[str, VenueStore] = {}
+_DEFAULT_STORES_LOCK = threading.Lock()
+
+
+def default_venue_store(db_path: str = DEFAULT_DB_PATH) -> Optional[VenueStore]:
+    """Return the shared store for db_path, or None if no venues have been imported there."""
+    store = _DEFAULT_STORES.get(db_path)
+    if store is not None:
+        return store
+    if not os.path.exists(db_path):
+        return None
+    with _DEFAULT_STORES_LOCK:
+        store = _DEFAULT_STORES.get(db_path)
+        if store is None:
+            store = VenueStore(db_path)
+            _DEFAULT_STORES[db_path] = store
+    return store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the venue database.")
+    parser.add_argument("command", choices=["import"])
+    parser.add_argument("path", help="CSV or JSONL file of venues")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="venue database file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    store = VenueStore(args.db)
+    result = store.import_file(args.path, args.batch_size)
+    print(f"Imported {result.imported} venues ({result.skipped} skipped) into {args.db} "
+          f"in {result.seconds:.2f}s; {len(store)} venues in total")
+
+
+if __name__ == "__main__":
+    main()
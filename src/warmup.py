@@ -0,0 +1,234 @@
+"""
+Startup warm-up and readiness for the Udaipur Local Guide AI.
+
+A fresh process pays for parsing product.md, loading the intent model and
+building the answer table, geo index, opening-hours index and crowd
+forecast, all on its first questions. warm_up() does that work up front:
+it publishes the knowledge base snapshot, builds every derived index, and
+answers the Streamlit example questions and the most frequently asked
+questions from a top-N query file. Each step is timed, and a failing step is
+recorded and skipped, so one missing optional file cannot stall startup.
+The readiness flag is set only when every step has run.
+
+Warm-up answers go straight to the engine. They are not counted in the
+query log, rate limits or conversation state.
+
+Run the warm-up and print its step timings, or rebuild the top-N file from
+the query log, with:
+
+    python -m src.warmup run
+    python -m src.warmup top -n 100
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from src.context_loader import ContextLoader
+from src.crowd_forecast import CrowdForecast
+from src.geo_index import geo_index_for
+from src.intent_classifier import default_classifier
+from src.opening_hours import opening_hours_for
+from src.query_log import DEFAULT_LOG_PATH
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+
+
+DEFAULT_TOP_QUERIES_PATH = ".kiro/top_queries.txt"
+DEFAULT_TOP_N = 100
+
+# The example buttons on the Streamlit page, which many first visitors press
+EXAMPLE_QUERIES = [
+    "What does Khamma Ghani mean?",
+    "Best food in Surajpole area?",
+    "When to visit City Palace to avoid crowds?",
+    "What is Dal Baati Churma?",
+    "Transportation to heritage areas?",
+    "Temple etiquette in Udaipur?",
+    "Peak season timing for tourists?",
+    "Local greeting customs?"
+]
+
+
+class WarmupStep(NamedTuple):
+    name: str
+    seconds: float
+    detail: str
+    error: Optional[str] = None
+
+
+class WarmupReport(NamedTuple):
+    steps: List[WarmupStep]
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return all(step.error is None for step in self.steps)
+
+    def format(self) -> str:
+        lines = [f"{step.name:<16} {step.seconds * 1000:9.1f} ms  "
+                 f"{step.detail if step.error is None else 'FAILED: ' + step.error}" for step in self.steps]
+        lines.append(f"{'total':<16} {self.seconds * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+class Readiness:
+    """Set once warm-up has finished; holds the warm-up report."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.report: Optional[WarmupReport] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until ready or timeout seconds have passed; returns whether ready."""
+        return self._event.wait(timeout)
+
+    def mark_ready(self, report: WarmupReport) -> None:
+        self.report = report
+        self._event.set()
+
+
+READINESS = Readiness()
+_START_LOCK = threading.Lock()
+_started: Optional[threading.Thread] = None
+
+
+def load_top_queries(path: str = DEFAULT_TOP_QUERIES_PATH, top_n: int = DEFAULT_TOP_N) -> List[str]:
+    """The first top_n queries of a one-query-per-line file, skipping blanks and # comments; [] if missing."""
+    if top_n <= 0 or not os.path.exists(path):
+        return []
+    queries: List[str] = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                queries.append(line)
+                if len(queries) == top_n:
+                    break
+    return queries
+
+
+def top_queries_from_log(log_path: str = DEFAULT_LOG_PATH, top_n: int = DEFAULT_TOP_N) -> List[str]:
+    """The top_n most frequent answered queries in a query-event log, compared case-insensitively."""
+    counts: Counter = Counter()
+    spellings: Dict[str, str] = {}
+    with open(log_path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            query = event.get("query")
+            if not isinstance(query, str) or not str(event.get("branch", "")).startswith("answer:"):
+                continue
+            key = " ".join(query.lower().split())
+            counts[key] += 1
+            spellings.setdefault(key, query.strip())
+    return [spellings[key] for key, _ in counts.most_common(top_n)]
+
+
+def warm_up(loader: Optional[ContextLoader] = None, top_queries_path: str = DEFAULT_TOP_QUERIES_PATH,
+            top_n: int = DEFAULT_TOP_N, readiness: Optional[Readiness] = None) -> WarmupReport:
+    """
+    Preload the knowledge base, build its indexes and answer the common questions once.
+
+    Args:
+        loader: Context loader to warm (defaults to the shared product.md cache)
+        top_queries_path: File of frequently asked questions, most frequent first
+        top_n: How many of those questions to answer
+        readiness: Flag to set when done (defaults to READINESS)
+
+    Returns:
+        The time taken by each step
+    """
+    loader = loader or ContextLoader()
+    steps: List[WarmupStep] = []
+    started = time.perf_counter()
+    state: Dict[str, object] = {}
+
+    def step(name: str, run: Callable[[], str]) -> None:
+        step_started = time.perf_counter()
+        try:
+            detail, error = run(), None
+        except Exception as e:
+            detail, error = "", f"{type(e).__name__}: {e}"
+        steps.append(WarmupStep(name, time.perf_counter() - step_started, detail, error))
+
+    def knowledge_base() -> str:
+        state["context"] = loader.load_context()
+        return f"version {loader.kb_version}"
+
+    def engine() -> str:
+        state["processor"], state["generator"] = QueryProcessor(), ResponseGenerator()
+        return "intent model loaded" if default_classifier() is not None else "keyword rules only (no intent model)"
+
+    def answer_table() -> str:
+        return f"{len(state['generator'].answer_table(state['context']))} answers"
+
+    def answer(queries: Sequence[str]) -> Callable[[], str]:
+        def run() -> str:
+            processor, generator, context = state["processor"], state["generator"], state["context"]
+            for intent in processor.process_queries(list(queries)):
+                generator.generate_response(intent, context)
+            return f"{len(queries)} queries"
+        return run
+
+    step("knowledge_base", knowledge_base)
+    step("engine", engine)
+    if "context" in state and "generator" in state:
+        step("answer_table", answer_table)
+        step("geo_index", lambda: f"{len(geo_index_for(state['context']).places)} places")
+        step("opening_hours", lambda: f"{len(opening_hours_for(state['context']).names)} places")
+        step("crowd_forecast", lambda: f"{len(CrowdForecast.from_context(state['context']).locations)} locations")
+        step("example_queries", answer(EXAMPLE_QUERIES))
+        step("top_queries", answer(load_top_queries(top_queries_path, top_n)))
+
+    report = WarmupReport(steps, time.perf_counter() - started)
+    (readiness or READINESS).mark_ready(report)
+    return report
+
+
+def start_warm_up(**kwargs) -> threading.Thread:
+    """Run warm_up once per process on a background thread; later calls return the same thread."""
+    global _started
+    with _START_LOCK:
+        if _started is None:
+            _started = threading.Thread(target=warm_up, kwargs=kwargs, name="guide-warmup", daemon=True)
+            _started.start()
+    return _started
+
+
+def _write_queries(path: str, queries: Iterable[str]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("# Most frequently asked questions, most frequent first (used by the startup warm-up)\n")
+        for query in queries:
+            handle.write(query + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Warm up the guide, or rebuild the top-N warm-up query file.")
+    parser.add_argument("command", choices=["run", "top"])
+    parser.add_argument("-n", "--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--queries", default=DEFAULT_TOP_QUERIES_PATH, help="top-N query file")
+    parser.add_argument("--log", default=DEFAULT_LOG_PATH, help="query-event log to count (top only)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        print(warm_up(top_queries_path=args.queries, top_n=args.top_n).format())
+    else:
+        queries = top_queries_from_log(args.log, args.top_n)
+        _write_queries(args.queries, queries)
+        print(f"Wrote {len(queries)} queries to {args.queries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Process-pool execution for the Udaipur Local Guide AI.
+
+Classification, itinerary search and response generation hold the GIL, so
+one process answers on one core. GuidePool spreads batches of queries over
+worker processes. The parent packs the current snapshot and the compiled
+arrays (the intent classifier's weights and the crowd forecast tensor) into
+one multiprocessing.shared_memory block. Workers attach to it by name and
+wrap the arrays as read-only NumPy views, so that numeric data exists once
+however many workers run. Only those arrays are shared without a copy: the
+snapshot is stored as compact JSON, and each worker thaws it into its own
+frozen context (it never opens or parses product.md), and builds its own
+answer table and geo and opening-hours indexes from it on first use. So
+every worker holds a copy of the knowledge base and those indexes, which is
+small next to the classifier and forecast arrays for a knowledge base the
+size of product.md.
+
+Workers are started with the "spawn" method, which behaves the same on
+every platform and is safe alongside the query log's writer thread. A pool
+serves the snapshot it was created with; create a new pool to pick up an
+edited knowledge base.
+
+Compare single-process and pool throughput with:
+
+    python -m src.worker_pool bench --processes 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.context_loader import ContextLoader, freeze, thaw
+from src.crowd_forecast import CrowdForecast, forecast_key, preload_forecast
+from src.intent_classifier import DEFAULT_TRAINING_PATH, IntentClassifier, default_classifier, load_training_file
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+
+
+DEFAULT_CHUNK_SIZE = 32
+
+# Every segment starts on a cache line so array views are aligned
+SEGMENT_ALIGNMENT = 64
+# The block starts with the byte length of the JSON header describing the segments
+LENGTH_PREFIX_BYTES = 8
+
+CONTEXT_SEGMENT = "context"
+CLASSIFIER_WEIGHTS_SEGMENT = "classifier_weights"
+CLASSIFIER_BIAS_SEGMENT = "classifier_bias"
+FORECAST_SEGMENT = "forecast_levels"
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // SEGMENT_ALIGNMENT) * SEGMENT_ALIGNMENT
+
+
+class SharedKnowledgeBase:
+    """A knowledge base snapshot and its compiled arrays packed into one shared memory block."""
+
+    def __init__(self, block: shared_memory.SharedMemory, header: Dict[str, Any], owner: bool):
+        self._block = block
+        self.header = header
+        # Only the creating process unlinks the block
+        self.owner = owner
+
+    @property
+    def name(self) -> str:
+        return self._block.name
+
+    @property
+    def size(self) -> int:
+        return self._block.size
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.header["metadata"]
+
+    @classmethod
+    def create(cls, context: Mapping, arrays: Dict[str, np.ndarray],
+               metadata: Optional[Dict[str, Any]] = None) -> "SharedKnowledgeBase":
+        """
+        Copy a context and named arrays into a new shared memory block.
+
+        Args:
+            context: Knowledge base snapshot (as returned by ContextLoader)
+            arrays: Compiled arrays to share, by name
+            metadata: JSON-serializable values workers need alongside the arrays
+        """
+        segments = {CONTEXT_SEGMENT: np.frombuffer(
+            json.dumps(thaw(context), ensure_ascii=False, separators=(",", ":")).encode("utf-8"), dtype=np.uint8)}
+        segments.update((name, np.ascontiguousarray(array)) for name, array in arrays.items())
+
+        layout, offset = {}, 0
+        for name, array in segments.items():
+            offset = _aligned(offset)
+            layout[name] = {"offset": offset, "shape": list(array.shape), "dtype": array.dtype.str}
+            offset += array.nbytes
+        header = {"segments": layout, "metadata": metadata or {}}
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _aligned(LENGTH_PREFIX_BYTES + len(header_bytes))
+
+        block = shared_memory.SharedMemory(create=True, size=max(data_start + offset, 1))
+        block.buf[:LENGTH_PREFIX_BYTES] = len(header_bytes).to_bytes(LENGTH_PREFIX_BYTES, "little")
+        block.buf[LENGTH_PREFIX_BYTES:LENGTH_PREFIX_BYTES + len(header_bytes)] = header_bytes
+        for name, array in segments.items():
+            start = data_start + layout[name]["offset"]
+            block.buf[start:start + array.nbytes] = array.tobytes()
+        header["data_start"] = data_start
+        return cls(block, header, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedKnowledgeBase":
+        """Map an existing block created by another process."""
+        # Spawned workers share their parent's resource tracker, so the block
+        # is still cleaned up exactly once, by the creator's close()
+        block = shared_memory.SharedMemory(name=name)
+        length = int.from_bytes(bytes(block.buf[:LENGTH_PREFIX_BYTES]), "little")
+        header = json.loads(bytes(block.buf[LENGTH_PREFIX_BYTES:LENGTH_PREFIX_BYTES + length]).decode("utf-8"))
+        header["data_start"] = _aligned(LENGTH_PREFIX_BYTES + length)
+        return cls(block, header, owner=False)
+
+    def has_array(self, name: str) -> bool:
+        return name in self.header["segments"]
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only view of a shared array; no data is copied."""
+        segment = self.header["segments"][name]
+        view = np.ndarray(tuple(segment["shape"]), dtype=np.dtype(segment["dtype"]), buffer=self._block.buf,
+                          offset=self.header["data_start"] + segment["offset"])
+        view.flags.writeable = False
+        return view
+
+    def context(self) -> Mapping:
+        """The knowledge base snapshot, frozen as ContextLoader returns it; a new copy in this process."""
+        return freeze(json.loads(self.array(CONTEXT_SEGMENT).tobytes().decode("utf-8")))
+
+    def close(self) -> None:
+        self._block.close()
+        if self.owner:
+            self._block.unlink()
+
+
+def share_knowledge_base(loader: Optional[ContextLoader] = None) -> SharedKnowledgeBase:
+    """Pack the current knowledge base snapshot and its compiled arrays into shared memory."""
+    loader = loader or ContextLoader()
+    snapshot = loader.snapshot()
+    arrays: Dict[str, np.ndarray] = {}
+    metadata: Dict[str, Any] = {"kb_version": snapshot.kb_version, "version": snapshot.version}
+
+    classifier = default_classifier()
+    if classifier is not None:
+        arrays[CLASSIFIER_WEIGHTS_SEGMENT] = classifier.weights
+        arrays[CLASSIFIER_BIAS_SEGMENT] = classifier.bias
+        metadata["classifier_labels"] = classifier.labels
+
+    forecast = CrowdForecast.from_context(snapshot.context)
+    arrays[FORECAST_SEGMENT] = forecast.levels
+    metadata["forecast_locations"] = forecast.locations
+    metadata["forecast_key"] = forecast_key(snapshot.context)
+    return SharedKnowledgeBase.create(snapshot.context, arrays, metadata)
+
+
+# Set in each worker by _init_worker: (shared block, context, processor, generator)
+_WORKER: Optional[Tuple[SharedKnowledgeBase, Mapping, QueryProcessor, ResponseGenerator]] = None
+
+
+def _init_worker(block_name: str) -> None:
+    global _WORKER
+    shared = SharedKnowledgeBase.attach(block_name)
+    metadata = shared.metadata
+    context = shared.context()
+
+    classifier = None
+    if shared.has_array(CLASSIFIER_WEIGHTS_SEGMENT):
+        classifier = IntentClassifier(metadata["classifier_labels"], shared.array(CLASSIFIER_WEIGHTS_SEGMENT),
+                                      shared.array(CLASSIFIER_BIAS_SEGMENT))
+    preload_forecast(metadata["forecast_key"],
+                     CrowdForecast(metadata["forecast_locations"], shared.array(FORECAST_SEGMENT)))
+    _WORKER = (shared, context, QueryProcessor(classifier, context, metadata["kb_version"]), ResponseGenerator())
+
+
+def _answer_batch(queries: Sequence[str]) -> List[str]:
+    _, context, processor, generator = _WORKER
+    return [generator.generate_response(intent, context) for intent in processor.process_queries(list(queries))]
+
+
+def _worker_status(_: Any) -> Dict[str, Any]:
+    """Where a worker's data lives, for tests and diagnostics."""
+    shared, context, processor, _ = _WORKER
+    forecast = CrowdForecast.from_context(context)
+    return {
+        "pid": os.getpid(),
+        "kb_version": shared.metadata["kb_version"],
+        "classifier_shared": processor.classifier is not None and not processor.classifier.weights.flags.owndata,
+        "forecast_shared": not forecast.levels.flags.owndata,
+    }
+
+
+class GuidePool:
+    """
+    Answers batches of queries on a pool of worker processes sharing one knowledge base.
+
+    Use as a context manager, or call close() to stop the workers and free
+    the shared block.
+    """
+
+    def __init__(self, processes: Optional[int] = None, loader: Optional[ContextLoader] = None):
+        self.shared = share_knowledge_base(loader)
+        self.processes = processes or os.cpu_count() or 1
+        try:
+            self._pool = multiprocessing.get_context("spawn").Pool(
+                self.processes, initializer=_init_worker, initargs=(self.shared.name,))
+        except Exception:
+            self.shared.close()
+            raise
+
+    def answer(self, queries: Sequence[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[str]:
+        """Answers for every query, in order; batches of chunk_size are classified together."""
+        chunks = [list(queries[start:start + chunk_size]) for start in range(0, len(queries), chunk_size)]
+        return [answer for batch in self._pool.map(_answer_batch, chunks) for answer in batch]
+
+    def worker_status(self) -> List[Dict[str, Any]]:
+        return self._pool.map(_worker_status, range(self.processes), chunksize=1)
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+        self.shared.close()
+
+    def __enter__(self) -> "GuidePool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _answer_in_process(queries: Sequence[str], chunk_size: int) -> List[str]:
+    context = ContextLoader().load_context()
+    processor, generator = QueryProcessor(), ResponseGenerator()
+    answers = []
+    for start in range(0, len(queries), chunk_size):
+        batch = list(queries[start:start + chunk_size])
+        answers.extend(generator.generate_response(intent, context) for intent in processor.process_queries(batch))
+    return answers
+
+
+def bench(processes: int, repeat: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """Compare single-process and pool throughput on the labeled training queries."""
+    texts, _ = load_training_file(DEFAULT_TRAINING_PATH)
+    queries = texts * repeat
+
+    _answer_in_process(queries[:chunk_size], chunk_size)
+    started = time.perf_counter()
+    expected = _answer_in_process(queries, chunk_size)
+    single = time.perf_counter() - started
+
+    with GuidePool(processes) as pool:
+        pool.answer(queries[:processes * chunk_size], chunk_size)
+        started = time.perf_counter()
+        answers = pool.answer(queries, chunk_size)
+        pooled = time.perf_counter() - started
+        shared_bytes = pool.shared.size
+
+    print(f"Queries: {len(queries)}; CPU cores: {os.cpu_count()}; shared block: {shared_bytes / 1024:.1f} KiB")
+    print(f"Single process:      {len(queries) / single:,.0f} queries/s")
+    print(f"Pool of {processes}:{' ' * max(1, 12 - len(str(processes)))}{len(queries) / pooled:,.0f} queries/s "
+          f"({single / pooled:.2f}x)")
+    print(f"Answers identical:   {answers == expected}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the process-pool execution mode.")
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=20, help="times to repeat the labeled query set")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    bench(args.processes, args.repeat, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
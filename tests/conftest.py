@@ -0,0 +1,14 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+from src.query_log import DEFAULT_QUERY_LOG
+
+
+@pytest.fixture(autouse=True, scope="session")
+def query_log_in_tmp_path(tmp_path_factory):
+    """Write the query events of guide calls made by tests to a temporary file, not .data/logs."""
+    DEFAULT_QUERY_LOG.path = str(tmp_path_factory.mktemp("logs") / "query_events.jsonl")
+    yield
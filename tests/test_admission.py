@@ -0,0 +1,98 @@
+"""
+Unit tests for admission control and load shedding.
+"""
+
+import threading
+
+import pytest
+
+import app
+from src.admission import (
+    ADMITTED, DEGRADED_SERVED, GLOBAL_LIMITED, QUEUE_FULL, QUEUE_TIMEOUT, QUEUED, SESSION_LIMITED, SHED,
+    AdmissionController, TokenBucket
+)
+from src.context_loader import ContextLoader
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now = 0.5
+    assert bucket.try_acquire() and not bucket.try_acquire()
+    clock.now = 100.0
+    assert sum(bucket.try_acquire() for _ in range(10)) == 3
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+
+def test_session_and_global_limits():
+    clock = FakeClock()
+    controller = AdmissionController(global_rate=1.0, global_burst=4, session_rate=1.0, session_burst=2,
+                                     max_sessions=2, clock=clock)
+    outcomes = [controller.admit("bus-1").outcome for _ in range(3)]
+    assert outcomes == [ADMITTED, ADMITTED, SESSION_LIMITED]
+    assert controller.admit("bus-2").outcome == ADMITTED
+    assert controller.admit(None).outcome == ADMITTED
+    assert controller.admit("bus-3").degraded
+
+    clock.now = 1.0
+    # bus-1 was the least recently used session and has been evicted, so it starts with a full bucket
+    assert controller.admit("bus-1").outcome == ADMITTED
+    stats = controller.stats()
+    assert stats[ADMITTED] == 5 and stats[SESSION_LIMITED] == 1 and stats[GLOBAL_LIMITED] == 1
+    assert stats["active"] == 5
+
+
+def test_queue_admits_on_release_and_bounds_waiting():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, max_queue_wait=5.0)
+    first = controller.admit()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(controller.admit()))
+    waiter.start()
+    while controller.stats()["waiting"] == 0:
+        pass
+
+    assert controller.admit().outcome == QUEUE_FULL
+    first.release()
+    first.release()
+    waiter.join()
+    assert results[0].outcome == QUEUED and results[0].admitted
+    results[0].release()
+    assert controller.stats()["active"] == 0
+
+
+def test_queue_wait_deadline():
+    controller = AdmissionController(max_concurrent=1, max_queue_wait=0.05)
+    with controller.admit():
+        timed_out = controller.admit()
+    assert timed_out.outcome == QUEUE_TIMEOUT and timed_out.degraded
+    assert controller.admit().outcome == ADMITTED
+
+
+def test_degraded_mode_serves_only_precomputed_answers(monkeypatch):
+    context = ContextLoader().load_context()
+    processor, generator = QueryProcessor(), ResponseGenerator()
+    generator.answer_table(context)
+    cached = generator.generate_response(processor.process_query("What does Khamma Ghani mean?"), context)
+    assert generator.precomputed_response(processor.process_query("Kachori near City Palace"), context) is None
+
+    controller = AdmissionController(global_rate=0.001, global_burst=1)
+    monkeypatch.setattr(app, "DEFAULT_ADMISSION", controller)
+    assert app.local_guide("When to visit City Palace?")
+    assert app.local_guide("What does Khamma Ghani mean?") == cached.strip()
+    assert "very busy" in app.local_guide("Kachori near City Palace")
+
+    stats = controller.stats()
+    assert stats[GLOBAL_LIMITED] == 2 and stats[DEGRADED_SERVED] == 1 and stats[SHED] == 1
+    assert stats["active"] == 0
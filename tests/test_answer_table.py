@@ -0,0 +1,47 @@
+"""
+Unit tests for the precomputed answer table.
+"""
+
+from src.context_loader import ContextLoader, freeze, thaw
+from src.intent_classifier import load_training_file
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+
+
+def test_table_answers_match_generated_answers():
+    context = ContextLoader().load_context()
+    processor = QueryProcessor()
+    generator = ResponseGenerator()
+    queries, _ = load_training_file()
+    queries += ["Best food in Surajpole?", "Traffic near Lake Pichola in October?",
+                "Khamma Ghani and temple etiquette", "Best kachori and boat rides on Lake Pichola"]
+
+    tabulated = 0
+    for intent in processor.process_queries(queries):
+        key = generator._answer_key(intent)
+        answer = generator.answer_table(context).get(key) if key is not None else None
+        if answer is not None:
+            tabulated += 1
+            assert answer == generator._generate_uncached(intent, context)
+    assert tabulated > len(queries) * 0.7
+
+
+def test_time_and_place_dependent_queries_are_not_tabulated():
+    generator = ResponseGenerator()
+    processor = QueryProcessor()
+    for query in ["Is City Palace crowded at 5:30pm?", "Street food near Hathipole",
+                  "Best time to visit City Palace this week", "Plan a day at City Palace and Fateh Sagar"]:
+        assert generator._answer_key(processor.process_query(query)) is None
+
+
+def test_table_is_rebuilt_for_a_changed_knowledge_base():
+    context = ContextLoader().load_context()
+    generator = ResponseGenerator()
+    assert generator.answer_table(context) is generator.answer_table(ContextLoader().load_context())
+
+    changed = thaw(context)
+    changed["tourism"]["peak_times"]["City Palace"] = "10 AM - 1 PM"
+    changed = freeze(changed)
+    intent = QueryProcessor().process_query("When to visit City Palace?")
+    assert generator.answer_table(changed) is not generator.answer_table(context)
+    assert "10 AM - 1 PM" in generator.generate_response(intent, changed)
@@ -0,0 +1,50 @@
+"""
+Unit tests for the zipapp build.
+"""
+
+import shutil
+import subprocess
+import sys
+import zipfile
+
+import src.context_loader as context_loader
+import src.resources as resources
+from app import local_guide
+from src.bundle import COLD_START_QUERY, build
+from src.context_loader import ContextLoader, compile_snapshot
+from src.resources import KB_SNAPSHOT_NAME
+
+
+def test_bundled_snapshot_replaces_missing_product_md(tmp_path, monkeypatch):
+    path = str(tmp_path / "product.md")
+    shutil.copy(".kiro/product.md", path)
+    with open(path, encoding="utf-8") as handle:
+        content = handle.read()
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(content.replace("October to March", "November to February"))
+    compiled = ContextLoader(path)
+    monkeypatch.setitem(resources._resources, KB_SNAPSHOT_NAME, compile_snapshot(compiled))
+    monkeypatch.setattr(context_loader, "_context_cache", {})
+
+    loader = ContextLoader(str(tmp_path / "missing.md"))
+    assert loader.load_context() == compiled.load_context()
+    assert loader.load_context()["tourism"]["peak_season"] == "November to February"
+    assert loader.kb_version == compiled.kb_version
+    assert ContextLoader(str(tmp_path / "missing.md")).load_context() is loader.load_context()
+
+
+def test_zipapp_answers_like_the_source_tree(tmp_path):
+    out = str(tmp_path / "guide.pyz")
+    report = build(out, cold_start_runs=0)
+    assert report.path == out and report.data_files[0] == KB_SNAPSHOT_NAME
+    assert report.cold_start is None
+    with zipfile.ZipFile(out) as archive:
+        names = set(archive.namelist())
+    assert {"__main__.pyc", "app.pyc", "src/context_loader.pyc", "src/locales/en.json"} <= names
+    assert "src/bundle.py" not in names
+
+    workdir = tmp_path / "empty"
+    workdir.mkdir()
+    answer = subprocess.run([sys.executable, out, COLD_START_QUERY], cwd=str(workdir), check=True,
+                            capture_output=True, text=True).stdout
+    assert answer.strip() == local_guide(COLD_START_QUERY)
@@ -0,0 +1,74 @@
+"""
+Unit tests for the persistent chat history store.
+"""
+
+import sqlite3
+
+from src.chat_history import ChatHistoryStore, restore_session_id
+
+
+def test_messages_survive_reopen(tmp_path):
+    db_path = str(tmp_path / "history.db")
+    store = ChatHistoryStore(db_path=db_path)
+    store.append("s1", "user", "What does Khamma Ghani mean?")
+    store.append("s1", "bot", "A traditional greeting.")
+    store.close()
+
+    reopened = ChatHistoryStore(db_path=db_path)
+    page = reopened.load_page("s1")
+    reopened.close()
+
+    assert [message["role"] for message in page] == ["user", "bot"]
+    assert page[0]["content"] == "What does Khamma Ghani mean?"
+
+
+def test_saved_session_id_reopens_the_chat(tmp_path):
+    db_path = str(tmp_path / "history.db")
+    session_id = restore_session_id(None)
+    store = ChatHistoryStore(db_path=db_path)
+    store.append(session_id, "user", "Best food in Surajpole?")
+    store.close()
+
+    # A restart: the client sends back the id it kept
+    restored = restore_session_id(session_id)
+    reopened = ChatHistoryStore(db_path=db_path)
+    assert restored == session_id
+    assert [message["content"] for message in reopened.load_page(restored)] == ["Best food in Surajpole?"]
+    reopened.close()
+
+    assert restore_session_id(None) != session_id
+    assert restore_session_id("s1") != "s1" and len(restore_session_id("s1")) == len(session_id)
+
+
+def test_wal_mode_enabled(tmp_path):
+    db_path = str(tmp_path / "history.db")
+    ChatHistoryStore(db_path=db_path).close()
+    mode = sqlite3.connect(db_path).execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_paging_and_retention(tmp_path):
+    store = ChatHistoryStore(db_path=str(tmp_path / "history.db"), max_messages_per_session=10)
+    for index in range(25):
+        store.append("s1", "user", f"message {index}")
+    store.flush()
+
+    latest = store.load_page("s1", limit=4)
+    assert [message["content"] for message in latest] == [f"message {i}" for i in range(21, 25)]
+
+    older = store.load_page("s1", before_id=latest[0]["id"], limit=100)
+    assert len(older) == 6
+    assert older[0]["content"] == "message 15"
+    store.close()
+
+
+def test_clear_session(tmp_path):
+    store = ChatHistoryStore(db_path=str(tmp_path / "history.db"))
+    store.append("s1", "user", "hello")
+    store.append("s2", "user", "hello")
+    store.clear("s1")
+    store.flush()
+
+    assert store.load_page("s1") == []
+    assert len(store.load_page("s2")) == 1
+    store.close()
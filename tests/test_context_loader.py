@@ -0,0 +1,234 @@
+"""
+Unit tests for ContextLoader.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+import pytest
+
+import src.context_loader as context_loader
+from src.context_loader import ContextLoader, parse_section, split_product_md
+from src.geo_index import geo_index_for
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+
+
+def _touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _rewrite(path, old, new):
+    with open(path, encoding="utf-8") as handle:
+        content = handle.read()
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(content.replace(old, new))
+    _touch(path)
+
+
+def test_product_md_matches_built_in_context():
+    loader = ContextLoader()
+    assert loader.load_context() == loader._get_default_context()
+    assert loader.kb_version != "default"
+
+
+def test_parse_section_value_types():
+    section = parse_section(
+        "intro text\n### Peak Times\n- **Fort**: 9 AM - 11 AM\n### Spots\n- **Fort**: 24.5, 73.6\n"
+        "### Minutes\n- **Fort**: 45\n### Tips\n- Go early\n- Carry water\n### Season\nWinter\n"
+        "### Stalls\n| name | lat | dishes |\n|---|---|---|\n| A | 24.5 | Kachori, Poha |\n| B | 24.6 | Poha |\n"
+    )
+    assert section == {
+        "peak_times": {"Fort": "9 AM - 11 AM"},
+        "spots": {"Fort": [24.5, 73.6]},
+        "minutes": {"Fort": 45},
+        "tips": ["Go early", "Carry water"],
+        "season": "Winter",
+        "stalls": [{"name": "A", "lat": 24.5, "dishes": ["Kachori", "Poha"]},
+                   {"name": "B", "lat": 24.6, "dishes": ["Poha"]}],
+    }
+
+
+def test_missing_file_uses_built_in_context(tmp_path):
+    loader = ContextLoader(str(tmp_path / "missing.md"))
+    assert loader.load_context()["tourism"]["peak_season"] == "October to March"
+    assert loader.kb_version == "default"
+
+
+def test_unchanged_file_returns_the_same_context(tmp_path):
+    path = str(tmp_path / "product.md")
+    shutil.copy(".kiro/product.md", path)
+    first = ContextLoader(path).load_context()
+    loader = ContextLoader(path)
+    assert loader.load_context() is first
+    assert loader.reparsed_sections == []
+
+
+def test_edit_reparses_only_the_changed_section(tmp_path):
+    path = str(tmp_path / "product.md")
+    shutil.copy(".kiro/product.md", path)
+    loader = ContextLoader(path)
+    before = loader.load_context()
+    geo_before = geo_index_for(before)
+    table_before = ResponseGenerator().answer_table(before)
+
+    _rewrite(path, "- Respect local customs and greetings", "- Ask before photographing people")
+    after = loader.load_context()
+
+    assert loader.reparsed_sections == ["culture"]
+    assert after is not before
+    assert after["culture"]["etiquette"][-1] == "Ask before photographing people"
+    for key in ("overview", "language", "food", "tourism"):
+        assert after[key] is before[key]
+
+    # Indexes and answers built from unchanged sections are kept
+    assert geo_index_for(after) is geo_before
+    table_after = ResponseGenerator().answer_table(after)
+    culture_keys = [key for key in table_after.answers if "culture" in key[0]]
+    assert table_after.reused == len(table_after) - len(culture_keys)
+    assert "Ask before photographing people" in table_after.get((("culture",), None, (False, False, False)))
+    assert table_before.get((("food",), None, (False, False, False))) is not None
+
+
+def test_sharded_sections_load_on_first_access(tmp_path):
+    kb_dir = str(tmp_path / "kb")
+    split_product_md(".kiro/product.md", kb_dir)
+    loader = ContextLoader(str(tmp_path / "missing.md"), kb_dir=kb_dir)
+    context = loader.load_context()
+
+    assert context.loaded_sections() == []
+    assert "food" in context and "events" not in context
+    assert context["food"]["dishes"][0] == "Dal Baati Churma"
+    assert context.loaded_sections() == ["food"]
+    assert context["food"] is context["food"]
+    assert dict(context) == loader._get_default_context()
+
+
+def test_section_can_span_several_shards(tmp_path):
+    kb_dir = tmp_path / "kb"
+    kb_dir.mkdir()
+    (kb_dir / "dishes.md").write_text("### Dishes\n- Kachori\n### Areas\n- Surajpole\n", encoding="utf-8")
+    (kb_dir / "more_dishes.json").write_text(json.dumps({"dishes": ["Poha"]}), encoding="utf-8")
+    (kb_dir / "manifest.json").write_text(
+        json.dumps({"sections": {"food": ["dishes.md", "more_dishes.json"]}}), encoding="utf-8")
+
+    context = ContextLoader(str(tmp_path / "missing.md"), kb_dir=str(kb_dir)).load_context()
+    assert context["food"] == {"dishes": ("Kachori", "Poha"), "areas": ("Surajpole",)}
+
+    intent = QueryProcessor().process_query("Best food in Surajpole?")
+    assert ResponseGenerator().generate_response(intent, context).startswith("For authentic food in Surajpole")
+
+
+def test_manifest_change_reloads_only_edited_shards(tmp_path):
+    kb_dir = str(tmp_path / "kb")
+    split_product_md(".kiro/product.md", kb_dir)
+    loader = ContextLoader(str(tmp_path / "missing.md"), kb_dir=kb_dir)
+    before = loader.load_context()
+    food, culture = before["food"], before["culture"]
+
+    assert loader.load_context() is before
+    _rewrite(os.path.join(kb_dir, "culture.md"), "Respect local customs", "Honour local customs")
+    _touch(os.path.join(kb_dir, "manifest.json"))
+    after = loader.load_context()
+
+    assert after is not before
+    assert after.loaded_sections() == ["food"]
+    assert after["food"] is food
+    assert after["culture"] is not culture
+    assert after["culture"]["etiquette"][-1] == "Honour local customs and greetings"
+
+
+def test_shard_edit_publishes_a_new_version(tmp_path, monkeypatch):
+    kb_dir = str(tmp_path / "kb")
+    split_product_md(".kiro/product.md", kb_dir)
+    loader = ContextLoader(str(tmp_path / "missing.md"), kb_dir=kb_dir)
+    first = loader.snapshot()
+    assert first.context.loaded_sections() == []
+
+    food = first.context["food"]
+
+    # The manifest is not touched; the shard's new size and modification time are enough
+    _rewrite(os.path.join(kb_dir, "culture.md"), "Respect local customs", "Honour local customs")
+    # Loading reads only the manifest; shards are read when their section is first used
+    reads = []
+    read_text = context_loader._read_text
+    monkeypatch.setattr(context_loader, "_read_text", lambda path: reads.append(path) or read_text(path))
+    second = loader.snapshot()
+    assert second.kb_version != first.kb_version and second.version > first.version
+    assert reads == [] and second.context.loaded_sections() == ["food"] and second.context["food"] is food
+    assert second.context["culture"]["etiquette"][-1] == "Honour local customs and greetings"
+    assert [os.path.basename(path) for path in reads] == ["culture.md"]
+    assert loader.snapshot() == second
+
+
+def test_snapshots_are_read_only_and_versioned(tmp_path):
+    path = str(tmp_path / "product.md")
+    shutil.copy(".kiro/product.md", path)
+    loader = ContextLoader(path)
+    first = loader.snapshot()
+
+    with pytest.raises(TypeError):
+        first.context["food"]["areas"] = ("Surajpole",)
+    with pytest.raises(TypeError):
+        first.context["tourism"]["peak_times"]["City Palace"] = "10 AM - 1 PM"
+    assert isinstance(first.context["food"]["venues"][0]["dishes"], tuple)
+
+    _touch(path)
+    assert loader.snapshot() == first
+
+    _rewrite(path, "4 PM - 9 PM", "10 AM - 1 PM")
+    second = loader.snapshot()
+    assert second.version > first.version and loader.version == second.version
+    assert second.context["tourism"]["peak_times"]["City Palace"] == "10 AM - 1 PM"
+    assert first.context["tourism"]["peak_times"]["City Palace"] == "4 PM - 9 PM"
+
+
+def test_concurrent_readers_see_consistent_snapshots_during_reloads(tmp_path):
+    path = str(tmp_path / "product.md")
+    with open(".kiro/product.md", encoding="utf-8") as handle:
+        original = handle.read()
+    versions = [original, original.replace("4 PM - 9 PM", "10 AM - 1 PM")]
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(versions[0])
+
+    intent = QueryProcessor().process_query("When to visit City Palace?")
+    generator = ResponseGenerator()
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        seen_version = 0
+        while not stop.is_set():
+            try:
+                snapshot = ContextLoader(path).snapshot()
+                peak = snapshot.context["tourism"]["peak_times"]["City Palace"]
+                answer = generator.generate_response(intent, snapshot.context)
+                assert snapshot.version >= seen_version, "snapshot versions went backwards"
+                assert peak in answer, f"answer does not match its snapshot: {answer}"
+                seen_version = snapshot.version
+            except Exception as error:
+                errors.append(error)
+                return
+
+    def writer():
+        # Publish by atomic rename, the way knowledge base edits are deployed
+        for number in range(40):
+            staged = f"{path}.{number}"
+            with open(staged, "w", encoding="utf-8") as handle:
+                handle.write(versions[(number + 1) % 2])
+            os.replace(staged, path)
+            _touch(path)
+            stop.wait(0.005)
+        stop.set()
+
+    threads = [threading.Thread(target=reader) for _ in range(8)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert not errors, errors[0]
+    assert ContextLoader(path).snapshot().context["tourism"]["peak_times"]["City Palace"] == "4 PM - 9 PM"
@@ -0,0 +1,78 @@
+"""
+Unit tests for the crowd forecast tensor and best-slot search.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+import src.crowd_forecast as crowd_forecast
+from src.context_loader import ContextLoader
+from src.crowd_forecast import CrowdForecast, parse_month_range
+
+
+def test_parse_month_range_wraps_year():
+    assert parse_month_range("October to March") == [9, 10, 11, 0, 1, 2]
+    assert parse_month_range("July") == [6]
+
+
+def test_forecast_covers_key_areas():
+    forecast = CrowdForecast.from_context(ContextLoader().load_context(), csv_path=None)
+    assert forecast.levels.shape == (len(forecast.locations), 24, 7, 12)
+    assert {"City Palace", "Lake Pichola", "Sajjangarh", "Fateh Sagar"} <= set(forecast.locations)
+
+
+def test_best_slots_for_several_locations():
+    locations = ["Lake Pichola", "Sajjangarh"]
+    levels = np.ones((2, 24, 7, 12), dtype=np.float32)
+    levels[0, 9, 2, 0] = 0.2   # Lake Pichola: Wednesday 9 AM in January
+    levels[1, 18, 4, 0] = 0.1  # Sajjangarh: Friday 6 PM in January
+    forecast = CrowdForecast(locations, levels)
+
+    monday_morning = datetime(2024, 1, 1, 8, 0)
+    slots = forecast.best_slots(locations, now=monday_morning)
+
+    assert [(slot.location, slot.day.weekday(), slot.hour) for slot in slots] == [
+        ("Lake Pichola", 2, 9), ("Sajjangarh", 4, 18)
+    ]
+
+
+def test_best_slots_skip_past_hours_today():
+    levels = np.ones((1, 24, 7, 12), dtype=np.float32)
+    levels[0, 8, 0, 0] = 0.0
+    forecast = CrowdForecast(["City Palace"], levels)
+
+    slot = forecast.best_slots(["City Palace"], days=1, now=datetime(2024, 1, 1, 12, 0))[0]
+    assert slot.hour == 13
+
+
+def test_no_slot_left_late_in_the_evening():
+    levels = np.ones((2, 24, 7, 12), dtype=np.float32)
+    levels[:, 0, 0, 0] = 0.0
+    forecast = CrowdForecast(["City Palace", "Lake Pichola"], levels)
+
+    late_evening = datetime(2024, 1, 1, 22, 30)
+    assert forecast.best_slots(["City Palace", "Lake Pichola"], days=1, now=late_evening) == []
+    slots = forecast.best_slots(["City Palace"], days=2, now=late_evening)
+    assert [(slot.day.day, slot.hour) for slot in slots] == [(2, 7)]
+
+
+def test_forecast_is_looked_up_by_knowledge_base_sections(monkeypatch):
+    context = ContextLoader().load_context()
+    forecast = CrowdForecast.from_context(context, csv_path=None)
+
+    def content_key(*args):
+        raise AssertionError("content key computed for sections already seen")
+
+    monkeypatch.setattr(crowd_forecast, "forecast_key", content_key)
+    assert CrowdForecast.from_context(context, csv_path=None) is forecast
+
+
+def test_csv_overrides(tmp_path):
+    csv_path = tmp_path / "forecast.csv"
+    csv_path.write_text("location,hour,weekday,month,level\nCity Palace,10,0,1,0.05\nBagore Ki Haveli,19,5,12,0.9\n")
+
+    forecast = CrowdForecast.from_context(ContextLoader().load_context(), csv_path=str(csv_path))
+    palace = forecast.location_indexes(["City Palace"])[0]
+    assert forecast.levels[palace, 10, 0, 0] == np.float32(0.05)
+    assert "Bagore Ki Haveli" in forecast.locations
@@ -0,0 +1,44 @@
+"""
+Unit tests for the time-of-day crowd model.
+"""
+
+from datetime import datetime
+
+from src.crowd_model import CrowdModel, crowd_model_for, parse_clock_time, parse_time_range
+
+
+def test_parse_time_range():
+    assert parse_time_range("4 PM - 9 PM") == (16 * 60, 21 * 60)
+    assert parse_time_range("7-10 AM") == (7 * 60, 10 * 60)
+    assert parse_time_range("10:30 pm to 1 am") == (22 * 60 + 30, 60)
+    assert parse_time_range("October to March") is None
+
+
+def test_parse_clock_time():
+    assert parse_clock_time("is it crowded at 5:30pm?") == 17 * 60 + 30
+    assert parse_clock_time("around 17:00") == 17 * 60
+    assert parse_clock_time("12 am") == 0
+    assert parse_clock_time("crowded right now", now=datetime(2024, 1, 1, 9, 15)) == 9 * 60 + 15
+    assert parse_clock_time("when to visit") is None
+
+
+def test_evaluate_all_locations_at_once():
+    model = crowd_model_for({"City Palace": "4 PM - 9 PM", "Lake Pichola": "6 PM - 8 PM"})
+    statuses = {status.location: status for status in model.evaluate(17 * 60 + 30)}
+
+    assert statuses["City Palace"].level == "peak"
+    assert statuses["City Palace"].quiet_from == 22 * 60
+    assert statuses["City Palace"].quiet_until == 15 * 60
+    assert statuses["Lake Pichola"].level == "moderate"
+
+
+def test_window_wrapping_midnight():
+    model = CrowdModel({"Night Market": [(23 * 60, 60)]})
+    assert model.evaluate_location("night market", 30).level == "peak"
+    assert model.evaluate_location("night market", 12 * 60).level == "quiet"
+    assert model.evaluate_location("night market", 12 * 60).quiet_until == 22 * 60
+
+
+def test_model_is_compiled_once_per_knowledge_base():
+    peak_times = {"City Palace": "4 PM - 9 PM"}
+    assert crowd_model_for(peak_times) is crowd_model_for(dict(peak_times))
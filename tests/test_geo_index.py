@@ -0,0 +1,70 @@
+"""
+Unit tests for the geospatial index.
+"""
+
+import numpy as np
+
+from src.context_loader import ContextLoader
+from src.geo_index import GeoIndex, Place, geo_index_for, parse_coordinates, parse_radius_km
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+
+
+def _random_places(count: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    latitudes = 24.58 + rng.uniform(-0.05, 0.05, count)
+    longitudes = 73.69 + rng.uniform(-0.05, 0.05, count)
+    kinds = rng.choice(["food", "sight"], count)
+    return [Place(f"place {i}", str(kind), float(lat), float(lon), None, ())
+            for i, (lat, lon, kind) in enumerate(zip(latitudes, longitudes, kinds))]
+
+
+def _brute_force(index: GeoIndex, latitude: float, longitude: float, kind=None):
+    x, y = index._project(np.array([latitude]), np.array([longitude]))
+    distances = np.hypot(index._x - x[0], index._y - y[0])
+    order = np.argsort(distances, kind="stable")
+    return [(index.places[i].name, float(distances[i])) for i in order
+            if kind is None or index.places[i].kind == kind]
+
+
+def test_parse_query_geometry():
+    assert parse_coordinates("food near 24.585, 73.690") == (24.585, 73.69)
+    assert parse_radius_km("within 500 m of Hathipole") == 0.5
+    assert parse_radius_km("within 2 km") == 2.0
+    assert parse_radius_km("near Hathipole") is None
+
+
+def test_within_matches_brute_force():
+    index = GeoIndex(_random_places(2000))
+    expected = [name for name, distance in _brute_force(index, 24.58, 73.69, kind="food") if distance <= 1.2]
+    results = index.within(24.58, 73.69, 1.2, kind="food")
+    assert [result.place.name for result in results] == expected
+    assert all(result.distance_km <= 1.2 for result in results)
+
+
+def test_nearest_matches_brute_force():
+    index = GeoIndex(_random_places(2000))
+    rng = np.random.default_rng(3)
+    for latitude, longitude in zip(24.58 + rng.uniform(-0.06, 0.06, 25), 73.69 + rng.uniform(-0.06, 0.06, 25)):
+        expected = [name for name, _ in _brute_force(index, latitude, longitude)[:5]]
+        assert [result.place.name for result in index.nearest(latitude, longitude, 5)] == expected
+
+
+def test_nearest_far_from_data_falls_back_to_scan():
+    index = GeoIndex(_random_places(200))
+    expected = [name for name, _ in _brute_force(index, 26.9, 75.8, kind="sight")[:3]]
+    assert [result.place.name for result in index.nearest(26.9, 75.8, 3, kind="sight")] == expected
+
+
+def test_index_is_reused_for_an_unchanged_knowledge_base():
+    first = ContextLoader().load_context()
+    second = ContextLoader().load_context()
+    assert geo_index_for(first) is geo_index_for(second)
+
+
+def test_food_near_a_landmark():
+    context = ContextLoader().load_context()
+    intent = QueryProcessor().process_query("Street food within 1 km of City Palace")
+    response = ResponseGenerator().generate_response(intent, context)
+    assert response.startswith("Food spots within 1 km of City Palace: Gangaur Ghat rooftop cafes (0.3 km")
+    assert "Fateh Sagar promenade stalls" not in response
@@ -0,0 +1,69 @@
+"""
+Unit tests for the hashed n-gram intent classifier.
+"""
+
+import numpy as np
+
+from src.intent_classifier import IntentClassifier, _normalize, load_training_file
+from src.query_processor import QueryProcessor
+
+TEXTS = ["where to eat kachori", "best dal baati", "street food stalls",
+         "visit city palace", "boat ride on the lake", "crowds at the palace",
+         "temple dress code", "remove shoes in temple", "local customs"]
+CATEGORIES = ["food"] * 3 + ["tourism"] * 3 + ["culture"] * 3
+
+
+def test_training_fits_labeled_queries():
+    model = IntentClassifier.train(TEXTS, CATEGORIES)
+    assert [prediction.category for prediction in model.predict(TEXTS)] == CATEGORIES
+
+
+def test_batch_matches_single_queries():
+    model = IntentClassifier.train(TEXTS, CATEGORIES)
+    queries = ["kachori stalls", "", "what to wear in a temple", "palace boat"]
+    batch = model.predict_proba(queries)
+    single = np.vstack([model.predict_proba([query]) for query in queries])
+    assert np.allclose(batch, single, atol=1e-6)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    model = IntentClassifier.train(TEXTS, CATEGORIES)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = IntentClassifier.load(path)
+    assert loaded.labels == model.labels
+    assert np.allclose(loaded.predict_proba(TEXTS), model.predict_proba(TEXTS), atol=1e-2)
+
+
+def test_training_file_is_well_formed():
+    texts, categories = load_training_file()
+    assert len(texts) == len(categories) > 100
+    assert set(categories) == {"language", "food", "tourism", "culture", "general"}
+
+
+def test_paraphrase_missed_by_keywords():
+    processor = QueryProcessor()
+    assert processor.classifier is not None
+    assert processor.process_query("What should I wear to Jagdish temple?").category == "culture"
+
+
+def test_keywords_win_over_unconfident_predictions():
+    processor = QueryProcessor()
+    assert processor.process_query("where can I buy a sari").category == "culture"
+    # No keyword matches, but a dish is named
+    assert processor.process_query("ghevar kaha milega").category == "food"
+    # Nothing matches and the classifier's guess (culture, 0.27) is too weak to use
+    assert processor.process_query("I need a car").category == "general"
+
+
+def test_training_and_inference_normalise_alike():
+    processor = QueryProcessor()
+    assert _normalize(["Kachoriii kahan milegi?"]) == [processor.normalize_query("Kachoriii kahan milegi?")]
+
+
+def test_keyword_fallback_without_model():
+    processor = QueryProcessor()
+    processor.classifier = None
+    assert processor.process_query("Best food in Surajpole?").category == "food"
+    assert [intent.category for intent in processor.process_queries(["khamma ghani", "hello"])] == \
+        ["language", "general"]
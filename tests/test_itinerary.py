@@ -0,0 +1,69 @@
+"""
+Unit tests for the crowd-aware itinerary planner.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from src.crowd_forecast import CrowdForecast
+from src.itinerary import ItineraryPlanner
+
+COORDINATES = {
+    "A": [24.570, 73.680],
+    "B": [24.575, 73.680],
+    "C": [24.580, 73.680],
+    "D": [24.585, 73.680],
+}
+
+
+def flat_forecast(names, level=0.2):
+    return CrowdForecast(names, np.full((len(names), 24, 7, 12), level, dtype=np.float32))
+
+
+def test_small_plan_follows_shortest_route():
+    planner = ItineraryPlanner(COORDINATES, {}, flat_forecast(list(COORDINATES)))
+    itinerary = planner.plan(["C", "A", "D", "B"], 9 * 60, 18 * 60, datetime(2024, 1, 1), start_location="A")
+
+    assert itinerary.method in ("dynamic_programming", "heuristic")
+    assert [stop.location for stop in itinerary.stops] == ["A", "B", "C", "D"]
+    assert itinerary.fits_window
+
+
+def test_plan_avoids_crowded_hours():
+    forecast = flat_forecast(["A", "B"])
+    forecast.levels[0, 9:11, :, :] = 1.0  # A is packed in the morning
+    planner = ItineraryPlanner(COORDINATES, {"A": 60, "B": 60}, forecast)
+
+    itinerary = planner.plan(["A", "B"], 9 * 60, 18 * 60, datetime(2024, 1, 1))
+    assert [stop.location for stop in itinerary.stops] == ["B", "A"]
+
+
+def test_large_sets_use_heuristic_within_budget():
+    coordinates = {f"P{i}": [24.5 + (i % 5) * 0.01, 73.6 + (i // 5) * 0.01] for i in range(15)}
+    planner = ItineraryPlanner(coordinates, {}, flat_forecast(list(coordinates)))
+
+    itinerary = planner.plan(list(coordinates), 6 * 60, 23 * 60, datetime(2024, 1, 1), budget_seconds=0.02)
+    assert itinerary.method == "heuristic"
+    assert sorted(stop.location for stop in itinerary.stops) == sorted(coordinates)
+
+
+def test_stops_that_do_not_fit_are_left_out():
+    planner = ItineraryPlanner(COORDINATES, {"A": 150, "B": 75, "C": 60}, flat_forecast(list(COORDINATES)))
+    itinerary = planner.plan(["A", "B", "C"], 9 * 60, 13 * 60, datetime(2024, 1, 1))
+
+    assert itinerary.fits_window and itinerary.stops[-1].depart <= 13 * 60
+    assert itinerary.skipped == ("A",)
+    assert [stop.location for stop in itinerary.stops] == ["B", "C"]
+    # One stop longer than the window is kept, and reported as running over
+    alone = planner.plan(["A"], 9 * 60, 10 * 60, datetime(2024, 1, 1))
+    assert not alone.fits_window and alone.skipped == ()
+
+
+def test_unknown_transport_mode_rejected():
+    planner = ItineraryPlanner(COORDINATES, {}, flat_forecast(list(COORDINATES)))
+    try:
+        planner.plan(["A", "B"], 540, 1080, datetime(2024, 1, 1), transport_mode="helicopter")
+    except ValueError:
+        return
+    assert False, "expected ValueError"
@@ -0,0 +1,79 @@
+"""
+Unit tests for the localized response catalogs.
+"""
+
+import pytest
+
+import src.localization as localization
+from app import local_guide
+from src.context_loader import ContextLoader
+from src.localization import (
+    DEFAULT_LOCALE, SUPPORTED_LOCALES, Catalog, catalog_for, default_catalog, loaded_locales, resolve_locale
+)
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+
+
+def test_resolve_locale():
+    assert [resolve_locale(locale) for locale in ["fr-FR", "de_AT", "HI", " fr ", None, "", "ja", "xx-YY"]] == [
+        "fr", "de", "hi", "fr", "en", "en", "en", "en"
+    ]
+    assert catalog_for("ja") is catalog_for(None) is default_catalog()
+
+
+def test_shipped_catalogs_translate_every_template():
+    english = default_catalog()
+    for locale in SUPPORTED_LOCALES:
+        catalog = catalog_for(locale)
+        assert catalog.locale == locale and catalog.missing == []
+        assert set(catalog.templates) == set(english.templates)
+        if locale != DEFAULT_LOCALE:
+            assert catalog.text("food.area", location="Surajpole") != english.text("food.area", location="Surajpole")
+
+
+def test_templates_are_filled_in_and_checked_on_load():
+    catalog = Catalog("en", {"near": "{name} ({distance:.1f} km) {{literal}} {name!r}", "closed": "Closed {{today}}."})
+    near = catalog.text("near", name="Gangaur Ghat", distance=0.84, unused=1)
+    assert near == "Gangaur Ghat (0.8 km) {literal} 'Gangaur Ghat'"
+    assert catalog.text("closed") == "Closed {today}."
+    for template in ("{place.name}", "{hours[0]}", "Open {until"):
+        with pytest.raises(ValueError):
+            Catalog("en", {"bad": template})
+
+
+def test_translations_fall_back_and_are_checked():
+    english = Catalog("en", {"greet": "Hello {name}.", "bye": "Goodbye."})
+    french = Catalog("fr", {"greet": "Bonjour {name}."}, english)
+    assert french.text("greet", name="Asha") == "Bonjour Asha." and french.text("bye") == "Goodbye."
+    assert french.missing == ["bye"]
+    with pytest.raises(ValueError):
+        Catalog("fr", {"greet": "Bonjour {nom}."}, english)
+    with pytest.raises(ValueError):
+        Catalog("fr", {"welcome": "Bienvenue."}, english)
+
+
+def test_loaded_catalogs_are_bounded(monkeypatch):
+    monkeypatch.setattr(localization, "LOCALE_CACHE_SIZE", 1)
+    monkeypatch.setattr(localization, "_catalogs", type(localization._catalogs)())
+    french = catalog_for("fr")
+    assert catalog_for("fr-FR") is french
+    catalog_for("hi")
+    assert set(loaded_locales()) == {"hi", DEFAULT_LOCALE}
+
+
+def test_guide_answers_in_the_requested_locale():
+    english = local_guide("What does Khamma Ghani mean?")
+    french = local_guide("What does Khamma Ghani mean?", locale="fr")
+    assert french.startswith("« Khamma Ghani » est une salutation traditionnelle") and french != english
+    assert local_guide("   ", locale="de") == catalog_for("de").text("app.empty_input")
+    assert local_guide("What does Khamma Ghani mean?", locale="es") == english
+
+    # Only default-locale answers are tabulated; other locales are generated per query
+    context = ContextLoader().load_context()
+    generator = ResponseGenerator(venue_store=None)
+    generator.answer_table(context)
+    intent = QueryProcessor().process_query("What does Khamma Ghani mean?")
+    assert generator.precomputed_response(intent, context) is not None
+    intent.locale = "hi"
+    assert generator.precomputed_response(intent, context) is None
+    assert "खम्मा घणी" in generator.generate_response(intent, context)
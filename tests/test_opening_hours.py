@@ -0,0 +1,131 @@
+"""
+Unit tests for the opening-hours index.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.context_loader import ContextLoader
+from src.opening_hours import (
+    MINUTES_PER_DAY, MINUTES_PER_WEEK, OpeningHoursIndex, opening_hours_for, parse_exceptions, parse_schedule
+)
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+from src.venue_store import VenueStore
+
+# A Monday, and Diwali (a Sunday) which has holiday exceptions in product.md
+MONDAY = datetime(2026, 10, 19)
+DIWALI = datetime(2026, 11, 8)
+
+
+def _at(day: datetime, hour: int, minute: int = 0) -> datetime:
+    return day.replace(hour=hour, minute=minute)
+
+
+def test_parse_schedule():
+    assert parse_schedule("daily 09:30-17:30") == [(day * MINUTES_PER_DAY + 570, day * MINUTES_PER_DAY + 1050)
+                                                   for day in range(7)]
+    assert parse_schedule("Sat, Sun 10:00-12:00; Mon-Fri closed") == [(5 * MINUTES_PER_DAY + 600, 5 * MINUTES_PER_DAY + 720),
+                                                                      (6 * MINUTES_PER_DAY + 600, 6 * MINUTES_PER_DAY + 720)]
+    assert parse_schedule("24 hours") == [(0, MINUTES_PER_WEEK)]
+    # Sunday night runs past midnight into Monday morning
+    assert parse_schedule("Sun 22:00-02:00") == [(0, 120), (6 * MINUTES_PER_DAY + 1320, MINUTES_PER_WEEK)]
+    with pytest.raises(ValueError):
+        parse_schedule("sometimes 09:00-10:00")
+    assert parse_exceptions({"2026-11-08": "City Palace closed; Jagdish Temple 04:30-23:00"}) == {
+        DIWALI.date(): {"city palace": [], "jagdish temple": [(270, 1380)]}
+    }
+
+
+def test_stabbing_query_matches_brute_force():
+    rng = np.random.default_rng(3)
+    schedules = []
+    for _ in range(500):
+        start = int(rng.integers(0, 24)) * 60 + int(rng.choice([0, 15, 30, 45]))
+        length = int(rng.integers(1, 16)) * 60
+        end = (start + length) % MINUTES_PER_DAY
+        days = ["Mon-Fri", "daily", "Sat, Sun", "Tue-Sat"][int(rng.integers(0, 4))]
+        schedules.append(f"{days} {start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}")
+    parsed = [parse_schedule(schedule) for schedule in schedules]
+    index = OpeningHoursIndex([f"venue {i}" for i in range(500)], parsed)
+
+    for minute in rng.integers(0, MINUTES_PER_WEEK, 200):
+        when = datetime(2026, 10, 19 + int(minute) // MINUTES_PER_DAY, int(minute) % MINUTES_PER_DAY // 60,
+                        int(minute) % 60)
+        expected = [any(start <= minute < end for start, end in intervals) for intervals in parsed]
+        assert index.open_mask(when).tolist() == expected
+
+
+def test_status_and_holiday_exceptions():
+    index = opening_hours_for(ContextLoader().load_context())
+
+    assert index.status("City Palace", _at(MONDAY, 10)).next_change == 1050
+    closed = index.status("City Palace", _at(MONDAY, 18))
+    assert not closed.is_open and closed.next_change == MINUTES_PER_DAY + 570
+    assert index.status("Jagdish Temple", _at(MONDAY, 14)).next_change == 17 * 60
+    assert index.status("Fateh Sagar", _at(MONDAY, 3)).next_change is None
+    # Overnight hours keep a place open past midnight
+    assert index.status("Fateh Sagar promenade stalls", _at(MONDAY, 0, 15)).is_open
+    assert index.status("Hathipole", _at(MONDAY, 12)) is None
+
+    assert "City Palace" in index.open_places(_at(DIWALI.replace(day=1), 11))
+    assert "City Palace" not in index.open_places(_at(DIWALI, 11))
+    assert index.status("Bada Bazaar sweet shops", _at(DIWALI, 22)).special
+
+
+def test_bad_holiday_exception_skips_only_itself(caplog):
+    exceptions = {"2026-11-08": "City Palace closed; Jagdish Temple sometimes", "2026-13-01": "City Palace closed",
+                  "2026-11-09": "City Palace 09:30-17:30"}
+    assert parse_exceptions(exceptions) == {DIWALI.date(): {"city palace": []},
+                                            DIWALI.date().replace(day=9): {"city palace": [(570, 1050)]}}
+    assert "Jagdish Temple sometimes" in caplog.text and "2026-13-01" in caplog.text
+
+
+def test_holiday_hours_past_midnight_carry_into_the_next_morning():
+    index = OpeningHoursIndex.from_hours(["Night market"], ["daily 18:00-22:00"],
+                                         {"2026-11-08": "Night market 18:00-02:00"})
+    next_morning = DIWALI.replace(day=9)
+
+    assert index.open_places(_at(DIWALI, 23)) == ["Night market"]
+    assert index.status("Night market", _at(next_morning, 1, 30)) == ("Night market", True, None, True)
+    assert index.open_places(_at(next_morning, 2, 30)) == []
+    assert not index.status("Night market", _at(next_morning, 2, 30)).special
+
+
+def test_index_is_reused_per_knowledge_base():
+    context = ContextLoader().load_context()
+    assert opening_hours_for(context) is opening_hours_for(context)
+
+
+def test_open_now_answers():
+    context = ContextLoader().load_context()
+    processor = QueryProcessor()
+    generator = ResponseGenerator()
+
+    intent = processor.process_query("Which food stalls are open near Chetak Circle at 10 pm?")
+    assert generator._answer_key(intent) is None
+    assert generator.generate_response(intent, context) == (
+        "Food spots open at 10:00 PM within 1.5 km of Chetak Circle: "
+        "Chetak Circle street food lane (0.1 km, known for Dal Baati Churma, Kachori)."
+    )
+
+    response = generator.generate_response(processor.process_query("Is City Palace open at 8 am on 2026-10-19?"), context)
+    assert response == "City Palace is closed at 8:00 AM on 2026-10-19; it opens at 9:30 AM."
+    response = generator.generate_response(processor.process_query("Is City Palace open on 2026-11-08?"), context)
+    assert response == "City Palace is closed on 2026-11-08 (special holiday hours)."
+
+
+def test_venue_store_filters_open_venues(tmp_path):
+    store = VenueStore(str(tmp_path / "venues.db"))
+    store.import_records(
+        {"name": f"Venue {i}", "area": "Hathipole", "rating": i % 50 / 10,
+         "hours": "daily 07:00-11:00" if i % 2 else "daily 18:00-23:00"}
+        for i in range(2000)
+    )
+    venues = store.top_venues(area="Hathipole", open_at=_at(MONDAY, 20))
+    assert len(venues) == 5
+    assert all(venue.hours == "daily 18:00-23:00" for venue in venues)
+    assert len(store.open_venue_ids(_at(MONDAY, 9))) == 1000
+    assert store.open_venue_ids(_at(MONDAY, 15)) == []
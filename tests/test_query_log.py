@@ -0,0 +1,82 @@
+"""
+Unit tests for the structured query-event log.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from src.query_log import QueryLog
+from src.query_processor import QueryProcessor
+
+
+def test_events_written_as_compact_jsonl(tmp_path):
+    log = QueryLog(path=str(tmp_path / "events.jsonl"))
+    intent = QueryProcessor().process_query("Best food in Surajpole?")
+    log.record("Best food in Surajpole?", intent, "answer:food", 0.0012, "default")
+    log.flush()
+
+    with open(tmp_path / "events.jsonl", encoding="utf-8") as handle:
+        line = handle.readline()
+    assert ", " not in line
+    event = json.loads(line)
+    assert event["category"] == "food"
+    assert event["branch"] == "answer:food"
+    assert event["latency_ms"] == 1.2
+    assert event["kb_version"] == "default"
+
+
+def test_queued_events_are_written_at_exit(tmp_path):
+    path = tmp_path / "events.jsonl"
+    script = "\n".join([
+        "import time",
+        "from src.query_log import QueryLog",
+        "log = QueryLog(path=%r)" % str(path),
+        "open_file = log._open",
+        "log._open = lambda: time.sleep(0.3) or open_file()",
+        "log.record('last question', None, 'answer:general', 0.0, 'default')",
+    ])
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+
+    with open(path, encoding="utf-8") as handle:
+        assert [json.loads(line)["query"] for line in handle] == ["last question"]
+
+
+def test_full_queue_drops_and_counts(tmp_path):
+    log = QueryLog(path=str(tmp_path / "events.jsonl"), queue_size=2)
+    log._ensure_writer = lambda: None  # keep the queue from draining
+
+    results = [log.record("q", None, "invalid_input", 0.0, None) for _ in range(5)]
+    assert results == [True, True, False, False, False]
+    assert log.stats()["dropped"] == 3
+
+
+def test_writer_survives_a_failed_rotation(tmp_path):
+    log = QueryLog(path=str(tmp_path / "events.jsonl"), max_bytes=1)
+    rotations = []
+
+    def rotate():
+        rotations.append(True)
+        if len(rotations) == 1:
+            raise ValueError("I/O operation on closed file.")
+
+    log._rotate = rotate
+    for index in range(3):
+        log.record(f"query {index}", None, "answer:general", 0.0, "default")
+        log.flush()
+
+    assert log.stats() == {"queued": 0, "written": 2, "dropped": 1}
+    with open(tmp_path / "events.jsonl", encoding="utf-8") as handle:
+        assert [json.loads(line)["query"] for line in handle] == ["query 0", "query 2"]
+
+
+def test_size_based_rotation(tmp_path):
+    log = QueryLog(path=str(tmp_path / "events.jsonl"), max_bytes=200, backup_count=2)
+    for index in range(20):
+        log.record(f"query {index}", None, "answer:general", 0.0, "default")
+        log.flush()
+
+    files = sorted(os.listdir(tmp_path))
+    assert "events.jsonl" in files
+    assert len(files) == 3
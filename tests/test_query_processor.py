@@ -0,0 +1,93 @@
+"""
+Unit tests for QueryProcessor.
+"""
+
+from src.context_loader import ContextLoader
+from src.query_processor import QueryProcessor
+from src.transliteration import Transliterator, normalize_spelling, transliterate
+
+
+def test_english_queries_unchanged():
+    processor = QueryProcessor()
+    intent = processor.process_query("Best food in Surajpole?")
+    assert intent.category == "food"
+    assert intent.location == "Surajpole"
+    assert intent.keywords == ["best", "food", "in", "surajpole?"]
+
+
+def test_devanagari_greeting_query():
+    intent = QueryProcessor().process_query("खम्मा घणी का मतलब")
+    assert intent.category == "language"
+    assert "khamma" in intent.keywords
+
+
+def test_hinglish_food_query():
+    intent = QueryProcessor().process_query("daal bati kahan milegi")
+    assert intent.category == "food"
+    assert intent.keywords[:2] == ["dal", "baati"]
+
+
+def test_common_hinglish_words_are_not_variants():
+    intent = QueryProcessor().process_query("bada mahal kahan hai")
+    assert intent.category == "tourism"
+    assert "food" not in intent.categories and "vada" not in intent.keywords
+
+
+def test_devanagari_location():
+    intent = QueryProcessor().process_query("हाथीपोल में खाना कहाँ मिलेगा?")
+    assert intent.category == "food"
+    assert intent.location == "Hathipole"
+
+
+def test_transliteration_schwa_deletion():
+    assert transliterate("मतलब") == "matlab"
+    assert normalize_spelling("सज्जनगढ़") == normalize_spelling("sajjangarh")
+    assert normalize_spelling("झील") == normalize_spelling("jheel")
+
+
+def test_colliding_variants_rejected():
+    try:
+        Transliterator({"food": ["khana"], "where": ["khaana"]})
+    except ValueError:
+        return
+    assert False, "expected ValueError for colliding spellings"
+
+
+def test_spelling_corrections_are_reported():
+    intent = QueryProcessor().process_query("Where to eat ghever near hathipol?")
+    assert intent.corrections == {"ghever": "ghevar"}
+    assert intent.category == "food" and intent.location == "Hathipole"
+
+    intent = QueryProcessor().process_query("Is it polite to take photos at Fateh Sagr?")
+    assert intent.corrections == {"sagr": "sagar"}
+    assert intent.location == "Fateh Sagar"
+
+
+def test_location_and_dish_aliases():
+    processor = QueryProcessor()
+    assert processor.process_query("Boat rides on the lake?").locations == ["Lake Pichola"]
+    assert processor.process_query("Is the lake palace open?").locations == ["Lake Pichola"]
+    assert processor.process_query("Is Monsoon Palace open?").locations == ["Sajjangarh"]
+    # The longest phrase wins: "city palace" and "sajjangarh palace" are one place each
+    assert processor.process_query("City Palace or Sajjangarh palace?").locations == ["City Palace", "Sajjangarh"]
+
+    assert processor.process_query("Where to eat dal bati?").dishes == ["Dal Baati Churma"]
+    intent = processor.process_query("Is daal baati churma better than kachori?")
+    assert intent.dishes == ["Dal Baati Churma", "Kachori"] and intent.category == "food"
+
+
+def test_kind_of_place_is_not_an_alias():
+    processor = QueryProcessor(context={"overview": {"location_aliases": {"palace": "City Palace",
+                                                                         "fatehsagar": "Fateh Sagar"}}})
+    assert processor.process_query("Which palace is best for sunset?").locations == []
+    assert processor.process_query("Which lake is quietest?").locations == []
+    assert processor.process_query("Boating at fatehsagar").locations == ["Fateh Sagar"]
+
+
+def test_aliases_come_from_the_knowledge_base():
+    context = ContextLoader().load_context()
+    processor = QueryProcessor(context={"overview": {"location_aliases": {"the old palace": "City Palace"}},
+                                        "food": {"dishes": ["Ghewar"], "dish_aliases": {"ghevar sweet": "Ghewar"}}})
+    intent = processor.process_query("Ghevar sweet near the old palace")
+    assert intent.locations == ["City Palace"] and intent.dishes == ["Ghewar"]
+    assert processor.matcher is not QueryProcessor(context=context).matcher
@@ -0,0 +1,75 @@
+"""
+Unit tests for ResponseGenerator.
+"""
+
+from src.context_loader import ContextLoader
+from src.geo_index import GeoIndex, geo_index_for
+from src.query_processor import QueryIntent, QueryProcessor
+from src.response_generator import NEARBY_FALLBACK_LIMIT, ResponseGenerator
+
+
+def test_single_category_response():
+    context = ContextLoader().load_context()
+    intent = QueryIntent(category="language", keywords=["khamma", "ghani"], categories=["language"])
+    response = ResponseGenerator().generate_response(intent, context)
+    assert response.startswith("'Khamma Ghani' is a")
+
+
+def test_multi_intent_query_detects_every_category():
+    intent = QueryProcessor().process_query("Best kachori near City Palace and when is it less crowded?")
+    assert intent.category == "tourism"
+    assert intent.categories == ["tourism", "food"]
+
+
+def test_composed_response_covers_all_parts_without_duplicates():
+    context = ContextLoader().load_context()
+    intent = QueryProcessor().process_query("Best kachori near City Palace and when is it less crowded?")
+    response = ResponseGenerator().generate_response(intent, context)
+
+    assert "At City Palace, expect heavy crowds" in response
+    assert "Places for Kachori within 1.5 km of City Palace: Surajpole kachori stalls" in response
+    sentences = [sentence for part in response.split("\n\n") for sentence in part.split(". ")]
+    assert len(sentences) == len(set(sentences))
+
+
+def test_nearby_fallback_asks_the_index_for_a_few_places(monkeypatch):
+    asked = []
+    nearest = GeoIndex.nearest
+
+    def recording_nearest(self, latitude, longitude, k, **options):
+        asked.append(k)
+        return nearest(self, latitude, longitude, k, **options)
+
+    monkeypatch.setattr(GeoIndex, "nearest", recording_nearest)
+    context = ContextLoader().load_context()
+    generator = ResponseGenerator(venue_store=None)
+    intent = QueryProcessor().process_query("Kachori within 0.2 km of Fateh Sagar")
+    response = generator.generate_response(intent, context)
+
+    assert "Nothing within 0.2 km of Fateh Sagar; the closest are: Hathipole market snack stalls" in response
+    assert asked[0] == NEARBY_FALLBACK_LIMIT and all(k < len(geo_index_for(context).places) for k in asked)
+
+
+def test_itinerary_transport_mode_from_any_word_form():
+    processor = QueryProcessor()
+    generator = ResponseGenerator()
+    context = ContextLoader().load_context()
+    phrases = {
+        "walking": ["walking", "on foot", "by foot", "walks only"],
+        "two wheeler": ["on a two-wheeler", "by scooty", "renting bikes"],
+        "auto rickshaw": ["by auto", "in rickshaws"],
+        "car": ["by taxis", "in a cab", "by car"],
+    }
+    for mode, wordings in phrases.items():
+        for wording in wordings:
+            response = generator.generate_response(processor.process_query(
+                f"Plan my itinerary for tomorrow 9am to 6pm at City Palace and Sajjangarh {wording}"), context)
+            assert response.startswith(f"Suggested plan by {mode} "), (wording, response)
+
+
+def test_crowd_at_specific_time():
+    context = ContextLoader().load_context()
+    intent = QueryProcessor().process_query("Is City Palace crowded at 5:30pm?")
+    response = ResponseGenerator().generate_response(intent, context)
+    assert response.startswith("At 5:30 PM, City Palace is at peak crowds")
+    assert "10:00 PM" in response
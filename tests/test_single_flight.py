@@ -0,0 +1,124 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+import app
+from src.single_flight import SingleFlight
+
+CALLERS = 12
+
+
+def _wait_for(condition) -> None:
+    while not condition():
+        pass
+
+
+def test_threads_share_one_computation():
+    flight = SingleFlight()
+    gate = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        gate.wait(5)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("khamma ghani", compute)))
+               for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: flight.shared == CALLERS - 1)
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and len({id(result) for result in results}) == 1
+    assert flight.stats() == {"computed": 1, "shared": CALLERS - 1, "in_flight": 0}
+    # Finished flights are not cached
+    assert flight.do("khamma ghani", lambda: "again") == "again"
+
+
+def test_errors_reach_every_waiting_caller():
+    flight = SingleFlight()
+    gate = threading.Event()
+
+    def compute():
+        gate.wait(5)
+        raise RuntimeError("knowledge base unavailable")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", compute)
+        except RuntimeError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: flight.shared == 2)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 3 and flight.in_flight() == 0
+
+
+def test_coroutines_and_threads_share_one_computation():
+    flight = SingleFlight()
+    gate = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(threading.current_thread().name)
+        gate.wait(5)
+        return "Khamma Ghani"
+
+    async def run():
+        tasks = [asyncio.ensure_future(flight.do_async("key", compute)) for _ in range(CALLERS)]
+        thread_results = []
+        thread = threading.Thread(target=lambda: thread_results.append(flight.do("key", compute)))
+        thread.start()
+        while flight.shared < CALLERS:
+            await asyncio.sleep(0.001)
+        gate.set()
+        results = await asyncio.gather(*tasks)
+        thread.join()
+        return results + thread_results
+
+    assert asyncio.run(run()) == ["Khamma Ghani"] * (CALLERS + 1)
+    assert len(calls) == 1 and calls[0] != threading.main_thread().name
+
+
+def test_identical_guide_queries_are_answered_once(monkeypatch):
+    expected = app.local_guide("What does Khamma Ghani mean?")
+    flight = SingleFlight()
+    monkeypatch.setattr(app, "DEFAULT_SINGLE_FLIGHT", flight)
+    answer_shared = app._answer_shared
+    keys = []
+
+    def gated(query, state, catalog):
+        keys.append(app._flight_key(query, state, catalog))
+        _wait_for(lambda: flight.shared >= CALLERS - 1)
+        return answer_shared(query, state, catalog)
+
+    monkeypatch.setattr(app, "_answer_shared", gated)
+
+    async def burst():
+        queries = ["What does Khamma Ghani mean?", "what does  KHAMMA ghani mean?"] * (CALLERS // 2)
+        return await asyncio.gather(*(app.local_guide_async(query, f"visitor-{i}")
+                                      for i, query in enumerate(queries)))
+
+    assert asyncio.run(burst()) == [expected] * CALLERS
+    assert keys == [("what does khamma ghani mean?", None, "en")]
+
+
+@pytest.mark.parametrize("query", [None, "", "   "])
+def test_invalid_queries_skip_the_engine(query):
+    assert app.local_guide(query) == asyncio.run(app.local_guide_async(query))
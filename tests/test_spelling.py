@@ -0,0 +1,73 @@
+"""
+Unit tests for the symmetric-delete spelling corrector.
+"""
+
+import random
+
+from src.context_loader import ContextLoader
+from src.intent_classifier import load_training_file
+from src.query_processor import QueryProcessor
+from src.spelling import SpellCorrector, edit_distance, spell_corrector_for
+
+
+def _reference_distance(source: str, target: str) -> int:
+    rows = [[i + j if i * j == 0 else 0 for j in range(len(target) + 1)] for i in range(len(source) + 1)]
+    for i in range(1, len(source) + 1):
+        for j in range(1, len(target) + 1):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + cost)
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+
+def test_edit_distance_matches_reference_within_limit():
+    rng = random.Random(5)
+    for _ in range(3000):
+        source = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        target = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        expected = _reference_distance(source, target)
+        for limit in (1, 2):
+            assert edit_distance(source, target, limit) == min(expected, limit + 1)
+    assert edit_distance("ghewar", "gehwar") == 1
+
+
+def test_corrects_towards_dictionary_words_only():
+    corrector = SpellCorrector.from_words(["kachori", "lake", "palace", "pichola"], known_words=["polish"])
+    assert corrector.correct("kachoriz") == "kachori"
+    assert corrector.correct("pichla") == "pichola"
+    # Two edits are allowed only for longer words
+    assert corrector.correct("lkae") == "lake" and corrector.correct("lk") is None
+    assert corrector.correct("pchla") is None
+    # Known words and their inflections are left alone, even next to a dictionary word
+    assert corrector.correct("take") is None
+    assert corrector.correct("places") is None
+    assert corrector.correct("polished") is None
+    assert corrector.correct("kachori") is None
+
+
+def test_knowledge_base_vocabulary():
+    loader = ContextLoader()
+    corrector = spell_corrector_for(loader.load_context(), ("etiquette",), loader.kb_version)
+    assert corrector.correct("sajangarh") == "sajjangarh"
+    assert corrector.correct("hathipol") == "hathipole"
+    assert corrector.correct("etiquete") == "etiquette"
+    assert spell_corrector_for(ContextLoader().load_context(), ("etiquette",), loader.kb_version) is corrector
+    # Only place names join the keywords, not every word of the knowledge base's text
+    assert len(corrector) < 20
+
+
+def test_held_out_misspellings():
+    processor = QueryProcessor()
+    # Misspellings that appear in no labeled query, with the word meant
+    held_out = {"ghewer": "ghewar", "kachoree": "kachori", "pichla": "pichola", "sajjngarh": "sajjangarh",
+                "etiquete": "etiquette", "templ": "temple", "restaraunt": "restaurant", "itinerery": "itinerary",
+                "transprt": "transport", "surjpole": "surajpole"}
+    queries, _ = load_training_file()
+    typed = {word for query in queries for word in query.lower().split()}
+    assert not typed & set(held_out)
+    for misspelled, meant in held_out.items():
+        assert processor.spelling.correct(misspelled) == meant
+    # Correctly spelled everyday words are left alone
+    for word in ("take", "polite", "place", "dishes", "timings", "march", "weather"):
+        assert processor.correct_spelling(word)[1] == {}
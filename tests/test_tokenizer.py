@@ -0,0 +1,55 @@
+"""
+Unit tests for the query tokenizer.
+"""
+
+from src.query_processor import QueryProcessor
+from src.tokenizer import NUMBER, TIME, TIME_TERM, UNKNOWN_ID, Tokenizer, Vocabulary
+
+
+def _tokenizer() -> Tokenizer:
+    return Tokenizer(Vocabulary(["palace", "crowd", "culture", "transport", "visit", "timing", "evening", "shop",
+                                 "tradition", "respect", "closed", "open"]))
+
+
+def test_lemmas_stop_words_and_ids():
+    tokenizer = _tokenizer()
+    tokens = tokenizer.tokenize("Which palaces are less crowded in the evenings?")
+    assert [token.lemma for token in tokens] == ["palace", "less", "crowd", "evening"]
+    assert [token.text for token in tokens] == ["palaces", "less", "crowded", "evenings"]
+    vocabulary = tokenizer.vocabulary
+    assert [token.id for token in tokens] == [vocabulary.id("palace"), UNKNOWN_ID, vocabulary.id("crowd"),
+                                              vocabulary.id("evening")]
+
+    lemmas = [tokenizer.lemma(word) for word in ["cultural", "transportation", "visiting", "timings", "shopping",
+                                                 "traditional", "respectfully", "closed", "opening", "dishes",
+                                                 "cities", "dress", "bus"]]
+    assert lemmas == ["culture", "transport", "visit", "timing", "shop", "tradition", "respect", "closed", "open",
+                      "dish", "city", "dress", "bus"]
+
+
+def test_times_and_numbers():
+    tokens = _tokenizer().tokenize("Is it open at 5pm, 5:30 p.m. or 17:00 for 2 people and 12 am?")
+    times = [token.value for token in tokens if token.kind == TIME]
+    assert times == [17 * 60, 17 * 60 + 30, 17 * 60, 0]
+    assert all(token.lemma == TIME_TERM for token in tokens if token.kind == TIME)
+    assert [token.value for token in tokens if token.kind == NUMBER] == [2.0]
+    # "am" on its own is a stop word, not a time
+    assert [token.lemma for token in _tokenizer().tokenize("I am hungry")] == ["hungry"]
+
+
+def test_processor_matches_inflected_keywords():
+    processor = QueryProcessor()
+    intent = processor.process_query("Which palaces are less crowded at 5pm?")
+    assert intent.category == "tourism" and intent.time_context == "crowd"
+    assert intent.times == [17 * 60]
+    assert intent.token_ids == [processor.vocabulary.id(lemma) for lemma in intent.tokens]
+
+    assert processor.process_query("Traditional customs and respectful behaviour").category == "culture"
+    assert processor.process_query("Transportation to heritage areas?").category == "tourism"
+    # Keywords inside longer words no longer count: "eat" in "great", "say" in "essays"
+    assert processor._score_categories("great essays")["food"] == 0
+    assert processor._extract_locations("food near lake pichola and city palaces") == ["Lake Pichola", "City Palace"]
+
+
+def test_processors_share_compiled_tables():
+    assert QueryProcessor().matcher is QueryProcessor().matcher
@@ -0,0 +1,111 @@
+"""
+Unit tests for the venue database.
+"""
+
+import json
+import time
+from datetime import datetime
+
+from src.context_loader import ContextLoader
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+from src.venue_store import VenueStore
+
+
+def _store(tmp_path):
+    store = VenueStore(str(tmp_path / "venues.db"))
+    store.import_file(".kiro/venues.csv", batch_size=3)
+    return store
+
+
+def test_csv_import_and_filters(tmp_path):
+    store = _store(tmp_path)
+    assert len(store) == 10
+
+    assert [venue.name for venue in store.top_venues(area="surajpole")] == \
+        ["Surajpole kachori stalls", "Surajpole thali house"]
+    kachori = store.top_venues(dish="kachori", veg=True)
+    assert [venue.name for venue in kachori] == ["Surajpole kachori stalls", "Hathipole market snack stalls"]
+    assert kachori[0].dishes == ("Kachori", "Mirchi Vada")
+    assert all(venue.price_band == 1 for venue in store.top_venues(max_price_band=1, limit=20))
+    assert [venue.name for venue in store.top_venues(cuisine="Sweets")] == ["Bada Bazaar sweet shops"]
+
+
+def test_jsonl_import_skips_bad_records_and_upserts(tmp_path):
+    store = _store(tmp_path)
+    path = tmp_path / "more.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"name": "Surajpole kachori stalls", "area": "Surajpole", "veg": True, "rating": 4.9,
+                    "dishes": ["Kachori"]}),
+        json.dumps({"area": "Hathipole"}),
+        json.dumps({"name": "Ghat cafe", "price_band": "9"}),
+        "not json",
+    ]), encoding="utf-8")
+
+    result = store.import_file(str(path))
+    assert (result.imported, result.skipped) == (1, 3)
+    assert len(store) == 10
+    updated = store.top_venues(area="Surajpole", limit=1)[0]
+    assert (updated.rating, updated.dishes) == (4.9, ("Kachori",))
+
+
+def test_imports_by_another_store_invalidate_cached_indexes(tmp_path):
+    reader = _store(tmp_path)
+    saturday_night = datetime(2024, 1, 6, 23, 30)
+    assert "Paneer Tikka" not in reader.vocabulary()[0]
+    before = reader.open_venue_ids(saturday_night)
+
+    # Another process imports through its own connection; this store never sees import_records
+    VenueStore(str(tmp_path / "venues.db")).import_records([
+        {"name": "Night owl dhaba", "area": "Hathipole", "rating": 4.0, "hours": "daily 18:00-02:00",
+         "dishes": "Paneer Tikka"},
+    ])
+    assert "Paneer Tikka" in reader.vocabulary()[0]
+    assert len(reader.open_venue_ids(saturday_night)) == len(before) + 1
+
+
+def test_filtered_queries_use_indexes(tmp_path):
+    store = _store(tmp_path)
+    plan = " ".join(row[-1] for row in store._reader().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM venues WHERE area = ? ORDER BY rating DESC LIMIT 5", ("Surajpole",)))
+    assert "idx_venues_area" in plan
+
+
+def test_top_k_over_thousands_of_venues(tmp_path):
+    store = VenueStore(str(tmp_path / "venues.db"))
+    areas = ["Surajpole", "Hathipole", "Chetak Circle", "Fateh Sagar"]
+    store.import_records(
+        {"name": f"Venue {i}", "area": areas[i % 4], "cuisine": "street food", "veg": i % 3 != 0,
+         "price_band": i % 4 + 1, "rating": (i * 37 % 50) / 10, "dishes": ["Kachori", f"Dish {i % 40}"]}
+        for i in range(5000)
+    )
+    store.top_venues(area="Hathipole", dish="Kachori", veg=True)
+
+    started = time.perf_counter()
+    venues = store.top_venues(area="Hathipole", dish="Kachori", veg=True, max_price_band=2)
+    assert time.perf_counter() - started < 0.05
+    assert len(venues) == 5
+    assert all(venue.area == "Hathipole" and venue.veg and venue.price_band <= 2 for venue in venues)
+    assert [venue.rating for venue in venues] == sorted((venue.rating for venue in venues), reverse=True)
+
+
+def test_food_answers_use_the_venue_store(tmp_path):
+    generator = ResponseGenerator(_store(tmp_path))
+    context = ContextLoader().load_context()
+    intent = QueryProcessor().process_query("Cheap veg food in Hathipole")
+    response = generator.generate_response(intent, context)
+    assert response.startswith("Top-rated budget vegetarian places in Hathipole: Hathipole market snack stalls")
+    assert generator._answer_key(intent) is None
+
+
+def test_food_answers_without_a_venue_search_are_precomputed(tmp_path):
+    generator = ResponseGenerator(_store(tmp_path))
+    context = ContextLoader().load_context()
+    processor = QueryProcessor()
+    table = generator.answer_table(context)
+    assert table is not ResponseGenerator(venue_store=None).answer_table(context)
+
+    intent = processor.process_query("What food is Udaipur famous for?")
+    assert generator.precomputed_response(intent, context) == generator._generate_uncached(intent, context)
+    for query in ["Cheap veg food in Hathipole", "Where to get kachori?", "Best food in Surajpole"]:
+        assert generator.precomputed_response(processor.process_query(query), context) is None
@@ -0,0 +1,56 @@
+"""
+Unit tests for the startup warm-up and readiness flag.
+"""
+
+import json
+
+import src.warmup as warmup
+from src.context_loader import ContextLoader
+from src.warmup import EXAMPLE_QUERIES, Readiness, load_top_queries, top_queries_from_log, warm_up
+
+
+def test_warm_up_runs_every_step_then_flips_readiness(tmp_path):
+    top = tmp_path / "top_queries.txt"
+    top.write_text("# most frequent first\nBest food in Hathipole?\n\nTemple etiquette?\nHow to greet locals?\n",
+                   encoding="utf-8")
+    readiness = Readiness()
+    assert not readiness.ready and not readiness.wait(0)
+
+    report = warm_up(top_queries_path=str(top), top_n=2, readiness=readiness)
+
+    assert [step.name for step in report.steps] == [
+        "knowledge_base", "engine", "answer_table", "geo_index", "opening_hours", "crowd_forecast",
+        "example_queries", "top_queries"
+    ]
+    assert report.ok and readiness.ready and readiness.report is report
+    assert dict((step.name, step.detail) for step in report.steps)["top_queries"] == "2 queries"
+    assert all(step.seconds >= 0 for step in report.steps)
+    assert "total" in report.format()
+
+
+def test_failed_step_is_recorded_and_warm_up_still_completes(monkeypatch):
+    def broken(context):
+        raise RuntimeError("no coordinates")
+
+    monkeypatch.setattr(warmup, "geo_index_for", broken)
+    readiness = Readiness()
+    report = warm_up(ContextLoader(), top_queries_path="missing.txt", readiness=readiness)
+
+    failed = [step for step in report.steps if step.error]
+    assert [step.name for step in failed] == ["geo_index"] and "no coordinates" in failed[0].error
+    assert not report.ok and readiness.ready
+    assert report.steps[-2].detail == f"{len(EXAMPLE_QUERIES)} queries"
+    assert report.steps[-1].detail == "0 queries"
+
+
+def test_top_queries_from_log(tmp_path):
+    log = tmp_path / "query_events.jsonl"
+    events = ([{"query": "Best food in Surajpole?", "branch": "answer:food"}] * 3
+              + [{"query": "best food  in surajpole?", "branch": "answer:food"}]
+              + [{"query": "Temple etiquette?", "branch": "answer:culture"}] * 2
+              + [{"query": "asdf", "branch": "empty_response"}] * 5)
+    log.write_text("\n".join(json.dumps(event) for event in events) + "\nnot json\n", encoding="utf-8")
+
+    assert top_queries_from_log(str(log), top_n=5) == ["Best food in Surajpole?", "Temple etiquette?"]
+    assert top_queries_from_log(str(log), top_n=1) == ["Best food in Surajpole?"]
+    assert load_top_queries(str(tmp_path / "missing.txt")) == []
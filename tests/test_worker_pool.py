@@ -0,0 +1,55 @@
+"""
+Unit tests for the process-pool execution mode.
+"""
+
+import numpy as np
+import pytest
+
+from src.context_loader import ContextLoader
+from src.query_processor import QueryProcessor
+from src.response_generator import ResponseGenerator
+from src.worker_pool import GuidePool, SharedKnowledgeBase
+
+
+QUERIES = [
+    "What does Khamma Ghani mean?",
+    "Best food in Surajpole?",
+    "When to visit City Palace?",
+    "Temple etiquette?",
+    "Kachori near City Palace",
+    "plan a day trip to City Palace and Sajjangarh",
+]
+
+
+def test_shared_block_round_trip():
+    context = ContextLoader().load_context()
+    weights = np.arange(12, dtype=np.float32).reshape(3, 4)
+    shared = SharedKnowledgeBase.create(context, {"weights": weights}, {"labels": ["a", "b"]})
+    try:
+        attached = SharedKnowledgeBase.attach(shared.name)
+        assert attached.context() == context
+        assert attached.metadata == {"labels": ["a", "b"]}
+        view = attached.array("weights")
+        assert np.array_equal(view, weights) and not view.flags.owndata
+        with pytest.raises(ValueError):
+            view[0, 0] = 1.0
+        del view
+        attached.close()
+    finally:
+        shared.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedKnowledgeBase.attach(shared.name)
+
+
+def test_pool_answers_match_in_process_answers():
+    context = ContextLoader().load_context()
+    processor, generator = QueryProcessor(), ResponseGenerator()
+    expected = [generator.generate_response(processor.process_query(query), context) for query in QUERIES]
+
+    with GuidePool(processes=2) as pool:
+        assert pool.answer(QUERIES * 3, chunk_size=4) == expected * 3
+        statuses = pool.worker_status()
+
+    assert all(status["classifier_shared"] and status["forecast_shared"] for status in statuses)
+    assert {status["kb_version"] for status in statuses} == {pool.shared.metadata["kb_version"]}